@@ -1,16 +1,12 @@
-import sys
+def __getattr__(name):
+    # The version is looked up on first use; importlib.metadata is slow to import
+    if name != "__version__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib.metadata import PackageNotFoundError, version
 
-if sys.version_info[:2] >= (3, 8):
-    # TODO: Import directly (no need for conditional) when `python_requires = >= 3.8`
-    from importlib.metadata import PackageNotFoundError, version  # pragma: no cover
-else:
-    from importlib_metadata import PackageNotFoundError, version  # pragma: no cover
-
-try:
-    # Change here if project is renamed and does not equal the package name
-    dist_name = __name__
-    __version__ = version(dist_name)
-except PackageNotFoundError:  # pragma: no cover
-    __version__ = "unknown"
-finally:
-    del version, PackageNotFoundError
+    try:
+        # Change here if project is renamed and does not equal the package name
+        dist_name = __name__
+        return version(dist_name)
+    except PackageNotFoundError:  # pragma: no cover
+        return "unknown"
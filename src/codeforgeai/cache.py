@@ -0,0 +1,239 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import contextvars
+
+from codeforgeai.metrics import current_registry, template_name
+
+DEFAULT_CACHE_DIR = "~/.cache/codeforgeai"
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+DEFAULT_TTL = {"default": 7 * 24 * 3600, "analyze": 30 * 24 * 3600, "commit-message": 0}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT,
+    command TEXT,
+    response TEXT,
+    size INTEGER,
+    expires REAL,
+    accessed REAL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+# (command, enabled), set by the CLI entry point for the command being run.
+# A context variable, so concurrent daemon requests keep their own.
+_settings = contextvars.ContextVar("codeforgeai_cache_settings", default=(None, True))
+# directory -> ResponseCache, or None when it could not be opened
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def configure(command=None, enabled=True):
+    """Record the running command (for per-command TTLs) and whether --no-cache was given."""
+    _settings.set((command, enabled))
+
+
+# Seconds a model digest is reused before the server is asked again, so a
+# long-running daemon notices when a tag is re-pulled
+DIGEST_TTL = 60.0
+# (host, model name) -> (digest, when it was read)
+_digests = {}
+_digests_lock = threading.Lock()
+
+
+def model_digest(model_name, config=None):
+    """Return the digest of a local model so re-pulled models do not reuse old answers."""
+    host = (config or {}).get("ollama_host") or os.environ.get("OLLAMA_HOST")
+    now = time.monotonic()
+    with _digests_lock:
+        entry = _digests.get((host, model_name))
+    if entry is not None and now - entry[1] < DIGEST_TTL:
+        return entry[0]
+    digest = None
+    try:
+        from codeforgeai.models.client import get_client
+        for model in get_client(config).list().models:
+            if model.model in (model_name, f"{model_name}:latest"):
+                digest = model.digest
+                break
+    except Exception as e:
+        logging.debug(f"Response cache: Could not read digest of {model_name}: {e}")
+    with _digests_lock:
+        _digests[(host, model_name)] = (digest, now)
+    return digest
+
+
+class ResponseCache:
+    """
+    Persistent, content-addressed store of model responses.
+
+    Entries are keyed by a hash of the model name, model digest, request
+    options and prompt. Each entry expires after the TTL of the command that
+    stored it, and the least recently used entries are evicted once the
+    stored responses exceed max_bytes.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, ttl=None):
+        directory = os.path.expanduser(directory)
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "responses.db")
+        self.max_bytes = max_bytes
+        self.ttl = dict(DEFAULT_TTL, **(ttl or {}))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def key(model_name, prompt, config=None, **options):
+        payload = json.dumps({
+            "model": model_name,
+            "digest": model_digest(model_name, config),
+            "options": options,
+            "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, command):
+        return self.ttl.get(command, self.ttl.get("default", 0))
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT response, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] < now:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+        logging.debug(
+            f"Response cache: {'hit' if row else 'miss'} "
+            f"({self.hits} hits, {self.misses} misses)"
+        )
+        return row[0] if row else None
+
+    def put(self, key, model_name, response, command=None):
+        ttl = self.ttl_for(command)
+        if not ttl or response is None:
+            return
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model_name, command, response, size, now + ttl, now),
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        self.conn.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+        rows = self.conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+        total = sum(size for _, size in rows)
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logging.debug(f"Response cache: Evicted {len(evicted)} least recently used entries")
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+
+
+def get_cache(config):
+    """Return the shared ResponseCache when response_cache is enabled, otherwise None."""
+    if not _settings.get()[1] or not (config or {}).get("response_cache", False):
+        return None
+    directory = config.get("response_cache_dir", DEFAULT_CACHE_DIR)
+    with _caches_lock:
+        if directory in _caches:
+            return _caches[directory]
+        try:
+            cache = ResponseCache(
+                directory,
+                int(config.get("response_cache_max_bytes", DEFAULT_MAX_BYTES)),
+                config.get("response_cache_ttl"),
+            )
+        except (OSError, sqlite3.Error) as e:
+            logging.error(f"Response cache disabled: {e}")
+            cache = None
+        _caches[directory] = cache
+    return cache
+
+
+def cached_chat(model_name, prompt, config, send, **options):
+    """
+    Return send() through the response cache. send is called on a miss and
+    its answer stored under the running command's TTL.
+    """
+    cache = get_cache(config)
+    if cache is None:
+        return send()
+    key = cache.key(model_name, prompt, config, **options)
+    response = cache.get(key)
+    if response is not None:
+        current_registry().record_cached(model_name, template_name(prompt, config))
+        return response
+    response = send()
+    cache.put(key, model_name, response, _settings.get()[0])
+    return response
+
+
+def cached_stream(model_name, prompt, config, stream, **options):
+    """
+    Streaming counterpart of cached_chat. stream returns an iterator of
+    response pieces; a cached answer is yielded as a single piece, and a
+    streamed answer is only stored once it has been consumed to the end.
+    """
+    cache = get_cache(config)
+    if cache is None:
+        yield from stream()
+        return
+    key = cache.key(model_name, prompt, config, **options)
+    response = cache.get(key)
+    if response is not None:
+        current_registry().record_cached(model_name, template_name(prompt, config))
+        yield response
+        return
+    pieces = []
+    for piece in stream():
+        pieces.append(piece)
+        yield piece
+    cache.put(key, model_name, "".join(pieces), _settings.get()[0])
+
+
+async def cached_chat_async(model_name, prompt, config, send, **options):
+    """cached_chat for coroutines: send is awaited on a miss."""
+    cache = get_cache(config)
+    if cache is None:
+        return await send()
+    key = cache.key(model_name, prompt, config, **options)
+    response = cache.get(key)
+    if response is not None:
+        current_registry().record_cached(model_name, template_name(prompt, config))
+        return response
+    response = await send()
+    cache.put(key, model_name, response, _settings.get()[0])
+    return response
@@ -0,0 +1,226 @@
+import os
+import ast
+import logging
+from collections import namedtuple
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+Chunk = namedtuple("Chunk", ["start_line", "end_line", "text"])
+
+DEFAULT_CHUNK_CHARS = 12000
+# Below the prefilter's 256 KiB cut-off, so analyze streams the largest files it classifies
+DEFAULT_MEMORY_LIMIT = 128 * 1024
+
+
+def _pack(segments, max_chars):
+    """Greedily merge consecutive ``(start, lines)`` segments into chunks of at most max_chars."""
+    current, start, size = [], None, 0
+    for seg_start, seg_lines in segments:
+        seg_size = sum(len(line) for line in seg_lines)
+        if current and size + seg_size > max_chars:
+            yield Chunk(start, start + len(current) - 1, "".join(current))
+            current, start, size = [], None, 0
+        if seg_size > max_chars:
+            # A single oversized segment is cut at line boundaries
+            for offset, line in enumerate(seg_lines):
+                if current and size + len(line) > max_chars:
+                    yield Chunk(start, start + len(current) - 1, "".join(current))
+                    current, start, size = [], None, 0
+                if start is None:
+                    start = seg_start + offset
+                current.append(line)
+                size += len(line)
+            continue
+        if start is None:
+            start = seg_start
+        current.extend(seg_lines)
+        size += seg_size
+    if current:
+        yield Chunk(start, start + len(current) - 1, "".join(current))
+
+
+def _blank_line_segments(lines):
+    """Yield ``(start_line, lines)`` blocks separated by blank lines from any line iterable."""
+    block, start = [], 1
+    for number, line in enumerate(lines, 1):
+        if not block:
+            start = number
+        block.append(line)
+        if not line.strip():
+            yield start, block
+            block = []
+    if block:
+        yield start, block
+
+
+def split_blocks(lines, max_chars=DEFAULT_CHUNK_CHARS):
+    """Split any text into chunks on blank-line boundaries. Works on streamed lines."""
+    return _pack(_blank_line_segments(lines), max_chars)
+
+
+def split_python(source, max_chars=DEFAULT_CHUNK_CHARS):
+    """
+    Split Python source on top-level ``def``/``class`` (and other statement)
+    boundaries using ast. Decorators and the comments directly above a
+    definition stay with it. Falls back to blank-line blocks when the source
+    does not parse.
+    """
+    lines = source.splitlines(keepends=True)
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return list(split_blocks(lines, max_chars))
+
+    starts = []
+    for node in tree.body:
+        start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+        # Keep leading comments attached to the definition they describe
+        while start > 1 and lines[start - 2].lstrip().startswith("#"):
+            start -= 1
+        if not starts or start > starts[-1]:
+            starts.append(start)
+    if not starts or starts[0] != 1:
+        starts.insert(0, 1)
+    bounds = starts + [len(lines) + 1]
+    segments = [(bounds[i], lines[bounds[i] - 1:bounds[i + 1] - 1]) for i in range(len(starts))]
+    return list(_pack((s for s in segments if s[1]), max_chars))
+
+
+def iter_chunks(path, max_chars=DEFAULT_CHUNK_CHARS, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """
+    Yield chunks of a file, split on syntactic boundaries where possible.
+    Files above memory_limit bytes are streamed line by line and split on
+    blank lines instead of being read whole.
+    """
+    if os.path.getsize(path) > memory_limit:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            yield from split_blocks(f, max_chars)
+        return
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        source = f.read()
+    if path.endswith((".py", ".pyi")):
+        yield from split_python(source, max_chars)
+    else:
+        yield from split_blocks(source.splitlines(keepends=True), max_chars)
+
+
+def chunk_settings(config):
+    """Return ``(max_chars, memory_limit, concurrency)`` from the chunk_* config keys."""
+    config = config or {}
+    return (
+        max(1, int(config.get("chunk_chars", DEFAULT_CHUNK_CHARS))),
+        int(config.get("chunk_memory_limit", DEFAULT_MEMORY_LIMIT)),
+        max(1, int(config.get("chunk_concurrency", 4))),
+    )
+
+
+def _map_prompt(map_prompt, chunk):
+    return f"{map_prompt}\n\nLines {chunk.start_line}-{chunk.end_line}:\n{chunk.text}"
+
+
+def _group_parts(parts, max_chars):
+    """Group partial answers into reduce prompts of at most max_chars, always making progress."""
+    groups, current, size = [], [], 0
+    for part in parts:
+        if current and size + len(part) > max_chars:
+            groups.append(current)
+            current, size = [], 0
+        current.append(part)
+        size += len(part)
+    groups.append(current)
+    # Force progress even when every part is larger than max_chars
+    if len(groups) == len(parts) > 1:
+        groups = [parts[i:i + 2] for i in range(0, len(parts), 2)]
+    return groups
+
+
+def _reduce_prompt(reduce_prompt, group):
+    return f"{reduce_prompt}\n\n" + "\n\n".join(group)
+
+
+def map_reduce(send, chunks, map_prompt, reduce_prompt, max_chars=DEFAULT_CHUNK_CHARS,
+               concurrency=4, combine=None, final_send=None):
+    """
+    Run map_prompt over every chunk concurrently, then combine the partial
+    answers with reduce_prompt. send is a callable taking a prompt and
+    returning the model's text. At most twice concurrency chunks are held in
+    memory at once (only the line range and answer of finished chunks are
+    kept), and partial answers that do not fit in one reduce prompt
+    are reduced in groups until a single answer remains.
+
+    combine, when given, is called with the list of partial answers first; a
+    non-None return value is used as the result and skips the reduce prompt.
+    final_send, when given, replaces send for the last reduce prompt, e.g. to
+    stream the final answer.
+    """
+    partials = []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        pending = []
+        for chunk in chunks:
+            # Workers run in a copy of the caller's context, e.g. its scheduling priority
+            pending.append((chunk, executor.submit(
+                contextvars.copy_context().run, send, _map_prompt(map_prompt, chunk)
+            )))
+            if len(pending) >= 2 * max(1, concurrency):
+                done_chunk, future = pending.pop(0)
+                partials.append((done_chunk.start_line, done_chunk.end_line, future.result()))
+        for done_chunk, future in pending:
+            partials.append((done_chunk.start_line, done_chunk.end_line, future.result()))
+
+    if not partials:
+        return ""
+    if len(partials) == 1:
+        return partials[0][2]
+    if combine is not None:
+        combined = combine([text for _, _, text in partials])
+        if combined is not None:
+            return combined
+    logging.debug(f"Chunking: Reducing {len(partials)} partial results")
+
+    parts = [f"Lines {start}-{end}:\n{text.strip()}" for start, end, text in partials]
+    while True:
+        groups = _group_parts(parts, max_chars)
+        if len(groups) == 1:
+            return (final_send or send)(_reduce_prompt(reduce_prompt, groups[0]))
+        parts = [send(_reduce_prompt(reduce_prompt, group)).strip() for group in groups]
+
+
+async def map_reduce_async(send, chunks, map_prompt, reduce_prompt, max_chars=DEFAULT_CHUNK_CHARS,
+                           window=8, combine=None):
+    """
+    Coroutine version of map_reduce. send is a coroutine function; chunks
+    are mapped window at a time so a streamed file is never held whole, and
+    the model's own concurrency limit applies to every call.
+    """
+    import asyncio
+    partials, batch = [], []
+
+    async def flush():
+        answers = await asyncio.gather(*(send(_map_prompt(map_prompt, chunk)) for chunk in batch))
+        partials.extend((chunk.start_line, chunk.end_line, answer) for chunk, answer in zip(batch, answers))
+        batch.clear()
+
+    for chunk in chunks:
+        batch.append(chunk)
+        if len(batch) >= max(1, window):
+            await flush()
+    if batch:
+        await flush()
+
+    if not partials:
+        return ""
+    if len(partials) == 1:
+        return partials[0][2]
+    if combine is not None:
+        combined = combine([text for _, _, text in partials])
+        if combined is not None:
+            return combined
+    logging.debug(f"Chunking: Reducing {len(partials)} partial results")
+
+    parts = [f"Lines {start}-{end}:\n{text.strip()}" for start, end, text in partials]
+    while True:
+        groups = _group_parts(parts, max_chars)
+        if len(groups) == 1:
+            return await send(_reduce_prompt(reduce_prompt, groups[0]))
+        answers = await asyncio.gather(*(send(_reduce_prompt(reduce_prompt, group)) for group in groups))
+        parts = [answer.strip() for answer in answers]
@@ -0,0 +1,39 @@
+"""
+    Registry of the ``codeforgeai`` subcommands.
+
+    Every command lives in its own module in this package, defining
+    ``add_arguments(parser)`` to fill in its subparser and ``run(args)`` to
+    execute it. Only the invoked command's module is imported, so commands
+    that never talk to a model start without loading ollama, httpx or the
+    engine, and ``codeforgeai --help`` loads none of them.
+"""
+
+import importlib
+
+# name: (module, help)
+COMMANDS = {
+    "analyze": ("analyze", "Analyze current working directory"),
+    "prompt": ("prompt", "Process a user prompt"),
+    "config": ("config", "Run configuration checkup"),
+    "strip": ("strip", "Print tree structure after removing gitignored files"),
+    "explain": ("explain", "Explain the code in the given file"),
+    "extract": ("extract", "Extract code blocks from file or string"),
+    "format": ("format", "Format code blocks for readability"),
+    "command": ("command", "Process a command request"),
+    "edit": ("edit", "Edit code in specified files or folders"),
+    "suggestion": ("suggestion", "Short suggestions from code model at lightning speed"),
+    "commit-message": ("commit_message", "Generate commit message with code changes and gitmoji"),
+    "index": ("index", "Query the project index built by analyze"),
+    "daemon": ("daemon", "Run or control the background daemon that keeps models and config warm"),
+    "secret-ai": ("secret_ai", "Secret AI SDK integration commands"),
+    "web3": ("web3", "Web3 development commands"),
+    "zerepy": ("zerepy", "ZerePy integration commands"),
+    "solana": ("solana", "Solana blockchain commands"),
+    "vyper": ("vyper", "Vyper smart contract commands"),
+    "github": ("github", "GitHub Copilot integration"),
+}
+
+
+def load(name):
+    """Import and return the module implementing command name."""
+    return importlib.import_module(f"{__name__}.{COMMANDS[name][0]}")
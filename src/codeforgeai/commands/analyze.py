@@ -0,0 +1,10 @@
+def add_arguments(parser):
+    parser.add_argument("--loop", action="store_true", help="Enable adaptive feedback loop")
+
+
+def run(args):
+    from codeforgeai.engine import Engine
+    if args.loop:
+        Engine().run_analysis_loop()
+    else:
+        Engine().run_analysis()
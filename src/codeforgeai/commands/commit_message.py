@@ -0,0 +1,7 @@
+def add_arguments(parser):
+    pass
+
+
+def run(args):
+    from codeforgeai.engine import Engine
+    print(Engine().process_commit_message())
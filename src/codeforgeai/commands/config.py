@@ -0,0 +1,14 @@
+import json
+import os
+
+
+def add_arguments(parser):
+    pass
+
+
+def run(args):
+    from codeforgeai.config import ensure_config_prompts
+    # Load directly from the file, not from any cached snapshot
+    config = ensure_config_prompts(os.path.expanduser("~/.codeforgeai.json"))
+    print("Configuration checkup complete. Current configuration:")
+    print(json.dumps(config, indent=4))
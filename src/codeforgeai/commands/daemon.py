@@ -0,0 +1,61 @@
+import os
+import sys
+
+from codeforgeai.config import get_config
+
+
+def add_arguments(parser):
+    parser.add_argument("daemon_command", choices=["start", "stop", "status"], help="Daemon action")
+    parser.add_argument("--foreground", action="store_true", help="Serve in this process instead of detaching")
+
+
+def run(args):
+    """Start, stop or report on the CodeforgeAI daemon"""
+    import subprocess
+    import time
+    from codeforgeai.server.client import control, socket_path
+
+    path = socket_path(get_config())
+    status = control("status", path)
+
+    if args.daemon_command == "start":
+        if status:
+            print(f"Daemon already running (pid {status['pid']}) on {path}")
+        elif args.foreground:
+            from codeforgeai.server.server import serve
+            print(f"Daemon listening on {path}; press Ctrl+C to stop")
+            try:
+                serve(path)
+            except KeyboardInterrupt:
+                pass
+        else:
+            subprocess.Popen(
+                [sys.executable, "-m", "codeforgeai.server.server", path],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+            # Wait for the daemon to import everything and start listening
+            deadline = time.monotonic() + 30
+            while time.monotonic() < deadline:
+                status = control("status", path)
+                if status:
+                    print(f"Daemon started (pid {status['pid']}) on {path}")
+                    return
+                time.sleep(0.1)
+            print("Error: the daemon did not start; run 'codeforgeai daemon start --foreground' to see why.", file=sys.stderr)
+    elif args.daemon_command == "stop":
+        if not status:
+            print("Daemon is not running.")
+            return
+        control("stop", path)
+        # Wait for the socket to go away so the next command runs in-process
+        deadline = time.monotonic() + 10
+        while os.path.exists(path) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        print(f"Daemon (pid {status['pid']}) stopped.")
+    else:
+        if not status:
+            print("Daemon is not running.")
+            return
+        print(f"Daemon running (pid {status['pid']}) on {path}")
+        print(f"Uptime: {status['uptime']:.0f}s, requests served: {status['requests']}, active: {status['active']}")
@@ -0,0 +1,321 @@
+import contextvars
+import json
+import keyword
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from codeforgeai.chunking import split_blocks, split_python
+from codeforgeai.config import get_config
+from codeforgeai.models.errors import ModelError
+from codeforgeai.patch import PatchError, apply_edit, validate
+from codeforgeai.skeleton import format_code_blocks
+
+_logger = logging.getLogger(__name__)
+
+# Names a slice defines, in Python and the usual C-like and scripting languages
+_SYMBOL = re.compile(r"\b(?:def|class|function|func|fn|struct|interface|trait|enum|type)\s+([A-Za-z_]\w*)")
+_WORD = re.compile(r"[A-Za-z_]\w*")
+# Words of an edit prompt that say what to do rather than where; a slice
+# defining e.g. add() or type() is not picked because the prompt says "add type hints"
+_GENERIC_WORDS = frozenset(word.lower() for word in keyword.kwlist) | frozenset("""
+    a an the to of in on at by for from into with without and or not no as is are be it its this that these those
+    all each every any some other new old same more less please should must can only also then so
+    add remove delete drop rename change update fix make use move replace refactor rewrite improve clean
+    handle support convert extract split merge inline simplify optimize document comment test check
+    type types hint hints annotation annotations docstring docstrings error errors exception exceptions
+    function functions method methods class classes variable variables argument arguments parameter
+    parameters value values code file line lines name names call calls return returns import imports
+    string str int float bool list dict set tuple none true false self cls
+""".split())
+# A rewrite shorter than this share of the original is taken to be truncated
+MIN_REWRITE_RATIO = 0.5
+
+
+def _tokens(text):
+    # Same four-characters-per-token estimate analyze uses for batching
+    return len(text) // 4
+
+
+def _eval_count():
+    """Tokens generated by the model calls reported to this context's metrics so far."""
+    from codeforgeai.metrics import current_registry
+    return sum(entry["eval_count"] for entry in current_registry().snapshot().values())
+
+
+def _edit_text(eng, rel_path, text, user_edit_prompt, config, lines=None):
+    """
+    Edit text, the whole of rel_path or the lines it spans. Outside "full"
+    edit_mode the model returns search/replace blocks or a unified diff,
+    which must apply cleanly (and keep Python parseable); otherwise it
+    rewrites the text; a rewrite that is empty or far shorter than text
+    raises PatchError rather than replacing it. Returns ``(edited text,
+    estimated tokens generated, whether it fell back to a rewrite)``.
+    """
+    where = f"{rel_path} (lines {lines[0]}-{lines[1]})" if lines else rel_path
+    generated, edited = 0, None
+    if config.get("edit_mode", "slice") != "full":
+        edit_diff_prompt = config.get("edit_diff_prompt",
+            "edit the file below as the prompt asks, replying only with <<<<<<< SEARCH / ======= / >>>>>>> REPLACE blocks:")
+        _logger.debug(f"Requesting edits for {where}")
+        response = eng.code_model.send_request(f"{edit_diff_prompt}\n{user_edit_prompt}\nFile path: {where}\n{text}")
+        generated += _tokens(response)
+        try:
+            edited = apply_edit(text, response)
+            validate(rel_path, text, edited)
+        except PatchError as e:
+            _logger.warning(f"{where}: {e}; asking for the whole text instead")
+            edited = None
+
+    fell_back = edited is None
+    if fell_back:
+        edit_finetune_prompt = config.get("edit_finetune_prompt",
+            "attend to the below prompt, editing the provided code and returning nothing but the edited code:")
+        _logger.debug(f"Requesting a full rewrite of {where}")
+        response = eng.code_model.send_request(f"{edit_finetune_prompt}\n{user_edit_prompt}\n{where}\n{text}")
+        generated += _tokens(response)
+        # Models do not always fence the code they return
+        edited = format_code_blocks(response, separator=config.get("format_line_separator", 1)) or response.strip()
+        if len(edited.strip()) < MIN_REWRITE_RATIO * len(text.strip()):
+            raise PatchError(
+                f"the rewrite of {where} has {len(edited)} characters where the original has {len(text)}; not saving it"
+            )
+        if text.endswith("\n") and not edited.endswith("\n"):
+            edited += "\n"
+    return edited, generated, fell_back
+
+
+def _slices(rel_path, content, max_chars):
+    """Split content on top-level definitions (Python) or blank lines; None if that loses text."""
+    if rel_path.endswith((".py", ".pyi")):
+        slices = split_python(content, max_chars)
+    else:
+        slices = list(split_blocks(content.splitlines(keepends=True), max_chars))
+    return slices if "".join(s.text for s in slices) == content else None
+
+
+def _select_slices(eng, rel_path, slices, user_edit_prompt, config):
+    """
+    Indices of the slices user_edit_prompt is about. When it names symbols
+    the file defines, that is every slice defining or using them, so a
+    rename reaches the call sites too; otherwise the ones the general model
+    picks from an outline of the file, else all of them. Returns
+    ``(indices, estimated tokens generated)``.
+    """
+    words = {word for word in _WORD.findall(user_edit_prompt) if word.lower() not in _GENERIC_WORDS}
+    named = words & set().union(*(_SYMBOL.findall(s.text) for s in slices))
+    picked = [i for i, s in enumerate(slices) if named & set(_WORD.findall(s.text))] if named else []
+    if picked:
+        return picked, 0
+
+    outline = "\n".join(
+        f"{i}: lines {s.start_line}-{s.end_line}: "
+        + (", ".join(_SYMBOL.findall(s.text)[:8]) or s.text.strip().split("\n", 1)[0][:80])
+        for i, s in enumerate(slices)
+    )
+    edit_relevance_prompt = config.get("edit_relevance_prompt",
+        "reply only with a JSON array of the numbers of the file parts below that must change for this edit:")
+    generated = 0
+    try:
+        response = eng.general_model.send_request(
+            f"{edit_relevance_prompt}\n{user_edit_prompt}\nFile path: {rel_path}\n{outline}", format="json"
+        )
+        generated = _tokens(response)
+        answer = json.loads(response)
+    except (TypeError, ValueError):
+        answer = None
+    except ModelError as e:
+        if e.transient:
+            raise
+        answer = None
+    if isinstance(answer, dict):
+        # Models often wrap the array, e.g. {"parts": [1, 4]}
+        answer = next((value for value in answer.values() if isinstance(value, list)), None)
+    if isinstance(answer, list):
+        picked = sorted({i for i in answer if isinstance(i, int) and 0 <= i < len(slices)})
+    if not picked:
+        _logger.debug(f"{rel_path}: no relevant slices picked, editing all {len(slices)}")
+        picked = list(range(len(slices)))
+    return picked, generated
+
+
+def _edit_slices(eng, rel_path, content, slices, user_edit_prompt, config, concurrency=None):
+    """
+    Edit only the relevant slices, up to concurrency (edit_concurrency by
+    default) at a time, and put them back in place. Text outside the edited
+    slices is kept byte for byte, as are the blank lines that end each
+    edited slice. Returns the same as _edit_text, or None when the stitched
+    file no longer parses.
+    """
+    picked, generated = _select_slices(eng, rel_path, slices, user_edit_prompt, config)
+    _logger.debug(f"{rel_path}: editing {len(picked)} of {len(slices)} slices")
+    concurrency = max(1, concurrency or int(config.get("edit_concurrency", 4)))
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            i: executor.submit(
+                contextvars.copy_context().run, _edit_text, eng, rel_path, slices[i].text, user_edit_prompt,
+                config, (slices[i].start_line, slices[i].end_line)
+            )
+            for i in picked
+        }
+        results = {i: future.result() for i, future in futures.items()}
+
+    parts, fell_back = [], False
+    for i, piece in enumerate(slices):
+        if i not in results:
+            parts.append(piece.text)
+            continue
+        edited, used, rewritten = results[i]
+        generated += used
+        fell_back = fell_back or rewritten
+        trailing = piece.text[len(piece.text.rstrip()):]
+        parts.append(edited.rstrip() + trailing)
+    edited_code = "".join(parts)
+    try:
+        validate(rel_path, content, edited_code)
+    except PatchError as e:
+        _logger.warning(f"{rel_path}: {e} after stitching the edited slices; editing the whole file instead")
+        return None
+    return edited_code, generated, fell_back
+
+
+def _edit_file(eng, rel_path, user_edit_prompt, config, slice_concurrency=None):
+    """
+    Edit one file and save the result next to it. In "slice" edit_mode,
+    files longer than edit_slice_chars are split into slices and only the
+    relevant ones are edited, slice_concurrency at a time. Returns ``(out_path, estimated tokens generated
+    and tokens a full rewrite takes, whether it fell back to one)``.
+    """
+    with open(rel_path, "r", encoding="utf-8", errors="ignore") as f:
+        content = f.read()
+
+    result = None
+    slice_chars = max(1, int(config.get("edit_slice_chars", 6000)))
+    if config.get("edit_mode", "slice") == "slice" and len(content) > slice_chars:
+        slices = _slices(rel_path, content, slice_chars)
+        if slices and len(slices) > 1:
+            result = _edit_slices(eng, rel_path, content, slices, user_edit_prompt, config, slice_concurrency)
+    if result is None:
+        result = _edit_text(eng, rel_path, content, user_edit_prompt, config)
+    edited_code, generated, fell_back = result
+
+    out_path = f"{rel_path}.codeforgedit"
+    with open(out_path, "w", encoding="utf-8") as outf:
+        outf.write(edited_code)
+    return out_path, generated, _tokens(edited_code), fell_back
+
+
+def add_arguments(parser):
+    parser.add_argument("paths", nargs="+", help="Files or directories to edit")
+    parser.add_argument("--user_prompt", nargs="+", required=True, help="User prompt for editing")
+    # Added --allow-ignore
+    parser.add_argument("--allow-ignore", action="store_true",
+                        help="Allow explicitly passed directories to be processed even if .gitignore ignores them")
+
+
+def run(args):
+    config = get_config()
+    from codeforgeai.gitignore import GitignoreMatcher
+    from codeforgeai.engine import Engine
+    _logger.debug("Edit command: Starting file collection...")
+    matcher = GitignoreMatcher(os.getcwd())
+
+    # Modified gather_files to handle allow_ignore
+    def gather_files(paths, allow_ignore=False):
+        collected = []
+        for p in paths:
+            abs_p = os.path.abspath(p)
+            _logger.debug(f"Processing path: {abs_p}")
+
+            if os.path.isfile(abs_p):
+                if not matcher.is_ignored(abs_p, False):
+                    collected.append(abs_p)
+                    _logger.debug(f"Added file: {abs_p}")
+            elif os.path.isdir(abs_p):
+                # If allow_ignore is set, add directory itself
+                if allow_ignore and not abs_p in collected:
+                    collected.append(abs_p)
+                    _logger.debug(f"Allowed directory: {abs_p}")
+
+                for root, dirs, files in os.walk(abs_p):
+                    dirs[:] = [d for d in dirs if not matcher.is_ignored(os.path.join(root, d), True)]
+                    for f in files:
+                        fp = os.path.join(root, f)
+                        if not matcher.is_ignored(fp, False):
+                            collected.append(fp)
+                            _logger.debug(f"Added file: {fp}")
+        return collected
+
+    try:
+        files_to_edit = gather_files(args.paths, args.allow_ignore)
+        _logger.debug(f"Found {len(files_to_edit)} files to process")
+
+        # Convert to relative paths and sort
+        rel_paths = sorted([os.path.relpath(fp, os.getcwd()) for fp in files_to_edit])
+        user_edit_prompt = " ".join(args.user_prompt)
+
+        eng = Engine()
+        _logger.debug("Initialized Engine for processing")
+
+        from codeforgeai.prefilter import inspect_file
+
+        to_edit = []
+        for rel_path in rel_paths:
+            label = inspect_file(rel_path, config)
+            if label:
+                print(f"Skipping {rel_path}: {label}")
+                continue
+            to_edit.append(rel_path)
+
+        concurrency = max(1, int(config.get("edit_concurrency", 4)))
+        # Files being edited share the budget for slices, so at most
+        # edit_concurrency slice requests are in flight in total
+        slice_concurrency = max(1, concurrency // max(1, min(concurrency, len(to_edit))))
+        generated = rewrite = fallbacks = edited = 0
+        eval_before = _eval_count()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # Workers run in a copy of the caller's context, e.g. its scheduling priority
+            futures = {
+                executor.submit(
+                    contextvars.copy_context().run, _edit_file, eng, rel_path, user_edit_prompt, config, slice_concurrency
+                ): rel_path
+                for rel_path in to_edit
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                rel_path = futures[future]
+                try:
+                    out_path, used, full, fell_back = future.result()
+                except ModelError:
+                    # The model is missing, rejecting requests or down; the remaining files would fail too
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                except (PatchError, OSError) as e:
+                    _logger.error(f"Error processing {rel_path}: {e}")
+                    continue
+                edited += 1
+                generated += used
+                rewrite += full
+                fallbacks += fell_back
+                print(f"[{done}/{len(to_edit)}] Edited code saved to: {out_path}")
+
+        if edited:
+            measured = _eval_count() - eval_before
+            if measured and generated:
+                # Scale the rewrite estimate by the tokens per character this model really produced
+                print(f"Generated {measured} tokens for {edited} files "
+                      f"(rewriting them in full would take about {rewrite * measured // generated}).")
+            else:
+                # The backend reported no token counts, e.g. every answer came from the cache
+                print(f"Generated an estimated {generated} tokens for {edited} files "
+                      f"(rewriting them in full would take an estimated {rewrite}).")
+            if fallbacks:
+                print(f"{fallbacks} files fell back to a full rewrite.")
+
+        _logger.debug("Edit command: Completed processing all files")
+    except ModelError:
+        # Reported by the entry point, which exits with status 1
+        raise
+    except Exception as e:
+        _logger.error(f"Edit command failed: {e}")
@@ -0,0 +1,9 @@
+def add_arguments(parser):
+    parser.add_argument("file_path", help="Path to the file to be explained")
+
+
+def run(args):
+    from codeforgeai.engine import Engine
+    from codeforgeai.utils import print_token
+    Engine().explain_code(args.file_path, on_token=print_token)
+    print()
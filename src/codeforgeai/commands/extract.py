@@ -0,0 +1,25 @@
+import json
+
+from codeforgeai.skeleton import extract_code_blocks
+
+
+def add_arguments(parser):
+    parser.add_argument("--file", help="Path to the file to process")
+    parser.add_argument("--string", help="Input string containing code blocks")
+
+
+def run(args):
+    # read from file if present, else use string
+    if args.file:
+        with open(args.file, "r") as f:
+            content = f.read()
+        blocks = extract_code_blocks(content)
+        json_output = json.dumps(blocks, indent=4)
+        with open(args.file, "w") as f:
+            f.write(json_output)
+        print("Extracted code blocks written to file as JSON.")
+    elif args.string:
+        blocks = extract_code_blocks(args.string)
+        print(json.dumps(blocks, indent=4))
+    else:
+        print("No file or string provided for extraction.")
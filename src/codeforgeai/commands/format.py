@@ -0,0 +1,24 @@
+from codeforgeai.config import get_config
+from codeforgeai.skeleton import format_code_blocks
+
+
+def add_arguments(parser):
+    parser.add_argument("--file", help="Path to the file to process")
+    parser.add_argument("--string", help="Input string containing code blocks")
+
+
+def run(args):
+    # Load format_line_separator from config
+    separator = get_config().get("format_line_separator", 1)
+    if args.file:
+        with open(args.file, "r") as f:
+            content = f.read()
+        formatted = format_code_blocks(content, separator)
+        with open(args.file, "w") as f:
+            f.write(formatted)
+        print("Formatted code blocks written to file.")
+    elif args.string:
+        formatted = format_code_blocks(args.string, separator)
+        print(formatted)
+    else:
+        print("No file or string provided for formatting.")
@@ -0,0 +1,38 @@
+def add_arguments(parser):
+    github_subparsers = parser.add_subparsers(dest="github_command", help="GitHub Copilot commands", required=True)
+    copilot_parser = github_subparsers.add_parser("copilot", help="Github copilot integration")
+    copilot_subparsers = copilot_parser.add_subparsers(dest="copilot_command", help="Copilot commands", required=True)
+    copilot_subparsers.add_parser("login", help="Authenticate with GitHub Copilot")
+    copilot_subparsers.add_parser("logout", help="Logout from GitHub Copilot")
+    copilot_subparsers.add_parser("status", help="Check GitHub Copilot status")
+    copilot_subparsers.add_parser("lsp", help="install copilot language server globally")
+    inline_parser = copilot_subparsers.add_parser("inline-completion", help="Get inline code completion at a specific position")
+    inline_parser.add_argument("--file", required=True, help="Path to the file")
+    inline_parser.add_argument("--line", type=int, required=True, help="Line number (0-based)")
+    inline_parser.add_argument("--character", type=int, required=True, help="Character position (0-based)")
+    panel_parser = copilot_subparsers.add_parser("panel-completion", help="Get panel (multi-line) code completion at a specific position")
+    panel_parser.add_argument("--file", required=True, help="Path to the file")
+    panel_parser.add_argument("--line", type=int, required=True, help="Line number (0-based)")
+    panel_parser.add_argument("--character", type=int, required=True, help="Character position (0-based)")
+
+
+def run(args):
+    if getattr(args, "github_command", None) == "copilot":
+        from codeforgeai.integrations.github_copilot import copilot as copilot_lsp
+        copilot_cmd = getattr(args, "copilot_command", None)
+        if copilot_cmd == "lsp":
+            copilot_lsp.install_copilot_language_server()
+        elif copilot_cmd == "login":
+            copilot_lsp.copilot_login()
+        elif copilot_cmd == "logout":
+            copilot_lsp.copilot_logout()
+        elif copilot_cmd == "status":
+            copilot_lsp.copilot_status()
+        elif copilot_cmd == "inline-completion":
+            copilot_lsp.copilot_lsp_inline_completion(args.file, args.line, args.character)
+        elif copilot_cmd == "panel-completion":
+            copilot_lsp.copilot_lsp_panel_completion(args.file, args.line, args.character)
+        else:
+            print("Invalid copilot subcommand. Use --help to see available commands.")
+    else:
+        print("Invalid github subcommand. Use --help to see available commands.")
@@ -0,0 +1,40 @@
+import json
+import os
+
+
+def add_arguments(parser):
+    index_subparsers = parser.add_subparsers(dest="index_command", help="Index commands")
+    index_query_parser = index_subparsers.add_parser("query", help="Look up indexed files by path, glob or class")
+    index_query_parser.add_argument("--path", help="Exact relative file path")
+    index_query_parser.add_argument("--glob", help="Glob pattern on relative paths, e.g. 'src/*.py'")
+    index_query_parser.add_argument("--class", dest="classification", help="Classification substring, case-insensitive")
+    index_query_parser.add_argument("--json", action="store_true", help="Print one JSON object per line")
+    index_export_parser = index_subparsers.add_parser("export", help="Export the index as .codeforge.json")
+    index_export_parser.add_argument("--output", help="Output path (defaults to .codeforge.json)")
+
+
+def run(args):
+    """Handle project index commands"""
+    from codeforgeai.index import ProjectIndex, INDEX_PATH, JSON_PATH
+
+    if not os.path.exists(INDEX_PATH) and not os.path.exists(JSON_PATH):
+        print("No project index found. Run 'codeforgeai analyze' first.")
+        return
+
+    with ProjectIndex(INDEX_PATH) as index:
+        if args.index_command == "query":
+            found = 0
+            for entry in index.query(args.path, args.glob, args.classification):
+                found += 1
+                if args.json:
+                    print(json.dumps(entry))
+                else:
+                    print(f"{entry['path']}: {entry['classification']}")
+            if not found and not args.json:
+                print("No matching files in the index.")
+        elif args.index_command == "export":
+            output = args.output or JSON_PATH
+            index.export_json(output)
+            print(f"Index exported to {output}")
+        else:
+            print("Invalid index command. Use 'codeforgeai index --help' to see available commands.")
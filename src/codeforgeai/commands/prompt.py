@@ -0,0 +1,7 @@
+def add_arguments(parser):
+    parser.add_argument("user_prompt", nargs="+", help="User input prompt")
+
+
+def run(args):
+    from codeforgeai.skeleton import process_prompt
+    process_prompt(args.user_prompt)
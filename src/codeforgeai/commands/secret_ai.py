@@ -0,0 +1,60 @@
+from codeforgeai.utils import print_token
+
+
+def add_arguments(parser):
+    secret_ai_subparsers = parser.add_subparsers(dest="secret_ai_command", help="Secret AI commands")
+    secret_ai_subparsers.add_parser("list-models", help="List available Secret AI models")
+    secret_ai_subparsers.add_parser("test-connection", help="Test Secret AI connection")
+    secret_ai_chat_parser = secret_ai_subparsers.add_parser("chat", help="Chat with Secret AI")
+    secret_ai_chat_parser.add_argument("message", nargs="+", help="Chat message")
+
+
+def run(args):
+    """Handle Secret AI SDK integration commands"""
+    import codeforgeai.utils as utils
+    
+    # Import inside function to avoid circular imports
+    try:
+        from codeforgeai.integrations.secret_ai.secret_ai_integration import SecretAIModel, list_secret_ai_models
+    except ImportError:
+        print("Error: Secret AI SDK integration not available. Install required packages.")
+        return
+    
+    if args.secret_ai_command == "list-models":
+        models = list_secret_ai_models()
+        if models:
+            print("Available Secret AI models:")
+            for i, model in enumerate(models, 1):
+                print(f"{i}. {model}")
+        else:
+            print("No Secret AI models available. Check your credentials.")
+    
+    elif args.secret_ai_command == "test-connection":
+        if not utils.check_secret_ai_credentials():
+            print("Error: Secret AI API key not found. Set the CLAIVE_AI_API_KEY environment variable.")
+            return
+            
+        model = SecretAIModel()
+        model_info = model.get_model_info()
+        
+        if not model_info["current_model"]:
+            print("Error: Could not connect to Secret AI. Check your credentials.")
+        else:
+            print(f"Connected to Secret AI successfully.")
+            print(f"Current model: {model_info['current_model']}")
+            print(f"Available models: {', '.join(model_info['available_models'])}")
+    
+    elif args.secret_ai_command == "chat":
+        if not utils.check_secret_ai_credentials():
+            print("Error: Secret AI API key not found. Set the CLAIVE_AI_API_KEY environment variable.")
+            return
+            
+        message = " ".join(args.message)
+        model = SecretAIModel()
+        print("\nSecret AI response:")
+        for piece in model.stream_request(message):
+            print_token(piece)
+        print()
+    
+    else:
+        print("Invalid Secret AI command. Use 'codeforgeai secret-ai --help' to see available commands.")
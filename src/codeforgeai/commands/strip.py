@@ -0,0 +1,7 @@
+def add_arguments(parser):
+    pass
+
+
+def run(args):
+    from codeforgeai.directory import strip_directory
+    strip_directory()
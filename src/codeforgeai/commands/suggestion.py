@@ -0,0 +1,77 @@
+import logging
+
+from codeforgeai.config import get_config
+from codeforgeai.skeleton import call_code_ai, format_code_blocks
+
+_logger = logging.getLogger(__name__)
+
+
+def add_arguments(parser):
+    parser.add_argument("--file", help="File to read code from (defaults to last line unless --line is specified)")
+    parser.add_argument("--line", type=int, help="Line number to use for suggestion")
+    parser.add_argument("--string", nargs="*", help="User-provided code snippet for suggestion")
+    # New optional flag
+    parser.add_argument("--entire", "-E", action="store_true",
+                        help="Send entire file content for suggestion (must be typed as one token: --entire)")
+
+
+def run(args):
+    config = get_config()
+    suggestion_prompt = config.get("suggestion_prompt", "Provide a short suggestion:")
+    input_code = None
+
+    if args.string:
+        # User-provided code snippet
+        input_code = " ".join(args.string)
+        suggestion_response = call_code_ai(f"{suggestion_prompt}\n{input_code}")
+        suggested_code = format_code_blocks(suggestion_response, 1)
+        print(suggested_code)
+        return
+    elif args.file:
+        try:
+            with open(args.file, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+
+            if args.entire:
+                entire_content = "".join(lines)
+                # Use entire_suggestion_prompt if available, else fallback to suggestion_prompt
+                entire_suggestion_prompt = config.get("entire_suggestion_prompt", suggestion_prompt)
+                suggestion_response = call_code_ai(f"{entire_suggestion_prompt}\n{entire_content}")
+                suggested_output = format_code_blocks(suggestion_response, 1)
+                # New check to align first line
+                original_first_line = lines[0].rstrip("\n")
+                splitted_suggested = suggested_output.splitlines()
+                if original_first_line in splitted_suggested:
+                    first_match_index = splitted_suggested.index(original_first_line)
+                    splitted_suggested = splitted_suggested[first_match_index:]
+                    suggested_output = "\n".join(splitted_suggested)
+
+                out_path = f"{args.file}.cfsuggestions"
+                with open(out_path, "w", encoding="utf-8") as outf:
+                    outf.write(suggested_output)
+                print(f"Suggestion applied to {out_path}")
+            else:
+                # File-based suggestion
+                target_line_index = args.line - 1 if args.line else len(lines) - 1
+                if target_line_index < 0 or target_line_index >= len(lines):
+                    print("Invalid line number for suggestion.")
+                    return
+
+                # Use the target line
+                target_line = lines[target_line_index].rstrip("\n")
+                suggestion_response = call_code_ai(f"{suggestion_prompt}\n{target_line}")
+                suggested_line = format_code_blocks(suggestion_response, 1).strip("\n")
+
+                # Replace just the target line
+                lines[target_line_index] = f"{suggested_line}\n"
+
+                # Save modified content
+                out_path = f"{args.file}.cfsuggestions"
+                with open(out_path, "w", encoding="utf-8") as outf:
+                    outf.writelines(lines)
+
+                print(f"Suggestion applied to {out_path}")
+        except Exception as e:
+            _logger.error(f"Error handling suggestion for {args.file}: {e}")
+    else:
+        print("No input provided for suggestion (use --string or --file).")
@@ -0,0 +1,66 @@
+import json
+import os
+
+
+def add_arguments(parser):
+    vyper_subparsers = parser.add_subparsers(dest="vyper_command", help="Vyper commands")
+
+    compile_parser = vyper_subparsers.add_parser("compile", help="Compile a Vyper smart contract")
+    compile_parser.add_argument("file_path", help="Path to the .vy contract")
+    compile_parser.add_argument("-f", "--format", default="abi", help="Output format, e.g. abi or bytecode")
+    compile_parser.add_argument("--optimize", choices=["none", "gas", "codesize"], help="Optimization mode")
+    compile_parser.add_argument("--evm-version", dest="evm_version", help="Target EVM version")
+
+    analyze_parser = vyper_subparsers.add_parser("analyze", help="Analyze a Vyper smart contract")
+    analyze_parser.add_argument("file_path", help="Path to the .vy contract")
+
+    vyper_subparsers.add_parser("check", help="Check if Vyper is installed")
+
+
+def run(args):
+    """Handle Vyper smart contract development commands"""
+    
+    try:
+        from codeforgeai.integrations.vyper import compile_contract, check_vyper_installed, analyze_contract
+    except ImportError:
+        print("Error: Vyper integration not available. Check if the module is properly installed.")
+        return
+    
+    if args.vyper_command == "compile":
+        result = compile_contract(args.file_path, args.format, args.optimize, args.evm_version)
+        
+        if "error" in result:
+            print(f"Error: {result['error']}")
+            return
+            
+        print(f"Contract compiled successfully!")
+        if isinstance(result["output"], dict):
+            print(json.dumps(result["output"], indent=2))
+        else:
+            print(result["output"])
+            
+    elif args.vyper_command == "analyze":
+        result = analyze_contract(args.file_path)
+        
+        if "error" in result:
+            print(f"Error: {result['error']}")
+            return
+            
+        print(f"Analysis of {os.path.basename(args.file_path)}:")
+        print(f"Contract Type: {result.get('contract_type', 'Unknown')}")
+        print("\nFeatures detected:")
+        for feature, present in result.get('features', {}).items():
+            status = "✓" if present else "✗"
+            print(f"  {status} {feature.replace('_', ' ').replace('has ', '')}")
+    
+    elif args.vyper_command == "check":
+        result = check_vyper_installed()
+        
+        if result["installed"]:
+            print(f"Vyper is installed. Version: {result['version']}")
+        else:
+            print("Vyper is not installed or not in the PATH.")
+            print("To install Vyper, follow the instructions at: https://docs.vyperlang.org/en/latest/installing-vyper.html")
+    
+    else:
+        print("Invalid Vyper command. Use --help to see available commands.")
@@ -0,0 +1,90 @@
+import os
+
+
+def add_arguments(parser):
+    web3_subparsers = parser.add_subparsers(dest="web3_command", help="Web3 commands")
+
+    scaffold_parser = web3_subparsers.add_parser("scaffold", help="Scaffold a new web3 project")
+    scaffold_parser.add_argument("project_name", help="Name of the project")
+    scaffold_parser.add_argument("--type", choices=["dapp", "smart-contract", "token", "nft"], default="dapp", help="Project type")
+    scaffold_parser.add_argument("--output", help="Output directory")
+
+    analyze_contract_parser = web3_subparsers.add_parser("analyze-contract", help="Analyze a smart contract")
+    analyze_contract_parser.add_argument("contract_file", help="Path to the smart contract")
+
+    gas_parser = web3_subparsers.add_parser("estimate-gas", help="Estimate gas costs for a smart contract")
+    gas_parser.add_argument("contract_file", help="Path to the smart contract")
+
+    tests_parser = web3_subparsers.add_parser("generate-tests", help="Generate tests for a smart contract")
+    tests_parser.add_argument("contract_file", help="Path to the smart contract")
+    tests_parser.add_argument("--output", help="Output directory for tests")
+
+    web3_subparsers.add_parser("check-env", help="Check web3 development environment")
+
+    # Web3 - install dependencies
+    web3_deps_parser = web3_subparsers.add_parser("install-deps", help="Install web3 dependencies")
+    web3_deps_parser.add_argument("--full", action="store_true", help="Install full set of dependencies")
+
+
+def run(args):
+    """Handle Web3 development commands"""
+    import codeforgeai.utils as utils
+    
+    # Import inside function to avoid circular imports
+    try:
+        from codeforgeai.integrations.secret_ai.web3_commands import (
+            scaffold_web3_project, 
+            analyze_smart_contract,
+            estimate_gas_costs,
+            generate_web3_tests
+        )
+    except ImportError:
+        print("Error: Web3 integration not available. Install required packages.")
+        return
+    
+    if args.web3_command == "scaffold":
+        result = scaffold_web3_project(
+            project_name=args.project_name,
+            project_type=args.type,
+            output_dir=args.output
+        )
+        print(result)
+    
+    elif args.web3_command == "analyze-contract":
+        result = analyze_smart_contract(args.contract_file)
+        print(utils.format_smart_contract_analysis(result))
+    
+    elif args.web3_command == "estimate-gas":
+        result = estimate_gas_costs(args.contract_file)
+        print(result)
+    
+    elif args.web3_command == "generate-tests":
+        tests = generate_web3_tests(args.contract_file)
+        
+        if "error" in tests:
+            print(f"Error: {tests['error']}")
+            return
+            
+        output_dir = args.output or os.path.dirname(args.contract_file) or os.getcwd()
+        tests_dir = os.path.join(output_dir, "tests")
+        os.makedirs(tests_dir, exist_ok=True)
+        
+        for test_file, content in tests.items():
+            file_path = os.path.join(tests_dir, os.path.basename(test_file))
+            with open(file_path, "w") as f:
+                f.write(content)
+            print(f"Generated test file: {file_path}")
+    
+    elif args.web3_command == "check-env":
+        env_status = utils.check_web3_dev_environment()
+        print("Web3 Development Environment:")
+        for tool, status in env_status.items():
+            print(f"- {tool}: {status}")
+    
+    elif args.web3_command == "install-deps":
+        install_type = "full" if args.full else "minimal" 
+        result = utils.install_web3_dependencies(install_type)
+        print(result)
+    
+    else:
+        print("Invalid web3 command. Use 'codeforgeai web3 --help' to see available commands.")
@@ -0,0 +1,71 @@
+def add_arguments(parser):
+    zerepy_subparsers = parser.add_subparsers(dest="zerepy_command", help="ZerePy commands")
+
+    zerepy_subparsers.add_parser("status", help="Check ZerePy server status")
+    zerepy_subparsers.add_parser("list-agents", help="List available ZerePy agents")
+
+    zerepy_load_parser = zerepy_subparsers.add_parser("load-agent", help="Load a ZerePy agent")
+    zerepy_load_parser.add_argument("agent_name", help="Name of the agent to load")
+
+    zerepy_action_parser = zerepy_subparsers.add_parser("action", help="Execute a ZerePy action")
+    zerepy_action_parser.add_argument("connection", help="Connection name")
+    zerepy_action_parser.add_argument("action", help="Action name")
+    zerepy_action_parser.add_argument("--params", help="Action parameters in JSON format")
+
+    zerepy_chat_parser = zerepy_subparsers.add_parser("chat", help="Chat with a ZerePy agent")
+    zerepy_chat_parser.add_argument("message", nargs="+", help="Chat message")
+
+
+def run(args):
+    """Handle ZerePy integration commands"""
+    import json
+    
+    # Import inside function to avoid circular imports
+    try:
+        from codeforgeai.integrations.zerepy.zerepy_integration import ZerePyClient, is_zerepy_available
+    except ImportError:
+        print("Error: ZerePy integration not available. Install required packages.")
+        return
+    
+    if not is_zerepy_available():
+        print("Error: ZerePy server is not available. Make sure it's running.")
+        return
+        
+    client = ZerePyClient()
+    
+    if args.zerepy_command == "status":
+        status = client.server_status()
+        print("ZerePy Server Status:")
+        print(json.dumps(status, indent=2))
+        
+    elif args.zerepy_command == "list-agents":
+        agents = client.list_agents()
+        print("Available ZerePy Agents:")
+        for i, agent in enumerate(agents, 1):
+            print(f"{i}. {agent}")
+            
+    elif args.zerepy_command == "load-agent":
+        response = client.load_agent(args.agent_name)
+        print(f"Load agent response: {json.dumps(response, indent=2)}")
+        
+    elif args.zerepy_command == "action":
+        params = {}
+        if args.params:
+            try:
+                params = json.loads(args.params)
+            except json.JSONDecodeError:
+                print("Error: Invalid JSON format for parameters")
+                return
+                
+        result = client.perform_action(args.connection, args.action, params)
+        print("Action result:")
+        print(json.dumps(result, indent=2))
+        
+    elif args.zerepy_command == "chat":
+        message = " ".join(args.message)
+        response = client.chat(message)
+        print("\nZerePy Agent Response:")
+        print(response)
+    
+    else:
+        print("Invalid ZerePy command. Use 'codeforgeai zerepy --help' to see available commands.")
@@ -1,7 +1,13 @@
 import os
 import json
+import threading
+from types import MappingProxyType
 
+CONFIG_PATH = "~/.codeforgeai.json"
+
+# expanded path -> ((mtime_ns, size), snapshot)
 _config_cache = {}
+_config_lock = threading.RLock()
 
 def create_default_config(config_path):
     
@@ -13,18 +19,67 @@ def create_default_config(config_path):
         "directory_classification_prompt": "Given the complete tree structure below as valid JSON, recursively process every single file and directory (based on its relative path) that is present. For each node, assign exactly one classification: 'useful' for files and directories that developers interact with, 'useless' for build, template, or temporary files and directories, and 'source' for source control or related files. For every node, return an object with the keys: 'type' (either 'file' or 'directory'), 'name', 'contents' (an array of child entries for directories, or file details for files), and a new key 'classification' that holds one of 'useful', 'useless', or 'source'. Ensure every file and directory from the input is included exactly once with one classification. Return only valid JSON with this structure and nothing else.",
         "debug": False,
         "format_line_separator": 5,
+        "analyze_concurrency": 4,
+        "index_batch_size": 50,
+        "index_export_json": True,
+        "watch_backend": "auto",
+        "watch_debounce": 0.5,
+        "prefilter_max_bytes": 262144,
+        "prefilter_sniff_bytes": 8192,
+        "prefilter_max_line_length": 1000,
+        "chunk_chars": 12000,
+        "chunk_concurrency": 4,
+        "chunk_memory_limit": 131072,
+        "edit_mode": "slice",
+        "edit_concurrency": 4,
+        "edit_slice_chars": 6000,
+        "ollama_host": "",
+        "ollama_connect_timeout": 5.0,
+        "ollama_read_timeout": 300.0,
+        "ollama_keep_alive": "10m",
+        "ollama_max_connections": 8,
+        "model_concurrency": 4,
+        "model_retries": 3,
+        "model_retry_base_delay": 0.5,
+        "model_retry_max_delay": 8.0,
+        "circuit_failure_threshold": 5,
+        "circuit_reset_timeout": 30.0,
+        "response_cache": False,
+        "response_cache_dir": "~/.cache/codeforgeai",
+        "response_cache_max_bytes": 104857600,
+        "response_cache_ttl": {"default": 604800, "analyze": 2592000, "commit-message": 0},
+        "daemon_socket": "",
+        "scheduler_slots": 4,
+        "scheduler_limits": {"interactive": 4, "normal": 4, "background": 3},
+        "scheduler_priorities": {
+            "suggestion": "interactive",
+            "explain": "interactive",
+            "prompt": "interactive",
+            "command": "interactive",
+            "commit-message": "interactive",
+            "analyze": "background"
+        },
         
         "gitmoji_prompt": "reply only with a single emoji character that best fits the below commit message, and nothing else.",
 
         "commit_message_prompt": "Generate a very short and very concise, one sentence commit message for these code changes, and nothng else. ",
 
         "edit_finetune_prompt": "edit this code according to the below prompt and return nothing but the edited code",
+        "edit_diff_prompt": "edit the file below according to the prompt that follows it. Reply only with search/replace blocks: a line <<<<<<< SEARCH, the exact lines to change copied from the file with enough surrounding lines to be unique, a line =======, the new lines, and a line >>>>>>> REPLACE. Do not repeat unchanged parts of the file:",
+        "edit_relevance_prompt": "reply only with a JSON array of the numbers of the file parts outlined below that must change to carry out the edit request that follows:",
         "code_or_command": "reply with either code or command only; is the below request best satisfied with a code response or command response:",
         "command_agent_prompt": "one for each line and nothing else, return a list of commands that can be executed to achieve the below request, and nothing else:",
         "prompt_finetune_prompt": "in a clear and concise manner, rephrase the following prompt to be more understandable to a coding ai agent, return the rephrased prompt and nothing else",
         "language_classification_prompt": "in one word only, what programming language is used in this project tree structure",
+        "language_confidence_threshold": 0.6,
         "readme_summary_prompt": "in one short sentence only, generate a concise summary of this text below, and nothing else",
         "specific_file_classification": "taking the path and content of this file and classify it into either only user code file or project code file or source control file",
+        "batch_file_classification": "classify each file below into exactly one of: user code file, project code file, source control file. Reply with only a JSON object mapping every file path to its class.",
+        "classification_batch_tokens": 2048,
+        "classification_batch_file_bytes": 2048,
+        "classification_batch_max_files": 16,
+        "classification_reduce_prompt": "these are classifications of consecutive parts of one file; reply with only the single class of the whole file: user code file, project code file or source control file",
+        "explain_reduce_prompt": "combine these explanations of consecutive parts of one file into a single clear and concise explanation of the whole file",
         "improve_code_prompt": "given this block of code, improve the code generally and return nothing but the improved code:"
     }
     # Expand the user directory
@@ -33,6 +88,7 @@ def create_default_config(config_path):
     os.makedirs(os.path.dirname(config_path), exist_ok=True)
     with open(config_path, "w") as f:
         json.dump(default_config, f, indent=4)
+    _invalidate(config_path)
     return default_config
 
 def load_config(config_path):
@@ -50,6 +106,40 @@ def load_config(config_path):
         print(f"Error loading config file: {e}")
         return {}
 
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def get_config(config_path=CONFIG_PATH):
+    """
+    Return a read-only snapshot of the configuration.
+
+    The file is only parsed again when its mtime or size changes, so callers
+    can ask for the config as often as they like. The same snapshot object is
+    returned until then; use load_config for a mutable copy.
+    """
+    expanded_path = os.path.expanduser(config_path)
+    try:
+        st = os.stat(expanded_path)
+    except FileNotFoundError:
+        create_default_config(expanded_path)
+        st = os.stat(expanded_path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _config_lock:
+        cached = _config_cache.get(expanded_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        snapshot = _freeze(load_config(expanded_path))
+        _config_cache[expanded_path] = (stamp, snapshot)
+        return snapshot
+
+def _invalidate(config_path):
+    with _config_lock:
+        _config_cache.pop(os.path.expanduser(config_path), None)
+
 def ensure_config_prompts(config_path):
     """Ensure that all necessary prompt keys exist in the config.
     If a key is missing, append it with a default value.
@@ -61,6 +151,7 @@ def ensure_config_prompts(config_path):
         "language_classification_prompt": "in one word only, what programming language is used in this project tree structure",
         "readme_summary_prompt": "in one short sentence only, generate a concise summary of this text below, and nothing else",
         "specific_file_classification": "taking the path and content of this file and classify it into either only user code file or project code file or source control file",
+        "batch_file_classification": "classify each file below into exactly one of: user code file, project code file, source control file. Reply with only a JSON object mapping every file path to its class.",
         "explain_code_prompt": "explain the following code in a clear and concise manner"
     }
     
@@ -73,5 +164,6 @@ def ensure_config_prompts(config_path):
     if updated:
         with open(os.path.expanduser(config_path), "w") as f:
             json.dump(config, f, indent=4)
+        _invalidate(config_path)
     
     return config
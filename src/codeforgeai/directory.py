@@ -1,13 +1,18 @@
 import os
 import json
+import hashlib
 import subprocess
 import logging
-import time
-import fnmatch
-from pathlib import Path
-from codeforgeai.models.code_model import CodeModel
-from codeforgeai.models.general_model import GeneralModel
-from codeforgeai.config import load_config
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from codeforgeai.gitignore import GitignoreMatcher, matcher_for_patterns
+from codeforgeai.index import ProjectIndex, INDEX_PATH, JSON_PATH
+from codeforgeai.language import detect_language
+from codeforgeai.chunking import iter_chunks, map_reduce, chunk_settings
+from codeforgeai.prefilter import inspect_file
+from codeforgeai.rules import RuleClassifier
+from codeforgeai.models.errors import ModelError
+from codeforgeai.config import get_config
 
 def parse_gitignore():
     """Robust .gitignore parsing that handles all pattern types."""
@@ -31,27 +36,8 @@ def should_ignore(path, patterns):
     Check if a path matches any gitignore pattern.
     Handles both files and directories properly.
     """
-    path = os.path.normpath(path)
-    is_dir = os.path.isdir(path)
-
-    for pattern in patterns:
-        # Directory-specific matching
-        if pattern.endswith('/'):
-            if is_dir and (fnmatch.fnmatch(path, pattern[:-1]) or 
-                          any(fnmatch.fnmatch(part, pattern[:-1]) 
-                              for part in path.split(os.sep))):
-                return True
-        # File pattern matching
-        else:
-            if fnmatch.fnmatch(path, pattern) or \
-               any(fnmatch.fnmatch(part, pattern) 
-                   for part in path.split(os.sep)):
-                return True
-            # Handle *.ext patterns
-            if pattern.startswith('*'):
-                if path.endswith(pattern[1:]):
-                    return True
-    return False
+    matcher = matcher_for_patterns(tuple(patterns), os.getcwd())
+    return matcher.is_ignored(path)
 
 def get_relative_path(path):
     """Convert any path to be relative to current working directory."""
@@ -60,56 +46,152 @@ def get_relative_path(path):
     except ValueError:
         return path
 
+def walk_directory(root=".", matcher=None, include_hidden=False, start=""):
+    """
+    Stream the entries below root depth-first as ``(rel_path, node_type)`` pairs.
+    start restricts the walk to a sub-directory; paths stay relative to root.
+
+    Ignored directories are pruned before they are opened, so large ignored
+    trees such as node_modules or build outputs are never walked. Nested
+    .gitignore files are compiled once as their directories are reached. Hidden
+    entries are skipped unless include_hidden is set, matching ``tree``.
+    """
+    if matcher is None:
+        matcher = GitignoreMatcher(root)
+
+    def scan(path, rel):
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name.lower())
+        except OSError as e:
+            logging.error(f"Error scanning {path}: {e}")
+            return
+        for entry in entries:
+            if not include_hidden and entry.name.startswith("."):
+                continue
+            rel_path = os.path.join(rel, entry.name) if rel else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if matcher.is_ignored(rel_path, is_dir):
+                    continue
+                if is_dir:
+                    yield rel_path, "directory"
+                    yield from scan(entry.path, rel_path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield rel_path, "file"
+                else:
+                    yield rel_path, "link"
+            except OSError as e:
+                logging.error(f"Error reading {entry.path}: {e}")
+
+    yield from scan(os.path.join(root, start) if start else root, start)
+
+def build_tree(entries):
+    """
+    Assemble streamed ``(rel_path, node_type)`` pairs into the nested
+    ``tree -J`` shape used by collect_files and find_src_path.
+    """
+    root = {"type": "directory", "name": ".", "contents": []}
+    directories = {"": root}
+    counts = {"directory": 0, "file": 0}
+    for rel_path, node_type in entries:
+        node = {"type": node_type, "name": rel_path}
+        if node_type == "directory":
+            node["contents"] = []
+            directories[rel_path] = node
+        counts[node_type] = counts.get(node_type, 0) + 1
+        parent = directories.get(os.path.dirname(rel_path), root)
+        parent["contents"].append(node)
+    report = {"type": "report", "directories": counts["directory"], "files": counts["file"]}
+    return [root, report]
+
 def strip_directory(return_data=False):
     """Get tree structure with clean relative paths, no gitignored files."""
     try:
-        tree_output = subprocess.check_output(
-            ["tree", "-J"], text=True, cwd=os.getcwd()
-        )
-        tree_data = json.loads(tree_output)
+        tree_data = build_tree(walk_directory(os.getcwd()))
     except Exception as e:
-        logging.error("Error running tree command: %s", e)
+        logging.error("Error walking directory: %s", e)
         return [] if return_data else None
 
-    def clean_path(path):
-        """Convert path to pure relative form (a/b/c)."""
-        return os.path.normpath(path).lstrip("./")
-
-    def filter_tree(node, parent=""):
-        if isinstance(node, list):
-            return [f for f in (filter_tree(item, parent) for item in node) if f]
-        
-        if isinstance(node, dict):
-            name = node.get("name", "")
-            path = os.path.join(parent, name) if parent else name
-            clean = clean_path(path)
-            
-            if should_ignore(clean, parse_gitignore()):
-                return None
-            
-            node["name"] = clean
-            if node.get("type") == "directory":
-                contents = node.get("contents", [])
-                node["contents"] = filter_tree(contents, clean)
-            return node
-        return node
-
-    filtered_tree = filter_tree(tree_data)
     if return_data:
-        return filtered_tree
-    print(json.dumps(filtered_tree, indent=4))
+        return tree_data
+    print(json.dumps(tree_data, indent=4))
+
+def fingerprint(*parts):
+    """Return a short stable hash of the given JSON-serializable parts."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def _git_config_paths():
+    """Return the repository, global and XDG git config paths for the working directory."""
+    paths = []
+    current = os.getcwd()
+    while True:
+        candidate = os.path.join(current, ".git", "config")
+        if os.path.exists(candidate):
+            paths.append(candidate)
+            break
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    home = os.path.expanduser("~")
+    paths.append(os.path.join(home, ".gitconfig"))
+    xdg = os.environ.get("XDG_CONFIG_HOME") or os.path.join(home, ".config")
+    paths.append(os.path.join(xdg, "git", "config"))
+    return paths
+
+def collect_metadata(stripped_data, config, previous=None, fingerprints=None):
+    """
+    Collect all project metadata using stripped tree data.
 
-def collect_metadata(stripped_data, config):
-    """Collect all project metadata using stripped tree data."""
+    previous holds the metadata of the last run and fingerprints the hashes
+    of the inputs it was computed from. Each part whose inputs (language
+    summary, README content, git config mtimes, model and prompt) are
+    unchanged is reused instead of recomputed; fingerprints is updated in
+    place. The language comes from detect_language, and the model is only
+    asked, with the detector's compact summary, when confidence is low.
+    """
+    from codeforgeai.models.code_model import CodeModel
+    from codeforgeai.models.general_model import GeneralModel
+    previous = previous or {}
+    if fingerprints is None:
+        fingerprints = {}
     metadata = {}
+
+    def reuse(name, keys, current):
+        if fingerprints.get(name) == current and all(k in previous for k in keys):
+            for k in keys:
+                metadata[k] = previous[k]
+            logging.debug(f"Directory Analyzer: Reusing cached {name} metadata")
+            return True
+        fingerprints[name] = current
+        return False
     
-    # Language detection
-    code_model = CodeModel(config.get("code_model", "ollama_code"))
-    language_prompt = config.get("language_classification_prompt")
-    language_result = code_model.send_request(
-        f"{language_prompt}\n{json.dumps(stripped_data)}"
-    ).strip()
-    metadata["language"] = language_result.replace("```", "")
+    # Language detection: local statistics first, the model only when unsure
+    language, confidence, summary = detect_language(collect_files(stripped_data))
+    threshold = config.get("language_confidence_threshold", 0.6)
+    if language and confidence >= threshold:
+        metadata["language"] = language
+    else:
+        language_prompt = config.get("language_classification_prompt")
+        if not reuse("language", ["language"], fingerprint(summary, config.get("code_model"), language_prompt)):
+            code_model = CodeModel(config.get("code_model", "ollama_code"))
+            try:
+                language_result = code_model.send_request(
+                    f"{language_prompt}\nProject summary: {summary}"
+                ).strip()
+                metadata["language"] = language_result.replace("```", "")
+            except ModelError as e:
+                # Keep the detector's best guess and ask again next run
+                logging.error(f"Error detecting language: {e}")
+                metadata["language"] = language or "Unknown"
+                fingerprints.pop("language", None)
     
     # Source directory detection - use clean paths
     src_path = find_src_path(stripped_data)
@@ -121,16 +203,27 @@ def collect_metadata(stripped_data, config):
         try:
             with open(readme_path, encoding="utf-8", errors="ignore") as rf:
                 readme_content = rf.read()
-            general_model = GeneralModel(config.get("general_model"))
-            summary_result = general_model.send_request(
-                f"{config.get('readme_summary_prompt')}\n{readme_content}", 
-                config
+            readme_fingerprint = fingerprint(
+                readme_path, hashlib.sha256(readme_content.encode("utf-8")).hexdigest(),
+                config.get("general_model"), config.get("readme_summary_prompt")
             )
-            metadata["short_description"] = summary_result.strip().replace("```", "")
+            if not reuse("short_description", ["short_description"], readme_fingerprint):
+                general_model = GeneralModel(config.get("general_model"))
+                summary_result = general_model.send_request(
+                    f"{config.get('readme_summary_prompt')}\n{readme_content}", 
+                    config
+                )
+                metadata["short_description"] = summary_result.strip().replace("```", "")
         except Exception as e:
             logging.error(f"Error processing README: {e}")
+            fingerprints.pop("short_description", None)
     
     # Git info
+    git_keys = ["repository", "author", "author_email"]
+    git_fingerprint = fingerprint([(p, _mtime(p)) for p in _git_config_paths()])
+    if reuse("git", git_keys, git_fingerprint):
+        return metadata
+
     try:
         remote = subprocess.check_output(["git", "remote", "-v"], text=True).strip()
         metadata["repository"] = remote.split("\n")[0] if remote else "Unknown"
@@ -153,83 +246,372 @@ def collect_metadata(stripped_data, config):
     
     return metadata
 
-def analyze_directory():
-    """Analyze directory using stripped tree data."""
-    json_path = ".codeforge.json"
-    config_path = os.path.join(os.path.expanduser("~"), ".codeforgeai.json")
-    config = load_config(config_path)
-    
-    # Get stripped tree data
-    stripped_data = strip_directory(return_data=True)
-    
-    # Load or initialize classification
+DEFAULT_BATCH_PROMPT = (
+    "classify each file below into exactly one of: user code file, project code file, "
+    "source control file. Reply with only a JSON object mapping every file path to its class."
+)
+DEFAULT_CLASSIFICATION_REDUCE_PROMPT = (
+    "these are classifications of consecutive parts of one file; reply with only the single "
+    "class of the whole file: user code file, project code file or source control file"
+)
+
+def hash_file(path, chunk_size=1 << 16):
+    """Return the sha256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def find_changed_files(files, classified, file_index):
+    """
+    Return ``(changed, refreshed)`` for the given files.
+
+    changed lists files whose content differs from when they were last
+    classified. A cheap stat pass compares size and mtime against file_index;
+    only files whose stat differs are hashed. Files that were merely touched,
+    and classified files without an index entry (from older .codeforge.json
+    files), end up in refreshed as ``{path: state}`` instead of being sent
+    back to the model.
+    """
+    changed = []
+    refreshed = {}
+    for filepath in files:
+        try:
+            st = os.stat(filepath)
+        except OSError as e:
+            logging.error(f"Error reading {filepath}: {e}")
+            continue
+        entry = file_index.get(filepath)
+        if filepath not in classified:
+            changed.append(filepath)
+            continue
+        if entry and entry.get("size") == st.st_size and entry.get("mtime") == st.st_mtime_ns:
+            continue
+        try:
+            digest = hash_file(filepath)
+        except OSError as e:
+            logging.error(f"Error hashing {filepath}: {e}")
+            continue
+        if entry is None or entry.get("hash") in (None, digest):
+            refreshed[filepath] = {"hash": digest, "size": st.st_size, "mtime": st.st_mtime_ns}
+        else:
+            changed.append(filepath)
+    return changed, refreshed
+
+FILE_CLASSES = ("user code file", "project code file", "source control file")
+
+def _file_state(filepath, data=None):
+    st = os.stat(filepath)
+    digest = hashlib.sha256(data).hexdigest() if data is not None else hash_file(filepath)
+    return {"hash": digest, "size": st.st_size, "mtime": st.st_mtime_ns}
+
+def _classify_chunked(filepath, code_model, specific_prompt, config):
+    """
+    Classify a file too large for one prompt by classifying each chunk and
+    reducing the answers. Unanimous chunks need no reduce call.
+    """
+    max_chars, memory_limit, concurrency = chunk_settings(config)
+    reduce_prompt = config.get("classification_reduce_prompt", DEFAULT_CLASSIFICATION_REDUCE_PROMPT)
+
+    def unanimous(answers):
+        labels = {normalize_file_class(answer) for answer in answers}
+        return labels.pop() if len(labels) == 1 and None not in labels else None
+
+    result = map_reduce(
+        lambda prompt: code_model.send_request(prompt).strip(),
+        iter_chunks(filepath, max_chars, memory_limit),
+        f"{specific_prompt}\nFile path: {filepath} (partial content)",
+        f"{reduce_prompt}\nFile path: {filepath}",
+        max_chars, concurrency, combine=unanimous,
+    )
+    return result.strip(), _file_state(filepath), "model"
+
+def _classify_with_model(filepath, code_model, specific_prompt, config=None):
+    max_chars = chunk_settings(config)[0]
+    if config is not None and os.path.getsize(filepath) > max_chars:
+        logging.debug(f"Directory Analyzer: Classifying {filepath} in chunks")
+        return _classify_chunked(filepath, code_model, specific_prompt, config)
+    with open(filepath, "rb") as f:
+        data = f.read()
+    content = data.decode("utf-8", errors="ignore")
+    prompt = f"{specific_prompt}\nFile path: {filepath}\nContent:\n{content}"
+    result = code_model.send_request(prompt).strip()
+    return result, _file_state(filepath, data), "model"
+
+def normalize_file_class(value):
+    """Map a model answer onto one of FILE_CLASSES, or None when it is ambiguous."""
+    if not isinstance(value, str):
+        return None
+    value = value.lower().replace("_", " ")
+    matches = [c for c in FILE_CLASSES if c in value or c.split()[0] == value.strip()]
+    return matches[0] if len(matches) == 1 else None
+
+def classify_batch(filepaths, code_model, batch_prompt, specific_prompt):
+    """
+    Classify several small files with a single model call.
+
+    The model is asked for a JSON object mapping each path to its class.
+    Files missing from the answer, or whose class is ambiguous, fall back to
+    one request each. Returns a list of ``(path, classification, index entry,
+    source)`` in the order of filepaths, and the number of model calls made.
+    """
+    contents = {}
+    for filepath in filepaths:
+        with open(filepath, "rb") as f:
+            contents[filepath] = f.read()
+    sections = [
+        f"File path: {filepath}\nContent:\n{data.decode('utf-8', errors='ignore')}"
+        for filepath, data in contents.items()
+    ]
+    prompt = f"{batch_prompt}\n\n" + "\n-----\n".join(sections)
     try:
-        with open(json_path) as f:
-            classification = json.load(f)
-    except:
-        classification = {}
-    
-    # Collect metadata using stripped data
-    metadata = collect_metadata(stripped_data, config)
-    classification.update(metadata)
-    
-    # Classify files
-    if "file_classification" not in classification:
-        classification["file_classification"] = {}
-    
-    all_files = collect_files(stripped_data)
+        answer = json.loads(code_model.send_request(prompt, format="json"))
+    except (TypeError, ValueError):
+        answer = None
+    except ModelError as e:
+        # A down backend fails the whole batch; a rejected request falls back per file
+        if e.transient:
+            raise
+        answer = None
+    if not isinstance(answer, dict):
+        logging.debug(f"Directory Analyzer: Batch of {len(filepaths)} returned no usable JSON, falling back")
+        answer = {}
+
+    results, calls = [], 1
+    for filepath in filepaths:
+        label = normalize_file_class(answer.get(filepath))
+        if label:
+            results.append((filepath, label, _file_state(filepath, contents[filepath]), "batch"))
+            continue
+        try:
+            result, state, source = _classify_with_model(filepath, code_model, specific_prompt)
+            calls += 1
+        except Exception as e:
+            logging.error(f"Error classifying {filepath}: {e}")
+            continue
+        results.append((filepath, result, state, source))
+    return results, calls
+
+def plan_batches(filepaths, token_budget, max_files, sizes=None):
+    """
+    Group files into batches whose estimated prompt size stays within
+    token_budget. sizes maps paths to byte sizes already known to the caller;
+    other files are stat'ed, and files that no longer exist are left out.
+    """
+    sizes = sizes or {}
+    batches, current, used = [], [], 0
+    for filepath in filepaths:
+        size = sizes.get(filepath)
+        if size is None:
+            try:
+                size = os.path.getsize(filepath)
+            except OSError:
+                logging.debug(f"Directory Analyzer: Skipping {filepath}, it can no longer be read")
+                continue
+        # Roughly four bytes per token, plus the path and separators
+        tokens = size // 4 + len(filepath) // 4 + 8
+        if current and (used + tokens > token_budget or len(current) >= max_files):
+            batches.append(current)
+            current, used = [], 0
+        current.append(filepath)
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+def classify_into_index(index, files, config):
+    """
+    Classify files concurrently and store the results in the project index.
+
+    Files resolved by the rule table or the prefilter never reach the model.
+    Small files (at most classification_batch_file_bytes) are grouped into
+    multi-file prompts of up to classification_batch_tokens; the rest get a
+    request each.
+    """
+    from codeforgeai.models.code_model import CodeModel
     code_model = CodeModel(config.get("code_model"))
     specific_prompt = config.get("specific_file_classification")
+    batch_prompt = config.get("batch_file_classification", DEFAULT_BATCH_PROMPT)
+    concurrency = max(1, int(config.get("analyze_concurrency", 4)))
+    batch_file_bytes = int(config.get("classification_batch_file_bytes", 2048))
+    token_budget = int(config.get("classification_batch_tokens", 2048))
+    max_files = max(1, int(config.get("classification_batch_max_files", 16)))
+    rules = RuleClassifier.from_config(config)
+    sources = {"rule": 0, "prefilter": 0, "batch": 0, "model": 0}
+    model_calls = 0
+    failed = 0
+
+    def resolved(filepath, label, source):
+        return [(filepath, label, _file_state(filepath), source)], 0
+
+    def single(filepath):
+        result, state, source = _classify_with_model(filepath, code_model, specific_prompt, config)
+        return [(filepath, result, state, source)], 1
+
+    def forget(paths):
+        # Files deleted since they were listed are dropped rather than retried
+        gone = [p for p in paths if not os.path.exists(p)]
+        if gone:
+            logging.debug(f"Directory Analyzer: {len(gone)} file(s) disappeared, removing them from the index")
+            index.remove_files(gone)
+        return len(gone)
+
+    # Cheap checks first, so only files that need the model are batched
+    tasks, small, sizes, vanished = [], [], {}, []
+    for filepath in files:
+        label, source = rules.classify(filepath), "rule"
+        if label is None:
+            label, source = inspect_file(filepath, config), "prefilter"
+        if label:
+            tasks.append(([filepath], resolved, (filepath, label, source)))
+            continue
+        try:
+            size = os.path.getsize(filepath)
+        except OSError:
+            vanished.append(filepath)
+            continue
+        if batch_file_bytes > 0 and size <= batch_file_bytes:
+            small.append(filepath)
+            sizes[filepath] = size
+        else:
+            tasks.append(([filepath], single, (filepath,)))
+    forget(vanished)
+    for batch in plan_batches(small, token_budget, max_files, sizes):
+        if len(batch) == 1:
+            tasks.append((batch, single, (batch[0],)))
+        else:
+            tasks.append((batch, classify_batch, (batch, code_model, batch_prompt, specific_prompt)))
     
-    for filepath in all_files:
-        if filepath not in classification["file_classification"]:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # Workers run in a copy of this context so model calls keep the caller's priority
+        futures = [(paths, executor.submit(contextvars.copy_context().run, fn, *args)) for paths, fn, args in tasks]
+        # Merge in submission order so the output does not depend on timing
+        for paths, future in futures:
             try:
-                with open(filepath, encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-                prompt = f"{specific_prompt}\nFile path: {filepath}\nContent:\n{content}"
-                result = code_model.send_request(prompt).strip()
-                classification["file_classification"][filepath] = result
-                # Save incrementally
-                with open(json_path, "w") as f:
-                    json.dump(classification, f, indent=4)
+                entries, calls = future.result()
+            except ModelError as e:
+                # Nothing is stored, so these files are retried on the next run
+                failed += len(paths)
+                logging.warning(f"Error classifying {', '.join(paths)}: {e}")
+                continue
+            except OSError as e:
+                gone = forget(paths)
+                if gone < len(paths):
+                    failed += len(paths) - gone
+                    logging.error(f"Error classifying {', '.join(paths)}: {e}")
+                continue
             except Exception as e:
-                logging.error(f"Error classifying {filepath}: {e}")
+                failed += len(paths)
+                logging.error(f"Error classifying {', '.join(paths)}: {e}")
+                continue
+            model_calls += calls
+            for filepath, result, state, source in entries:
+                sources[source] += 1
+                index.upsert_file(filepath, result, state)
+    index.commit()
+
+    saved = sources["rule"] + sources["prefilter"]
+    logging.debug(
+        f"Directory Analyzer: {model_calls} model calls for {len(files)} files; "
+        f"{sources['rule']} resolved by rules, {sources['prefilter']} by the prefilter, "
+        f"{sources['batch']} in batches"
+    )
+    if saved:
+        print(f"Resolved {saved} of {len(files)} file(s) without a model call")
+    if failed:
+        logging.error(f"Could not classify {failed} file(s); they will be retried on the next run")
+    return sources
+
+def analyze_directory():
+    """Analyze directory using stripped tree data, reclassifying only changed files."""
+    config = get_config()
+    
+    # Get stripped tree data
+    stripped_data = strip_directory(return_data=True)
     
-    # Final save
-    with open(json_path, "w") as f:
-        json.dump(classification, f, indent=4)
+    with ProjectIndex(INDEX_PATH, config.get("index_batch_size", 50)) as index:
+        # Collect metadata using stripped data, reusing parts whose inputs are unchanged
+        fingerprints = index.get_fingerprints()
+        metadata = collect_metadata(stripped_data, config, index.get_metadata(), fingerprints)
+        index.set_metadata(metadata)
+        index.set_fingerprints(fingerprints)
+        
+        # Classify files
+        all_files = collect_files(stripped_data)
+        file_index = index.file_states()
+        classified = index.classified_paths()
+        current = set(all_files)
+        index.remove_files(p for p in file_index if p not in current)
+
+        changed_files, refreshed = find_changed_files(all_files, classified, file_index)
+        for filepath, state in refreshed.items():
+            index.update_state(filepath, state)
+        logging.debug(f"Directory Analyzer: {len(changed_files)} of {len(all_files)} files need classification")
+        classify_into_index(index, changed_files, config)
+        
+        if config.get("index_export_json", True):
+            index.export_json(JSON_PATH)
     
-    logging.debug("Directory Analyzer: Updated classification saved to .codeforge.json")
-    print("Updated classification saved to .codeforge.json")
+    logging.debug(f"Directory Analyzer: Updated classification saved to {INDEX_PATH}")
+    print(f"Updated classification saved to {INDEX_PATH}")
+
+def analyze_paths(changed, removed, config):
+    """
+    Incrementally update the index for paths reported by a watcher.
+    Removed paths (files or whole directories) are dropped, and changed files
+    are classified only if their content really differs from the index.
+    """
+    matcher = GitignoreMatcher(os.getcwd())
+    with ProjectIndex(INDEX_PATH, config.get("index_batch_size", 50)) as index:
+        for path in removed:
+            index.remove_tree(path)
+        files = sorted(
+            p for p in changed
+            if os.path.isfile(p) and not matcher.is_ignored(p, False)
+        )
+        file_index, classified = {}, set()
+        for filepath in files:
+            entry = index.get_file(filepath)
+            if entry:
+                file_index[filepath] = entry
+                if entry["classification"] is not None:
+                    classified.add(filepath)
+        changed_files, refreshed = find_changed_files(files, classified, file_index)
+        for filepath, state in refreshed.items():
+            index.update_state(filepath, state)
+        if changed_files:
+            print(f"Reclassifying {len(changed_files)} changed file(s)")
+        classify_into_index(index, changed_files, config)
+        if config.get("index_export_json", True) and (changed_files or removed):
+            index.export_json(JSON_PATH)
 
 def loop_analyze_directory():
-    """Run analyze_directory periodically, checking for changes."""
-    config = load_config(os.path.join(os.path.expanduser("~"), ".codeforgeai.json"))
-    interval = config.get("analyze_interval", 5)  # Default 5 seconds
+    """
+    Analyze once, then watch the tree and incrementally reclassify only the
+    files that were added, changed or removed.
+    """
+    from codeforgeai.watcher import create_watcher
+
+    config = get_config()
+    analyze_directory()
+    watcher = create_watcher(os.getcwd(), config)
+    logging.debug(f"Directory Analyzer: Watching with {type(watcher).__name__}")
     
-    while True:
-        try:
-            # Get current files
-            current_files = set(collect_files(strip_directory(return_data=True)))
-            
-            # Get classified files
+    try:
+        for batch in watcher.batches():
             try:
-                with open(".codeforge.json") as f:
-                    classification = json.load(f)
-                classified_files = set(classification.get("file_classification", {}).keys())
-            except:
-                classified_files = set()
-            
-            # If there are differences, run analysis
-            if current_files != classified_files:
-                analyze_directory()
-            
-            time.sleep(interval)
-        except KeyboardInterrupt:
-            break
-        except Exception as e:
-            logging.error(f"Error in analysis loop: {e}")
-            time.sleep(interval)
+                if batch is None:
+                    analyze_directory()
+                else:
+                    changed, removed = batch
+                    analyze_paths(changed, removed, config)
+            except Exception as e:
+                logging.error(f"Error in analysis loop: {e}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
 
 def collect_files(node, files=None):
     """Helper to get all file paths from tree structure."""
@@ -284,16 +666,23 @@ def locate_readme():
     return None
 
 
-def remove_ignored(tree_json, ignored_patterns, parent="."):
+def remove_ignored(tree_json, ignored_patterns=None, parent="."):
     """
-    Remove items from tree data matching .gitignore patterns.
-    - If pattern is a directory name or ends with '/', ignore that directory recursively.
-    - If pattern is a file name or wildcard, ignore matching file(s).
+    Remove items from tree data matching .gitignore rules.
+    ignored_patterns may be a GitignoreMatcher, a list of raw pattern lines,
+    or None to use the .gitignore files of the working directory.
     """
+    if isinstance(ignored_patterns, GitignoreMatcher):
+        matcher = ignored_patterns
+    elif ignored_patterns is None:
+        matcher = GitignoreMatcher(os.getcwd())
+    else:
+        matcher = matcher_for_patterns(tuple(ignored_patterns), os.getcwd())
+
     if isinstance(tree_json, list):
         filtered = []
         for item in tree_json:
-            r = remove_ignored(item, ignored_patterns, parent)
+            r = remove_ignored(item, matcher, parent)
             if r is not None:
                 filtered.append(r)
         return filtered
@@ -301,11 +690,11 @@ def remove_ignored(tree_json, ignored_patterns, parent="."):
         name = tree_json.get("name", "")
         typ = tree_json.get("type", "")
         full_path = os.path.join(parent, name)
-        if is_ignored(full_path, typ, ignored_patterns):
+        if matcher.is_ignored(full_path, typ == "directory"):
             return None
         if typ == "directory":
             contents = tree_json.get("contents", [])
-            tree_json["contents"] = remove_ignored(contents, ignored_patterns, full_path)
+            tree_json["contents"] = remove_ignored(contents, matcher, full_path)
         return tree_json
     return tree_json
 
@@ -314,32 +703,15 @@ def is_ignored(full_path, node_type, patterns):
     """
     Check if full_path (relative to cwd) matches any pattern in .gitignore.
     """
-    base_name = os.path.basename(full_path)
-    for pat in patterns:
-        # Directory pattern
-        if pat.endswith("/"):
-            if node_type == "directory" and base_name == pat.rstrip("/"):
-                return True
-            # If pattern is a subfolder wildcard, e.g. "build/" in "build/something"
-            if pat.rstrip("/") in full_path and node_type == "directory":
-                return True
-        else:
-            # Exact file match
-            if base_name == pat:
-                return True
-            # Simple wildcard: "*something"
-            if pat.startswith("*") and full_path.endswith(pat.lstrip("*")):
-                return True
-            # Pattern anywhere in path
-            if pat in full_path:
-                return True
-    return False
-
-
-def classify_files(tree_data, code_model, prompt):
-    """Classify files with proper path handling."""
+    matcher = matcher_for_patterns(tuple(patterns), os.getcwd())
+    return matcher.is_ignored(full_path, node_type == "directory")
+
+
+def classify_files(tree_data, code_model, prompt, config=None):
+    """Classify files with proper path handling, resolving rule and filter matches without the model."""
     file_class_map = {}
-    ignored_patterns = parse_gitignore()
+    matcher = GitignoreMatcher(os.getcwd())
+    rules = RuleClassifier.from_config(config)
 
     def walk(node, parent="."):
         if isinstance(node, dict):
@@ -347,10 +719,14 @@ def classify_files(tree_data, code_model, prompt):
             path = os.path.join(parent, name)
             rel_path = get_relative_path(path)
             
-            if should_ignore(rel_path, ignored_patterns):
+            if matcher.is_ignored(rel_path, node.get("type") == "directory"):
                 return
 
             if node.get("type") == "file":
+                label = rules.classify(rel_path) or inspect_file(rel_path, config)
+                if label:
+                    file_class_map[rel_path] = label
+                    return
                 try:
                     with open(rel_path, encoding="utf-8", errors="ignore") as f:
                         content = f.read()
@@ -1,14 +1,19 @@
 import os
 import json
+import asyncio
 import logging
 import re
 import random
 import subprocess
-from codeforgeai.config import load_config
+from codeforgeai.config import get_config
 from codeforgeai.directory import analyze_directory, loop_analyze_directory
 from codeforgeai.models.general_model import GeneralModel
 from codeforgeai.models.code_model import CodeModel
+from codeforgeai.models.errors import ModelError
 from codeforgeai.file_manager import apply_changes
+from codeforgeai.chunking import iter_chunks, map_reduce, map_reduce_async, chunk_settings
+
+DEFAULT_EXPLAIN_REDUCE_PROMPT = "combine these explanations of consecutive parts of one file into a single clear and concise explanation of the whole file"
 
 
 # define engine class.
@@ -16,25 +21,35 @@ class Engine:
     def __init__(self):
         # Use the config file from the user's home directory
         self.config_path = os.path.expanduser("~/.codeforgeai.json")
-        # Always load fresh config directly from the file
+        # Snapshots are re-read only when the config file changes
         self._refresh_config()
         
     def _refresh_config(self):
-        """Reload config from file to ensure we have the latest values"""
+        """Fetch the current config snapshot, rebuilding the models only when it changed"""
         try:
-            from codeforgeai.config import load_config  # Ensure load_config is defined locally
-            self.config = load_config(self.config_path)
-            # Reinitialize models with fresh config values
-            self.general_model = GeneralModel(self.config.get("general_model", "ollama_general"))  # Provide default
-            self.code_model = CodeModel(self.config.get("code_model", "ollama_code"))  # Provide default
-            return self.config
+            config = get_config(self.config_path)
         except Exception as e:
             print(f"Error refreshing config: {e}")
-            # Initialize with default models in case of error
-            self.config = {}
-            self.general_model = GeneralModel()
-            self.code_model = CodeModel()
-            return {}
+            config = {}
+        if config is getattr(self, "config", None):
+            return self.config
+        self.config = config
+        self.general_model = GeneralModel(config.get("general_model", "ollama_general"))  # Provide default
+        self.code_model = CodeModel(config.get("code_model", "ollama_code"))  # Provide default
+        return self.config
+
+    def _send(self, model, prompt, config=None, on_token=None):
+        """
+        Send a prompt and return the full response. When on_token is given
+        the response is streamed and on_token is called with each piece.
+        """
+        if on_token is None:
+            return model.send_request(prompt, config)
+        pieces = []
+        for piece in model.stream_request(prompt, config):
+            pieces.append(piece)
+            on_token(piece)
+        return "".join(pieces)
 
     def run_analysis(self):
         self._refresh_config()  # Refresh config before operation
@@ -45,36 +60,80 @@ class Engine:
         print("Starting adaptive feedback loop for directory analysis (Ctrl+C to stop).")
         loop_analyze_directory()
 
-    def process_prompt(self, user_prompt):
-        self._refresh_config()  # Refresh config before operation
-        raw_prompt = " ".join(user_prompt)
+    def _finetune_prompt(self, user_prompt):
         finetune_catalyst = self.config.get(
             "prompt_finetune_prompt",
             "in a clear and concise manner, rephrase the following prompt to be more understandable to a coding ai agent, return the rephrased prompt and nothing else:"
         )
-        full_finetune_prompt = f"{finetune_catalyst}\n{raw_prompt}"
-        finetuned_response = self.general_model.send_request(full_finetune_prompt, self.config)
-        
+        return f"{finetune_catalyst}\n{' '.join(user_prompt)}"
+
+    def _code_prompt(self, user_prompt, finetuned_response):
         if not finetuned_response:
-            finetuned_response = raw_prompt
-            
+            finetuned_response = " ".join(user_prompt)
         code_prompt = self.config.get("code_prompt", "")
-        full_code_prompt = f"{code_prompt}\n{finetuned_response}"
-        final_response = self.general_model.send_request(full_code_prompt)
+        return f"{code_prompt}\n{finetuned_response}"
+
+    def process_prompt(self, user_prompt, on_token=None):
+        self._refresh_config()  # Refresh config before operation
+        finetuned_response = self.general_model.send_request(self._finetune_prompt(user_prompt), self.config)
+        full_code_prompt = self._code_prompt(user_prompt, finetuned_response)
+        final_response = self._send(self.general_model, full_code_prompt, on_token=on_token)
         
         return final_response
 
-    def explain_code(self, file_path):
-        self._refresh_config()  # Refresh config before operation
+    async def process_prompt_async(self, user_prompt):
+        self._refresh_config()
+        finetuned_response = await self.general_model.send_request_async(self._finetune_prompt(user_prompt), self.config)
+        full_code_prompt = self._code_prompt(user_prompt, finetuned_response)
+        return await self.general_model.send_request_async(full_code_prompt)
+
+    def _explain_settings(self, file_path):
+        """Return the explain prompt and, for files too large for one prompt, the map-reduce arguments."""
         explain_prompt = self.config.get("explain_code_prompt", "explain the following code in a clear and concise manner")
-        
+        max_chars, memory_limit, concurrency = chunk_settings(self.config)
+        if os.path.getsize(file_path) <= max_chars:
+            return explain_prompt, None
+        reduce_prompt = self.config.get("explain_reduce_prompt", DEFAULT_EXPLAIN_REDUCE_PROMPT)
+        return explain_prompt, (
+            iter_chunks(file_path, max_chars, memory_limit),
+            f"{explain_prompt}\n\nFile: {file_path} (partial content)",
+            f"{reduce_prompt}\n\nFile: {file_path}",
+            max_chars, concurrency,
+        )
+
+    def explain_code(self, file_path, on_token=None):
+        self._refresh_config()  # Refresh config before operation
+        explain_prompt, chunked = self._explain_settings(file_path)
+
+        if chunked:
+            # Large files are explained chunk by chunk and the parts merged
+            streamed = []
+
+            def final_send(prompt):
+                streamed.append(prompt)
+                return self._send(self.code_model, prompt, on_token=on_token)
+
+            response = map_reduce(self.code_model.send_request, *chunked, final_send=final_send)
+            if on_token is not None and not streamed:
+                on_token(response)
+            return response
+
         with open(file_path, "r") as file:
             file_content = file.read()
         
         prompt = f"{explain_prompt}\n\nFile: {file_path}\n\n{file_content}"
-        response = self.code_model.send_request(prompt)
+        response = self._send(self.code_model, prompt, on_token=on_token)
         return response
 
+    async def explain_code_async(self, file_path):
+        self._refresh_config()
+        explain_prompt, chunked = self._explain_settings(file_path)
+        if chunked:
+            return await map_reduce_async(self.code_model.send_request_async, *chunked)
+        with open(file_path, "r") as file:
+            file_content = file.read()
+        return await self.code_model.send_request_async(f"{explain_prompt}\n\nFile: {file_path}\n\n{file_content}")
+
     def generate_commit_message(self, commit_msg):
         """
         Generate a commit message by prepending an emoji based on message content.
@@ -123,44 +182,70 @@ class Engine:
 
         return f"{emoji} {commit_msg}"
 
-    def process_commit_message(self):
-        """Quickly generate a one-sentence commit message with an emoji using only the general model."""
-        self._refresh_config()  # Refresh config before operation
-        try:
+    def _collect_diff(self):
+        """Summarise staged changes, falling back to unstaged changes and then untracked files."""
+        diff = subprocess.check_output(
+            ["git", "diff", "--name-status", "--cached"],
+            text=True,
+            stderr=subprocess.PIPE
+        ).strip()
+        if not diff:
             diff = subprocess.check_output(
-                ["git", "diff", "--name-status", "--cached"],
+                ["git", "diff", "--name-status", "HEAD"],
                 text=True,
                 stderr=subprocess.PIPE
             ).strip()
-            if not diff:
-                diff = subprocess.check_output(
-                    ["git", "diff", "--name-status", "HEAD"],
-                    text=True,
-                    stderr=subprocess.PIPE
-                ).strip()
-            if not diff:
-                # Check untracked files if no diff found
-                untracked = subprocess.check_output(
-                    ["git", "ls-files", "--others", "--exclude-standard"],
-                    text=True,
-                    stderr=subprocess.PIPE
-                ).strip()
-                if untracked:
-                    diff = "Untracked files:\n" + untracked
+        if not diff:
+            # Check untracked files if no diff found
+            untracked = subprocess.check_output(
+                ["git", "ls-files", "--others", "--exclude-standard"],
+                text=True,
+                stderr=subprocess.PIPE
+            ).strip()
+            if untracked:
+                diff = "Untracked files:\n" + untracked
+        return diff
+
+    def _commit_prompt(self, diff):
+        commit_message_prompt = self.config.get(
+            "commit_message_prompt",
+            "Generate a very short and very concise, one sentence commit message for these code changes:"
+        )
+        return f"{commit_message_prompt}\n{diff}"
+
+    def _finish_commit_message(self, full_msg):
+        # Extract first sentence only.
+        first_sentence = full_msg.strip().split('.')[0].strip()
+        if first_sentence and not first_sentence.endswith('.'):
+            first_sentence += '.'
+        return self.generate_commit_message(first_sentence)
+
+    def process_commit_message(self):
+        """Quickly generate a one-sentence commit message with an emoji using only the general model."""
+        self._refresh_config()  # Refresh config before operation
+        try:
+            diff = self._collect_diff()
             if not diff:
                 return self.generate_commit_message("No changes found")
-            commit_message_prompt = self.config.get(
-                "commit_message_prompt",
-                "Generate a very short and very concise, one sentence commit message for these code changes:"
-            )
-
             # Pass the config to code_model.send_request to ensure it uses the configured values
-            full_msg = self.code_model.send_request(f"{commit_message_prompt}\n{diff}", self.config).strip()
-            # Extract first sentence only.
-            first_sentence = full_msg.split('.')[0].strip()
-            if first_sentence and not first_sentence.endswith('.'):
-                first_sentence += '.'
-            return self.generate_commit_message(first_sentence)
+            full_msg = self.code_model.send_request(self._commit_prompt(diff), self.config)
+            return self._finish_commit_message(full_msg)
+        except ModelError:
+            raise
+        except Exception as e:
+            logging.error(f"Error generating commit message: {e}")
+            return self.generate_commit_message("Update code changes")
+
+    async def process_commit_message_async(self):
+        self._refresh_config()
+        try:
+            diff = await asyncio.to_thread(self._collect_diff)
+            if not diff:
+                return self.generate_commit_message("No changes found")
+            full_msg = await self.code_model.send_request_async(self._commit_prompt(diff), self.config)
+            return self._finish_commit_message(full_msg)
+        except ModelError:
+            raise
         except Exception as e:
             logging.error(f"Error generating commit message: {e}")
             return self.generate_commit_message("Update code changes")
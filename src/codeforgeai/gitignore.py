@@ -0,0 +1,204 @@
+import os
+import re
+import logging
+from functools import lru_cache
+
+
+def _translate(pattern):
+    """Translate a single gitignore glob into a regular expression string."""
+    i, n = 0, len(pattern)
+    res = []
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern[i:i + 2] == "**" and (i == 0 or pattern[i - 1] == "/"):
+                j = i + 2
+                if j == n:
+                    # "abc/**" matches everything inside abc
+                    res.append(".*")
+                    i = j
+                    continue
+                if pattern[j] == "/":
+                    # "**/" matches zero or more leading directories
+                    res.append("(?:.*/)?")
+                    i = j + 1
+                    continue
+            while i < n and pattern[i] == "*":
+                i += 1
+            res.append("[^/]*")
+            continue
+        if c == "?":
+            res.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            j = pattern.find("]", j)
+            if j == -1:
+                res.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j].replace("\\", "\\\\")
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                res.append(f"[{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            res.append(re.escape(pattern[i]))
+        else:
+            res.append(re.escape(c))
+        i += 1
+    return "".join(res)
+
+
+def compile_pattern(line):
+    """Parse one .gitignore line into ``(regex, negate, dir_only)`` or None."""
+    line = line.rstrip("\n\r")
+    # Trailing spaces are ignored unless escaped with a backslash
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    if not line or line.startswith("#"):
+        return None
+
+    negate = False
+    if line.startswith("!"):
+        negate = True
+        line = line[1:]
+    elif line.startswith(("\\!", "\\#")):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # A slash anywhere but the end anchors the pattern to the .gitignore directory
+    anchored = "/" in line
+    line = line.lstrip("/")
+    regex = _translate(line)
+    if not anchored:
+        regex = f"(?:.*/)?{regex}"
+    return re.compile(regex, re.DOTALL), negate, dir_only
+
+
+class _RuleSet:
+    """Compiled rules of a single .gitignore file."""
+
+    def __init__(self, lines):
+        self.rules = [r for r in (compile_pattern(line) for line in lines) if r]
+        # One combined expression rejects most paths without scanning every rule
+        self.any = re.compile(
+            "|".join(f"(?:{regex.pattern})" for regex, _, _ in self.rules), re.DOTALL
+        ) if self.rules else None
+
+    def match(self, rel_path, is_dir):
+        """Return True/False when a rule decides the path, None otherwise."""
+        if self.any is None or not self.any.fullmatch(rel_path):
+            return None
+        # The last matching rule wins
+        for regex, negate, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.fullmatch(rel_path):
+                return not negate
+        return None
+
+
+class GitignoreMatcher:
+    """
+    Decide whether paths below root are ignored by git.
+
+    Each .gitignore is read and compiled once, the first time a path in its
+    directory is checked. Nested .gitignore files, ``!`` negations, anchored
+    and ``**`` patterns follow git's semantics, and a path inside an ignored
+    directory is ignored regardless of later negations.
+    """
+
+    def __init__(self, root=".", patterns=None, nested=True):
+        self.root = os.path.abspath(root)
+        self.nested = nested
+        self._rulesets = {}
+        self._dir_cache = {}
+        if patterns is not None:
+            self._rulesets[""] = _RuleSet(patterns)
+
+    def _ruleset(self, rel_dir):
+        try:
+            return self._rulesets[rel_dir]
+        except KeyError:
+            pass
+        ruleset = None
+        if rel_dir == "" or self.nested:
+            path = os.path.join(self.root, rel_dir, ".gitignore")
+            try:
+                with open(path, encoding="utf-8", errors="ignore") as f:
+                    ruleset = _RuleSet(f.readlines())
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.error(f"Error reading {path}: {e}")
+        self._rulesets[rel_dir] = ruleset
+        return ruleset
+
+    def _relative(self, path):
+        path = os.fspath(path)
+        if os.path.isabs(path):
+            path = os.path.relpath(path, self.root)
+        path = os.path.normpath(path).replace(os.sep, "/")
+        if path == ".":
+            return ""
+        if path == ".." or path.startswith("../"):
+            return None
+        return path
+
+    def _match(self, rel_path, is_dir):
+        if rel_path.rsplit("/", 1)[-1] == ".git":
+            return True
+        rel_dir = rel_path
+        # Deeper .gitignore files take precedence over their parents
+        while rel_dir:
+            rel_dir = rel_dir.rpartition("/")[0]
+            ruleset = self._ruleset(rel_dir)
+            if ruleset is not None:
+                sub_path = rel_path[len(rel_dir) + 1:] if rel_dir else rel_path
+                result = ruleset.match(sub_path, is_dir)
+                if result is not None:
+                    return result
+        return False
+
+    def _is_dir_ignored(self, rel_dir):
+        try:
+            return self._dir_cache[rel_dir]
+        except KeyError:
+            pass
+        parent = rel_dir.rpartition("/")[0]
+        ignored = (bool(parent) and self._is_dir_ignored(parent)) or self._match(rel_dir, True)
+        self._dir_cache[rel_dir] = ignored
+        return ignored
+
+    def is_ignored(self, path, is_dir=None):
+        """
+        Check a path (absolute, or relative to root) against the ignore rules.
+        is_dir is looked up on disk when not given.
+        """
+        rel_path = self._relative(path)
+        if not rel_path:
+            return False
+        if is_dir is None:
+            is_dir = os.path.isdir(os.path.join(self.root, rel_path))
+        if is_dir:
+            return self._is_dir_ignored(rel_path)
+        parent = rel_path.rpartition("/")[0]
+        if parent and self._is_dir_ignored(parent):
+            return True
+        return self._match(rel_path, False)
+
+
+@lru_cache(maxsize=32)
+def matcher_for_patterns(patterns, root="."):
+    """Return a cached matcher for a tuple of raw gitignore pattern lines."""
+    return GitignoreMatcher(root, patterns=patterns, nested=False)
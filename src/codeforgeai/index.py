@@ -0,0 +1,217 @@
+import os
+import json
+import logging
+import sqlite3
+
+INDEX_PATH = ".codeforge.db"
+JSON_PATH = ".codeforge.json"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    classification TEXT,
+    hash TEXT,
+    size INTEGER,
+    mtime INTEGER
+);
+CREATE INDEX IF NOT EXISTS files_classification ON files (classification);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    name TEXT PRIMARY KEY,
+    fingerprint TEXT
+);
+"""
+
+
+class ProjectIndex:
+    """
+    Transactional store for file classifications, content hashes and project
+    metadata, kept in a SQLite database next to .codeforge.json.
+
+    Writes are grouped into transactions of batch_size rows, so a crash loses
+    at most the current batch and never leaves a half-written file behind.
+    """
+
+    def __init__(self, path=INDEX_PATH, batch_size=50):
+        self.path = path
+        self.batch_size = max(1, int(batch_size))
+        self._pending = 0
+        is_new = not os.path.exists(path)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        if is_new and os.path.exists(JSON_PATH):
+            self.import_json(JSON_PATH)
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def commit(self):
+        self.conn.commit()
+        self._pending = 0
+
+    def _written(self, count=1):
+        self._pending += count
+        if self._pending >= self.batch_size:
+            self.commit()
+
+    # ---- files ----
+
+    def file_states(self):
+        """Return ``{path: {"hash", "size", "mtime"}}`` for every indexed file."""
+        rows = self.conn.execute("SELECT path, hash, size, mtime FROM files")
+        return {
+            path: {"hash": digest, "size": size, "mtime": mtime}
+            for path, digest, size, mtime in rows
+        }
+
+    def classified_paths(self):
+        """Return the set of paths that have a classification. Error strings stored by old versions do not count."""
+        rows = self.conn.execute(
+            "SELECT path FROM files WHERE classification IS NOT NULL AND classification NOT LIKE 'Error:%'"
+        )
+        return {path for (path,) in rows}
+
+    def get_file(self, path):
+        row = self.conn.execute(
+            "SELECT path, classification, hash, size, mtime FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        return _row_to_dict(row) if row else None
+
+    def upsert_file(self, path, classification, state):
+        self.conn.execute(
+            "INSERT INTO files (path, classification, hash, size, mtime) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET classification = excluded.classification, "
+            "hash = excluded.hash, size = excluded.size, mtime = excluded.mtime",
+            (path, classification, state.get("hash"), state.get("size"), state.get("mtime")),
+        )
+        self._written()
+
+    def update_state(self, path, state):
+        """Refresh the stored hash, size and mtime without touching the classification."""
+        self.conn.execute(
+            "UPDATE files SET hash = ?, size = ?, mtime = ? WHERE path = ?",
+            (state.get("hash"), state.get("size"), state.get("mtime"), path),
+        )
+        self._written()
+
+    def remove_files(self, paths):
+        paths = list(paths)
+        self.conn.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in paths))
+        self._written(len(paths))
+
+    def remove_tree(self, path):
+        """Remove a file, or every file below a directory, from the index."""
+        path = os.path.normpath(path)
+        prefix = path + os.sep
+        self.conn.execute(
+            "DELETE FROM files WHERE path = ? OR substr(path, 1, ?) = ?",
+            (path, len(prefix), prefix),
+        )
+        self._written()
+
+    def query(self, path=None, glob=None, classification=None):
+        """
+        Yield matching files without loading the whole index.
+        path matches exactly, glob uses SQLite GLOB syntax and classification
+        is a case-insensitive substring match.
+        """
+        clauses, params = [], []
+        if path:
+            clauses.append("path = ?")
+            params.append(os.path.normpath(path))
+        if glob:
+            clauses.append("path GLOB ?")
+            params.append(glob)
+        if classification:
+            clauses.append("classification LIKE ?")
+            params.append(f"%{classification}%")
+        sql = "SELECT path, classification, hash, size, mtime FROM files"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY path"
+        for row in self.conn.execute(sql, params):
+            yield _row_to_dict(row)
+
+    # ---- metadata ----
+
+    def get_metadata(self):
+        rows = self.conn.execute("SELECT key, value FROM metadata")
+        return {key: json.loads(value) for key, value in rows}
+
+    def set_metadata(self, metadata):
+        self.conn.executemany(
+            "INSERT INTO metadata (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            ((key, json.dumps(value)) for key, value in metadata.items()),
+        )
+        self._written(len(metadata))
+
+    def get_fingerprints(self):
+        """Return the input fingerprints the stored metadata was computed from."""
+        rows = self.conn.execute("SELECT name, fingerprint FROM fingerprints")
+        return dict(rows)
+
+    def set_fingerprints(self, fingerprints):
+        self.conn.executemany(
+            "INSERT INTO fingerprints (name, fingerprint) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET fingerprint = excluded.fingerprint",
+            fingerprints.items(),
+        )
+        self._written(len(fingerprints))
+
+    # ---- JSON compatibility ----
+
+    def import_json(self, json_path=JSON_PATH):
+        """Load classifications and metadata from a legacy .codeforge.json."""
+        try:
+            with open(json_path) as f:
+                data = json.load(f)
+        except Exception as e:
+            logging.error(f"Error importing {json_path}: {e}")
+            return
+        file_classification = data.pop("file_classification", {}) or {}
+        file_index = data.pop("file_index", {}) or {}
+        for path, classification in file_classification.items():
+            self.upsert_file(path, classification, file_index.get(path, {}))
+        self.set_metadata(data)
+        self.commit()
+        logging.debug(f"ProjectIndex: Imported {len(file_classification)} files from {json_path}")
+
+    def export_json(self, json_path=JSON_PATH):
+        """Write the index out in the .codeforge.json layout."""
+        data = self.get_metadata()
+        data["file_classification"] = {}
+        data["file_index"] = {}
+        for entry in self.query():
+            if entry["classification"] is not None:
+                data["file_classification"][entry["path"]] = entry["classification"]
+            data["file_index"][entry["path"]] = {
+                "hash": entry["hash"], "size": entry["size"], "mtime": entry["mtime"]
+            }
+        tmp_path = f"{json_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=4)
+        os.replace(tmp_path, json_path)
+
+
+def _row_to_dict(row):
+    path, classification, digest, size, mtime = row
+    return {
+        "path": path,
+        "classification": classification,
+        "hash": digest,
+        "size": size,
+        "mtime": mtime,
+    }
@@ -63,6 +63,23 @@ class SecretAIModel:
             _logger.error(f"Error calling Secret AI: {e}")
             return f"Error calling Secret AI: {e}"
     
+    def stream_request(self, prompt: str):
+        """Yield the response in pieces as the model generates it."""
+        if not self.llm:
+            yield "Error: Secret AI LLM not initialized. Check your API key and available models."
+            return
+            
+        try:
+            messages = [
+                ("system", "You are a helpful AI assistant for a developer using CodeForgeAI."),
+                ("human", prompt),
+            ]
+            for chunk in self.llm.stream(messages):
+                yield chunk.content
+        except Exception as e:
+            _logger.error(f"Error calling Secret AI: {e}")
+            yield f"Error calling Secret AI: {e}"
+    
     def get_model_info(self) -> Dict[str, Any]:
         models = self.available_models
         return {
@@ -0,0 +1,124 @@
+import os
+import logging
+
+EXTENSIONS = {
+    ".py": "Python", ".pyi": "Python", ".pyx": "Python",
+    ".js": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript", ".jsx": "JavaScript",
+    ".ts": "TypeScript", ".tsx": "TypeScript",
+    ".rs": "Rust",
+    ".go": "Go",
+    ".java": "Java",
+    ".kt": "Kotlin", ".kts": "Kotlin",
+    ".scala": "Scala",
+    ".c": "C", ".h": "C",
+    ".cc": "C++", ".cpp": "C++", ".cxx": "C++", ".hpp": "C++", ".hh": "C++",
+    ".cs": "C#",
+    ".rb": "Ruby",
+    ".php": "PHP",
+    ".swift": "Swift",
+    ".m": "Objective-C", ".mm": "Objective-C",
+    ".dart": "Dart",
+    ".lua": "Lua",
+    ".r": "R",
+    ".jl": "Julia",
+    ".ex": "Elixir", ".exs": "Elixir",
+    ".erl": "Erlang",
+    ".hs": "Haskell",
+    ".clj": "Clojure",
+    ".zig": "Zig",
+    ".sol": "Solidity",
+    ".vy": "Vyper",
+    ".sh": "Shell", ".bash": "Shell", ".zsh": "Shell",
+    ".pl": "Perl", ".pm": "Perl",
+    ".html": "HTML", ".htm": "HTML",
+    ".css": "CSS", ".scss": "CSS", ".sass": "CSS", ".less": "CSS",
+    ".vue": "Vue",
+    ".svelte": "Svelte",
+}
+
+# Markup and styling rarely define a project's language, so they count for less
+WEIGHTS = {"HTML": 0.3, "CSS": 0.3, "Shell": 0.5}
+
+SHEBANGS = {
+    "python": "Python", "python3": "Python", "node": "JavaScript", "deno": "TypeScript",
+    "bash": "Shell", "sh": "Shell", "zsh": "Shell", "ruby": "Ruby", "perl": "Perl", "php": "PHP",
+}
+
+MANIFESTS = {
+    "setup.py": "Python", "setup.cfg": "Python", "pyproject.toml": "Python",
+    "requirements.txt": "Python", "Pipfile": "Python",
+    "package.json": "JavaScript", "tsconfig.json": "TypeScript",
+    "Cargo.toml": "Rust", "go.mod": "Go",
+    "pom.xml": "Java", "build.gradle": "Java", "build.gradle.kts": "Kotlin",
+    "Gemfile": "Ruby", "composer.json": "PHP", "mix.exs": "Elixir",
+    "pubspec.yaml": "Dart", "Package.swift": "Swift", "CMakeLists.txt": "C++",
+    "foundry.toml": "Solidity", "hardhat.config.js": "Solidity",
+}
+
+# Share of the total score a top-level manifest contributes
+MANIFEST_SHARE = 0.25
+
+
+def _shebang_language(path):
+    try:
+        with open(path, "rb") as f:
+            first = f.read(128).split(b"\n", 1)[0]
+    except OSError:
+        return None
+    if not first.startswith(b"#!"):
+        return None
+    words = first[2:].decode("utf-8", "ignore").split()
+    if not words:
+        return None
+    interpreter = os.path.basename(words[1] if words[0].endswith("env") and len(words) > 1 else words[0])
+    return SHEBANGS.get(interpreter.rstrip("0123456789.")) or SHEBANGS.get(interpreter)
+
+
+def detect_language(files, root="."):
+    """
+    Guess the main language of a project from its file list.
+
+    Source files are weighted by byte count, extensionless scripts by their
+    shebang, and top-level manifests (setup.cfg, package.json, Cargo.toml...)
+    add a fixed share on top. Returns ``(language, confidence, summary)``
+    where confidence is the winner's share of the total score and summary is
+    a compact description suitable for a model prompt.
+    """
+    scores = {}
+    manifests = []
+    for path in files:
+        name = os.path.basename(path)
+        if os.path.dirname(path) in ("", ".") and name in MANIFESTS:
+            manifests.append(name)
+        ext = os.path.splitext(name)[1].lower()
+        full_path = os.path.join(root, path)
+        language = EXTENSIONS.get(ext)
+        if language is None and not ext:
+            language = _shebang_language(full_path)
+        if language is None:
+            continue
+        try:
+            size = os.stat(full_path).st_size
+        except OSError:
+            continue
+        scores[language] = scores.get(language, 0) + max(size, 1) * WEIGHTS.get(language, 1)
+
+    code_total = sum(scores.values())
+    if manifests:
+        bonus = (code_total or 1) * MANIFEST_SHARE / len(manifests)
+        for name in manifests:
+            language = MANIFESTS[name]
+            scores[language] = scores.get(language, 0) + bonus
+
+    total = sum(scores.values())
+    if not total:
+        return None, 0.0, "no source files found"
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    language, score = ranked[0]
+    confidence = score / total
+    shares = ", ".join(f"{lang} {value / total:.0%}" for lang, value in ranked[:5])
+    summary = f"weighted share by bytes: {shares}"
+    if manifests:
+        summary += f"; manifest files: {', '.join(sorted(manifests))}"
+    logging.debug(f"Language detector: {language} ({confidence:.0%}); {summary}")
+    return language, confidence, summary
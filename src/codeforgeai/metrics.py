@@ -0,0 +1,122 @@
+import threading
+import contextvars
+from contextlib import contextmanager
+
+TIMING_FIELDS = (
+    "total_duration", "load_duration", "prompt_eval_count",
+    "prompt_eval_duration", "eval_count", "eval_duration",
+)
+# Ollama reports durations in nanoseconds
+NS = 1e9
+
+
+class MetricsRegistry:
+    """
+    In-process totals of model call timings, grouped by command, model and
+    prompt template. Every field of TIMING_FIELDS is summed from ollama's
+    responses, next to the call count, cache hits and wall-clock seconds.
+    """
+
+    def __init__(self):
+        self.command = None
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def set_command(self, command):
+        self.command = command
+
+    def _entry(self, model, template):
+        key = (self.command or "-", model or "-", template or "other")
+        entry = self._stats.get(key)
+        if entry is None:
+            entry = self._stats[key] = dict.fromkeys(("calls", "cached", "wall") + TIMING_FIELDS, 0)
+        return entry
+
+    def record(self, response, model, template=None, wall=0.0):
+        """Add the timings of one ChatResponse (or final streamed chunk)."""
+        with self._lock:
+            entry = self._entry(model, template)
+            entry["calls"] += 1
+            entry["wall"] += wall
+            for field in TIMING_FIELDS:
+                entry[field] += getattr(response, field, None) or 0
+
+    def record_cached(self, model, template=None):
+        with self._lock:
+            self._entry(model, template)["cached"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self):
+        """Format a per-command table of token counts, load versus generation time and throughput."""
+        stats = self.snapshot()
+        if not stats:
+            return "No model calls were made."
+        header = (
+            f"{'command':<16} {'model':<24} {'template':<30} {'calls':>5} {'cached':>6} "
+            f"{'prompt tok':>10} {'gen tok':>8} {'load s':>7} {'prompt s':>8} "
+            f"{'gen s':>7} {'gen tok/s':>9} {'wall s':>7}"
+        )
+        lines = [header, "-" * len(header)]
+        for (command, model, template), e in sorted(stats.items()):
+            rate = e["eval_count"] / (e["eval_duration"] / NS) if e["eval_duration"] else 0.0
+            lines.append(
+                f"{command:<16.16} {model:<24.24} {template:<30.30} {e['calls']:>5} {e['cached']:>6} "
+                f"{e['prompt_eval_count']:>10} {e['eval_count']:>8} {e['load_duration'] / NS:>7.2f} "
+                f"{e['prompt_eval_duration'] / NS:>8.2f} {e['eval_duration'] / NS:>7.2f} "
+                f"{rate:>9.1f} {e['wall']:>7.2f}"
+            )
+        return "\n".join(lines)
+
+
+registry = MetricsRegistry()
+
+_current = contextvars.ContextVar("codeforgeai_metrics", default=None)
+
+
+def current_registry():
+    """The registry model calls made in this context report to; the process-wide one by default."""
+    return _current.get() or registry
+
+
+@contextmanager
+def collect(command=None):
+    """
+    Report the model calls made in this context (and tasks or pool workers
+    copying it) to a fresh registry, so concurrent daemon requests each get
+    their own --timings.
+    """
+    scoped = MetricsRegistry()
+    scoped.set_command(command)
+    token = _current.set(scoped)
+    try:
+        yield scoped
+    finally:
+        _current.reset(token)
+
+_templates = {"config": None, "prompts": []}
+
+
+def template_name(prompt, config):
+    """
+    Name the config prompt a request was built from, e.g. "explain_code_prompt".
+    Every prompt starts with its template text, so the longest configured
+    prompt the request begins with wins; anything else is reported as "other".
+    """
+    if _templates["config"] is not config:
+        prompts = [
+            (value, key) for key, value in (config or {}).items()
+            if isinstance(value, str) and len(value) >= 20
+        ]
+        prompts.sort(key=lambda item: len(item[0]), reverse=True)
+        _templates.update(config=config, prompts=prompts)
+    for value, key in _templates["prompts"]:
+        if prompt.startswith(value):
+            return key
+    return None
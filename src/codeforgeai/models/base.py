@@ -0,0 +1,128 @@
+import time
+import logging
+from ollama import ChatResponse
+from codeforgeai.config import get_config
+from codeforgeai.cache import cached_chat, cached_chat_async, cached_stream
+from codeforgeai.models.client import get_client, get_async_client, get_semaphore, keep_alive
+from codeforgeai.models.errors import ModelError
+from codeforgeai.metrics import current_registry, template_name
+from codeforgeai.models.retry import call_with_retry, call_with_retry_async, stream_with_retry
+from codeforgeai.models.scheduler import slot, async_slot
+
+class BaseModel:
+    """
+    Chat with an ollama model. Subclasses name the config key holding the
+    model to use; requests go through the response cache, the scheduler's
+    slots, retries with backoff and the metrics registry.
+    """
+
+    config_key = None
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def _prepare(self, prompt, config):
+        # Load config to get the latest model name
+        if config is None:
+            config = get_config()
+        
+        # If config is provided, use the model name from the config
+        if config and config.get(self.config_key):
+            self.model_name = config[self.config_key]
+        
+        logging.debug(f"{type(self).__name__}: Using model: {self.model_name}")
+        logging.debug(f"{type(self).__name__}: Sending prompt: %s", prompt)
+        return config
+
+    def _messages(self, prompt):
+        return [{'role': 'user', 'content': prompt}]
+
+    def _record(self, response, prompt, config, started):
+        current_registry().record(response, self.model_name, template_name(prompt, config), time.perf_counter() - started)
+
+    def send_request(self, prompt, config=None, format=None):
+        """
+        Send a prompt and return the response text. Transient failures are
+        retried with backoff; a ModelError is raised when the call fails.
+        """
+        config = self._prepare(prompt, config)
+
+        def send():
+            with slot(config):
+                started = time.perf_counter()
+                response: ChatResponse = get_client(config).chat(
+                    model=self.model_name,
+                    messages=self._messages(prompt),
+                    format=format,
+                    keep_alive=keep_alive(config)
+                )
+            self._record(response, prompt, config, started)
+            return response.message.content
+
+        try:
+            content = cached_chat(
+                self.model_name, prompt, config,
+                lambda: call_with_retry(send, config, self.model_name), format=format
+            )
+        except ModelError as e:
+            logging.debug(f"Error with model {self.model_name}: {e}")
+            raise
+        logging.debug(f"{type(self).__name__}: Received response: %s", content)
+        return content
+
+    async def send_request_async(self, prompt, config=None, format=None):
+        """
+        Coroutine version of send_request. Requests share one AsyncClient per
+        event loop and at most model_concurrency of them run at once.
+        """
+        config = self._prepare(prompt, config)
+
+        async def send():
+            async with get_semaphore(config), async_slot(config):
+                started = time.perf_counter()
+                response: ChatResponse = await get_async_client(config).chat(
+                    model=self.model_name,
+                    messages=self._messages(prompt),
+                    format=format,
+                    keep_alive=keep_alive(config)
+                )
+            self._record(response, prompt, config, started)
+            return response.message.content
+
+        try:
+            content = await cached_chat_async(
+                self.model_name, prompt, config,
+                lambda: call_with_retry_async(send, config, self.model_name), format=format
+            )
+        except ModelError as e:
+            logging.debug(f"Error with model {self.model_name}: {e}")
+            raise
+        logging.debug(f"{type(self).__name__}: Received response: %s", content)
+        return content
+
+    def stream_request(self, prompt, config=None, format=None):
+        """Yield the response in pieces as the model generates it; join them for the full text."""
+        config = self._prepare(prompt, config)
+
+        def stream():
+            with slot(config):
+                started = time.perf_counter()
+                for part in get_client(config).chat(
+                    model=self.model_name,
+                    messages=self._messages(prompt),
+                    format=format,
+                    stream=True,
+                    keep_alive=keep_alive(config)
+                ):
+                    if part.done:
+                        self._record(part, prompt, config, started)
+                    yield part.message.content
+
+        try:
+            yield from cached_stream(
+                self.model_name, prompt, config,
+                lambda: stream_with_retry(stream, config, self.model_name), format=format
+            )
+        except ModelError as e:
+            logging.debug(f"Error with model {self.model_name}: {e}")
+            raise
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import threading
+import weakref
+
+import httpx
+from ollama import AsyncClient, Client
+
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 300.0
+DEFAULT_KEEP_ALIVE = "10m"
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_MODEL_CONCURRENCY = 4
+
+# One client per distinct set of connection settings, shared by every model
+_clients = {}
+_clients_lock = threading.Lock()
+# Async clients and semaphores belong to the event loop they were created on
+_async_clients = weakref.WeakKeyDictionary()
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _settings(config):
+    config = config or {}
+    return (
+        config.get("ollama_host") or None,
+        float(config.get("ollama_connect_timeout", DEFAULT_CONNECT_TIMEOUT)),
+        float(config.get("ollama_read_timeout", DEFAULT_READ_TIMEOUT)),
+        int(config.get("ollama_max_connections", DEFAULT_MAX_CONNECTIONS)),
+    )
+
+
+def _client_kwargs(settings):
+    host, connect_timeout, read_timeout, max_connections = settings
+    logging.debug(
+        f"Ollama client: Connecting to {host or 'default host'} "
+        f"(connect {connect_timeout}s, read {read_timeout}s, pool {max_connections})"
+    )
+    return {
+        "host": host,
+        "timeout": httpx.Timeout(read_timeout, connect=connect_timeout),
+        "limits": httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    }
+
+
+def get_client(config=None):
+    """
+    Return the shared ollama Client for the connection settings in config.
+
+    The client is created on first use and keeps a pool of persistent HTTP
+    connections. ollama_host falls back to the OLLAMA_HOST environment
+    variable when unset. ollama_connect_timeout and ollama_read_timeout are
+    in seconds; the read timeout bounds the wait for each piece of a
+    response, so a hung server raises instead of blocking forever.
+    """
+    settings = _settings(config)
+    with _clients_lock:
+        client = _clients.get(settings)
+        if client is None:
+            client = _clients[settings] = Client(**_client_kwargs(settings))
+    return client
+
+
+def get_async_client(config=None):
+    """Return the AsyncClient shared by every coroutine on the running event loop."""
+    loop = asyncio.get_running_loop()
+    settings = _settings(config)
+    with _clients_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(settings)
+        if client is None:
+            client = clients[settings] = AsyncClient(**_client_kwargs(settings))
+    return client
+
+
+def get_semaphore(config=None):
+    """Return the semaphore capping in-flight async requests at model_concurrency."""
+    loop = asyncio.get_running_loop()
+    size = max(1, int((config or {}).get("model_concurrency", DEFAULT_MODEL_CONCURRENCY)))
+    with _clients_lock:
+        entry = _semaphores.get(loop)
+        if entry is None or entry[0] != size:
+            entry = _semaphores[loop] = (size, asyncio.Semaphore(size))
+    return entry[1]
+
+
+def keep_alive(config=None):
+    """How long ollama keeps the model loaded after a request (ollama_keep_alive)."""
+    return (config or {}).get("ollama_keep_alive", DEFAULT_KEEP_ALIVE)
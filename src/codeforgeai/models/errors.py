@@ -0,0 +1,63 @@
+class ModelError(Exception):
+    """Base class for failures talking to a model backend."""
+
+    transient = False
+
+    def __init__(self, message, model_name=None):
+        super().__init__(message)
+        self.model_name = model_name
+
+
+class RequestCancelled(ModelError):
+    """The caller went away, e.g. the daemon's client was interrupted with Ctrl+C."""
+
+
+class ModelNotFoundError(ModelError):
+    """The requested model is not installed on the server."""
+
+
+class ModelRequestError(ModelError):
+    """The server rejected the request; retrying will not help."""
+
+
+class ModelUnavailableError(ModelError):
+    """The server is down, restarting, overloaded or still loading the model."""
+
+    transient = True
+
+
+class ModelTimeoutError(ModelUnavailableError):
+    """The server did not answer within the configured timeouts."""
+
+
+class CircuitOpenError(ModelUnavailableError):
+    """Calls are being refused locally because the backend recently kept failing."""
+
+
+def translate_error(e, model_name=None):
+    """
+    Map an exception raised by the ollama client onto a ModelError. Anything
+    else, e.g. a bug in the caller, is returned unchanged.
+    """
+    # Imported here so catching ModelError does not load the HTTP stack
+    import httpx
+    from ollama import RequestError, ResponseError
+
+    if isinstance(e, ModelError):
+        return e
+    if isinstance(e, httpx.TimeoutException):
+        return ModelTimeoutError(f"Model '{model_name}' timed out: {e}", model_name)
+    if isinstance(e, ResponseError):
+        if e.status_code == 404 or "not found" in str(e.error):
+            return ModelNotFoundError(
+                f"Model '{model_name}' not found. You may need to run 'ollama pull {model_name}' first.",
+                model_name,
+            )
+        if e.status_code in (408, 429) or e.status_code >= 500:
+            return ModelUnavailableError(f"Model server error ({e.status_code}): {e.error}", model_name)
+        return ModelRequestError(f"Model request failed ({e.status_code}): {e.error}", model_name)
+    if isinstance(e, RequestError):
+        return ModelRequestError(f"Model request failed: {e.error}", model_name)
+    if isinstance(e, (ConnectionError, httpx.TransportError)):
+        return ModelUnavailableError(str(e), model_name)
+    return e
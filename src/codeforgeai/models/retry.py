@@ -0,0 +1,187 @@
+import time
+import random
+import asyncio
+import logging
+import threading
+
+from codeforgeai.models.errors import CircuitOpenError, ModelError, RequestCancelled, translate_error
+
+DEFAULTS = {
+    "model_retries": 3,
+    "model_retry_base_delay": 0.5,
+    "model_retry_max_delay": 8.0,
+    "circuit_failure_threshold": 5,
+    "circuit_reset_timeout": 30.0,
+}
+
+
+class CircuitBreaker:
+    """
+    Stop calling a backend that keeps failing.
+
+    After failure_threshold consecutive transient failures the circuit opens
+    and calls fail immediately with CircuitOpenError. Once reset_timeout
+    seconds have passed a single trial call is let through: success closes
+    the circuit again, failure keeps it open for another reset_timeout.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at >= self.reset_timeout and not self._trial:
+                self._trial = True
+                return
+        raise CircuitOpenError("Model server unavailable; not retrying until it recovers")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def abandon_trial(self):
+        """Let another call be the trial when this one ended without reaching the backend."""
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self._trial:
+                    logging.error(f"Model server failed {self.failures} times in a row; pausing calls for {self.reset_timeout}s")
+                self.opened_at = time.monotonic()
+                self._trial = False
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def _setting(config, key):
+    return (config or {}).get(key, DEFAULTS[key])
+
+
+def get_breaker(config=None):
+    """Return the circuit breaker shared by every call to the configured ollama host."""
+    host = (config or {}).get("ollama_host") or None
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(
+                int(_setting(config, "circuit_failure_threshold")),
+                float(_setting(config, "circuit_reset_timeout")),
+            )
+    return breaker
+
+
+def backoff_delays(config=None):
+    """Yield full-jitter exponential backoff delays, one per allowed retry."""
+    base = float(_setting(config, "model_retry_base_delay"))
+    cap = float(_setting(config, "model_retry_max_delay"))
+    for attempt in range(max(0, int(_setting(config, "model_retries")))):
+        yield random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _attempt_failed(breaker, e, model_name):
+    """The ModelError for a failed attempt, updating the breaker; re-raises anything else."""
+    error = translate_error(e, model_name)
+    if not isinstance(error, ModelError) or isinstance(error, RequestCancelled):
+        # Says nothing about the backend. Anything but a ModelError, e.g. a
+        # bug in the caller, is raised as it is rather than retried
+        breaker.abandon_trial()
+        if not isinstance(error, ModelError):
+            raise e
+        return error
+    if error.transient:
+        breaker.record_failure()
+    else:
+        # The server answered, so it is up even if the request was bad
+        breaker.record_success()
+    return error
+
+
+def call_with_retry(fn, config=None, model_name=None):
+    """
+    Call fn(), retrying transient failures with jittered exponential backoff.
+    Raises a ModelError once retries are exhausted, the error is permanent,
+    or the circuit breaker is open.
+    """
+    breaker = get_breaker(config)
+    delays = backoff_delays(config)
+    while True:
+        breaker.before_call()
+        try:
+            result = fn()
+        except Exception as e:
+            error = _attempt_failed(breaker, e, model_name)
+            delay = next(delays, None) if error.transient else None
+            if delay is None:
+                if error is e:
+                    raise
+                raise error from e
+            logging.debug(f"Model call failed ({error}); retrying in {delay:.2f}s")
+            time.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
+
+
+async def call_with_retry_async(fn, config=None, model_name=None):
+    """Coroutine version of call_with_retry; fn is a coroutine function."""
+    breaker = get_breaker(config)
+    delays = backoff_delays(config)
+    while True:
+        breaker.before_call()
+        try:
+            result = await fn()
+        except Exception as e:
+            error = _attempt_failed(breaker, e, model_name)
+            delay = next(delays, None) if error.transient else None
+            if delay is None:
+                if error is e:
+                    raise
+                raise error from e
+            logging.debug(f"Model call failed ({error}); retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
+
+
+def stream_with_retry(stream, config=None, model_name=None):
+    """
+    Yield from stream(), retrying transient failures that happen before the
+    first piece arrives. Failures after that are raised, since the caller
+    has already consumed part of the answer.
+    """
+    breaker = get_breaker(config)
+    delays = backoff_delays(config)
+    while True:
+        breaker.before_call()
+        started = False
+        try:
+            for piece in stream():
+                started = True
+                yield piece
+        except Exception as e:
+            error = _attempt_failed(breaker, e, model_name)
+            delay = next(delays, None) if error.transient and not started else None
+            if delay is None:
+                if error is e:
+                    raise
+                raise error from e
+            logging.debug(f"Model stream failed ({error}); retrying in {delay:.2f}s")
+            time.sleep(delay)
+            continue
+        breaker.record_success()
+        return
@@ -0,0 +1,264 @@
+import os
+import time
+import logging
+import itertools
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager, nullcontext
+
+from codeforgeai.models.errors import RequestCancelled
+
+PRIORITIES = ("interactive", "normal", "background")
+DEFAULT_SLOTS = 4
+DEFAULT_LIMITS = {"interactive": 4, "normal": 4, "background": 3}
+# Seconds between checks while background work waits for another process
+BACKGROUND_POLL = 0.1
+# Markers older than this belong to a process that died mid-call
+MARKER_MAX_AGE = 600
+# Seconds between cancellation checks while a cancellable call waits
+CANCEL_POLL = 0.1
+
+_priority = contextvars.ContextVar("codeforgeai_priority", default=None)
+# threading.Event set when the caller of this context goes away
+_cancel = contextvars.ContextVar("codeforgeai_cancel", default=None)
+
+
+@contextmanager
+def priority(name):
+    """Run model calls made in this context (and tasks or pool workers copying it) at priority name."""
+    token = _priority.set(name if name in PRIORITIES else "normal")
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@contextmanager
+def cancel_on(event):
+    """Make model calls in this context raise RequestCancelled once event is set."""
+    token = _cancel.set(event)
+    try:
+        yield
+    finally:
+        _cancel.reset(token)
+
+
+def check_cancelled():
+    event = _cancel.get()
+    if event is not None and event.is_set():
+        raise RequestCancelled("The request was cancelled")
+
+
+def current_priority():
+    return _priority.get() or "normal"
+
+
+def priority_for(command, config=None):
+    """Priority class of a CLI command, from scheduler_priorities; "normal" when unlisted."""
+    return ((config or {}).get("scheduler_priorities") or {}).get(command, "normal")
+
+
+class Scheduler:
+    """
+    Admission control for model calls.
+
+    At most slots calls run at once, and at most limits[class] of them per
+    priority class. Waiting calls start in priority order and first come,
+    first served within a class. Background calls also wait while any
+    interactive call is waiting or running, so a suggestion never queues
+    behind a batch of file classifications.
+    """
+
+    def __init__(self, slots=DEFAULT_SLOTS, limits=None):
+        self.slots = slots
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self._queues = {name: deque() for name in PRIORITIES}
+        self._running = dict.fromkeys(PRIORITIES, 0)
+        self._cond = threading.Condition()
+
+    def _can_start(self, ticket, name):
+        if self._queues[name][0] is not ticket:
+            return False
+        if self._running[name] >= self.limits[name] or sum(self._running.values()) >= self.slots:
+            return False
+        if name == "background" and (self._running["interactive"] or self._queues["interactive"]):
+            return False
+        # A higher class that could use the free slot goes first
+        for higher in PRIORITIES[:PRIORITIES.index(name)]:
+            if self._queues[higher] and self._running[higher] < self.limits[higher]:
+                return False
+        return True
+
+    def acquire(self, name, cancel=None):
+        """Wait for a slot in class name; raises RequestCancelled if the cancel event is set meanwhile."""
+        ticket = object()
+        with self._cond:
+            queue = self._queues[name]
+            queue.append(ticket)
+            try:
+                while not self._can_start(ticket, name):
+                    if cancel is not None and cancel.is_set():
+                        raise RequestCancelled("The request was cancelled")
+                    self._cond.wait(CANCEL_POLL if cancel is not None else None)
+            except BaseException:
+                queue.remove(ticket)
+                self._cond.notify_all()
+                raise
+            queue.popleft()
+            self._running[name] += 1
+            # The next call in line may be able to start too
+            self._cond.notify_all()
+
+    def release(self, name):
+        with self._cond:
+            self._running[name] -= 1
+            self._cond.notify_all()
+
+    def snapshot(self):
+        with self._cond:
+            return {name: {"running": self._running[name], "waiting": len(self._queues[name])}
+                    for name in PRIORITIES}
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+_waiters = None
+
+
+def _limits(config):
+    limits = dict(DEFAULT_LIMITS, **((config or {}).get("scheduler_limits") or {}))
+    return tuple(max(1, int(limits[name])) for name in PRIORITIES)
+
+
+def get_scheduler(config=None):
+    """Return the scheduler shared by every model call in this process."""
+    slots = max(1, int((config or {}).get("scheduler_slots", DEFAULT_SLOTS)))
+    key = (slots, _limits(config))
+    with _schedulers_lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None:
+            scheduler = _schedulers[key] = Scheduler(slots, dict(zip(PRIORITIES, key[1])))
+    return scheduler
+
+
+# ---- Coordination between processes ----
+# An interactive call in one process (e.g. the daemon serving a suggestion)
+# leaves a marker file while it waits or runs, and background calls in other
+# processes (e.g. analyze --loop) hold off until the markers are gone.
+
+_marker_ids = itertools.count()
+
+
+def _marker_dir():
+    return os.path.expanduser("~/.cache/codeforgeai/interactive")
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def _interactive_marker():
+    path = os.path.join(_marker_dir(), f"{os.getpid()}-{next(_marker_ids)}")
+    try:
+        os.makedirs(_marker_dir(), exist_ok=True)
+        open(path, "w").close()
+    except OSError as e:
+        logging.debug(f"Scheduler: could not create marker {path}: {e}")
+        path = None
+    try:
+        yield
+    finally:
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def interactive_elsewhere():
+    """True while another process has an interactive model call waiting or running."""
+    try:
+        names = os.listdir(_marker_dir())
+    except OSError:
+        return False
+    own_pid = os.getpid()
+    for name in names:
+        path = os.path.join(_marker_dir(), name)
+        try:
+            pid = int(name.split("-", 1)[0])
+            fresh = time.time() - os.path.getmtime(path) < MARKER_MAX_AGE
+        except (ValueError, OSError):
+            continue
+        if pid == own_pid:
+            continue
+        if fresh and _pid_alive(pid):
+            return True
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return False
+
+
+@contextmanager
+def slot(config=None):
+    """Hold a scheduler slot, at the current priority, for the duration of one model call."""
+    name = current_priority()
+    scheduler = get_scheduler(config)
+    check_cancelled()
+    if name == "background":
+        while interactive_elsewhere():
+            time.sleep(BACKGROUND_POLL)
+            check_cancelled()
+    marker = _interactive_marker() if name == "interactive" else nullcontext()
+    with marker:
+        scheduler.acquire(name, _cancel.get())
+        try:
+            yield
+        finally:
+            scheduler.release(name)
+
+
+def _waiter_pool():
+    from concurrent.futures import ThreadPoolExecutor
+    global _waiters
+    with _schedulers_lock:
+        if _waiters is None:
+            _waiters = ThreadPoolExecutor(max_workers=32, thread_name_prefix="codeforgeai-scheduler")
+    return _waiters
+
+
+@asynccontextmanager
+async def async_slot(config=None):
+    """Coroutine version of slot; waiting happens on a helper thread so the event loop keeps running."""
+    import asyncio
+    name = current_priority()
+    scheduler = get_scheduler(config)
+    check_cancelled()
+    if name == "background":
+        while interactive_elsewhere():
+            await asyncio.sleep(BACKGROUND_POLL)
+            check_cancelled()
+    marker = _interactive_marker() if name == "interactive" else nullcontext()
+    with marker:
+        future = _waiter_pool().submit(scheduler.acquire, name, _cancel.get())
+        try:
+            await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # The helper thread may still get the slot; hand it straight back
+            future.add_done_callback(
+                lambda f: scheduler.release(name) if not f.cancelled() and f.exception() is None else None
+            )
+            raise
+        try:
+            yield
+        finally:
+            scheduler.release(name)
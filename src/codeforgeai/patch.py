@@ -0,0 +1,162 @@
+"""
+    Apply the edits a model returns instead of a whole file.
+
+    Two formats are understood: search/replace blocks::
+
+        <<<<<<< SEARCH
+        lines copied from the file
+        =======
+        their replacement
+        >>>>>>> REPLACE
+
+    and unified diff hunks (``@@ -12,3 +12,4 @@``). Surrounding prose and
+    code fences are ignored. Matching tolerates trailing whitespace, which
+    models often drop, but an edit that does not match the file raises
+    PatchError so the caller can fall back to a full rewrite.
+"""
+
+import ast
+import re
+
+_BLOCK = re.compile(
+    r"^<{5,9} ?SEARCH[^\n]*\n(.*?)^={5,9}[ \t]*\n(.*?)^>{5,9} ?REPLACE[^\n]*$",
+    re.MULTILINE | re.DOTALL,
+)
+_HUNK = re.compile(r"^@@ -(\d+)(?:,\d+)? \+\d+(?:,\d+)? @@")
+
+
+class PatchError(ValueError):
+    """The model's edit does not parse or does not apply to the file."""
+
+
+def _lines(text):
+    return text.splitlines(keepends=True)
+
+
+def _find(lines, old):
+    """Indices where the lines of old appear in lines, ignoring trailing whitespace."""
+    key = [line.rstrip() for line in old]
+    n = len(key)
+    first = key[0] if key else None
+    return [
+        i for i in range(len(lines) - n + 1)
+        if lines[i].rstrip() == first and [line.rstrip() for line in lines[i:i + n]] == key
+    ]
+
+
+def _splice(lines, start, count, new):
+    """Replace lines[start:start + count] with new, keeping the file's final newline or lack of one."""
+    new = list(new)
+    if start + count < len(lines) or (count and lines[start + count - 1].endswith("\n")):
+        if new and not new[-1].endswith("\n"):
+            new[-1] += "\n"
+    elif count and new:
+        # Replacing the unterminated last line: the edit must not add a newline
+        new[-1] = new[-1].rstrip("\r\n")
+    if start and not lines[start - 1].endswith("\n"):
+        lines[start - 1] += "\n"
+    lines[start:start + count] = new
+
+
+def parse_blocks(text):
+    """Return the ``(search, replace)`` pairs of every search/replace block in text."""
+    return [(m.group(1), m.group(2)) for m in _BLOCK.finditer(text)]
+
+
+def apply_blocks(source, blocks):
+    """
+    Apply search/replace blocks in order. Each search must match exactly
+    once; an empty search appends its replacement to the file.
+    """
+    lines = _lines(source)
+    for search, replace in blocks:
+        if not search.strip():
+            _splice(lines, len(lines), 0, _lines(replace))
+            continue
+        old = _lines(search)
+        hits = _find(lines, old)
+        if not hits:
+            raise PatchError(f"search block not found: {old[0].strip()!r}")
+        if len(hits) > 1:
+            raise PatchError(f"search block matches {len(hits)} places: {old[0].strip()!r}")
+        _splice(lines, hits[0], len(old), _lines(replace))
+    return "".join(lines)
+
+
+def parse_unified_diff(text):
+    """Return the hunks of a unified diff as ``(old_start, old_lines, new_lines)``."""
+    hunks, current = [], None
+    lines = text.splitlines(keepends=True)
+    for i, line in enumerate(lines):
+        header = _HUNK.match(line)
+        if header:
+            current = (int(header.group(1)), [], [])
+            hunks.append(current)
+            continue
+        if current is None:
+            continue
+        next_line = lines[i + 1] if i + 1 < len(lines) else ""
+        if line.startswith("--- ") and next_line.startswith("+++ "):
+            current = None
+        elif line.startswith(" ") or line in ("\n", "\r\n"):
+            current[1].append(line[1:] if line.startswith(" ") else line)
+            current[2].append(line[1:] if line.startswith(" ") else line)
+        elif line.startswith("-"):
+            current[1].append(line[1:])
+        elif line.startswith("+"):
+            current[2].append(line[1:])
+        elif not line.startswith("\\"):
+            # Prose or a closing code fence ends the hunk
+            current = None
+    # Blank lines after the last change are usually separators, not context
+    for _, old, new in hunks:
+        while old and new and old[-1] == new[-1] and not old[-1].strip():
+            old.pop()
+            new.pop()
+    return hunks
+
+
+def apply_unified_diff(source, hunks):
+    """
+    Apply unified diff hunks in order. A hunk whose lines appear more than
+    once is applied at the match closest to its line number.
+    """
+    lines = _lines(source)
+    offset = 0
+    for old_start, old, new in hunks:
+        hint = max(0, old_start - 1 + offset)
+        if not old:
+            _splice(lines, min(hint, len(lines)), 0, new)
+        else:
+            hits = _find(lines, old)
+            if not hits:
+                raise PatchError(f"hunk at line {old_start} does not match the file")
+            start = min(hits, key=lambda i: abs(i - hint))
+            _splice(lines, start, len(old), new)
+        offset += len(new) - len(old)
+    return "".join(lines)
+
+
+def apply_edit(source, response):
+    """Apply the search/replace blocks or unified diff in response to source."""
+    blocks = parse_blocks(response)
+    if blocks:
+        return apply_blocks(source, blocks)
+    hunks = parse_unified_diff(response)
+    if hunks:
+        return apply_unified_diff(source, hunks)
+    raise PatchError("no search/replace blocks or diff hunks in the response")
+
+
+def validate(path, original, edited):
+    """Reject an edit that breaks the syntax of a Python file that parsed before."""
+    if not path.endswith((".py", ".pyi")):
+        return
+    try:
+        ast.parse(original)
+    except (SyntaxError, ValueError):
+        return
+    try:
+        ast.parse(edited)
+    except (SyntaxError, ValueError) as e:
+        raise PatchError(f"edit breaks Python syntax: {e}")
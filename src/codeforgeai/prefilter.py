@@ -0,0 +1,55 @@
+import os
+import fnmatch
+
+BINARY_LABEL = "binary file"
+GENERATED_LABEL = "generated file"
+OVERSIZED_LABEL = "oversized file"
+
+GENERATED_PATTERNS = [
+    "*.min.js", "*.min.css", "*.map", "*.pb.go", "*_pb2.py", "*.lock",
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "npm-shrinkwrap.json",
+    "poetry.lock", "Pipfile.lock", "Cargo.lock", "composer.lock", "Gemfile.lock",
+    "go.sum", "uv.lock",
+]
+
+DEFAULTS = {
+    "prefilter_max_bytes": 256 * 1024,
+    "prefilter_sniff_bytes": 8192,
+    "prefilter_max_line_length": 1000,
+}
+
+
+def inspect_file(path, config=None):
+    """
+    Cheaply decide whether a file is worth sending to a model.
+
+    Returns None for ordinary text files, otherwise a short label: files over
+    prefilter_max_bytes are oversized, a NUL byte in the first
+    prefilter_sniff_bytes marks a binary file, and lockfiles, minified
+    bundles or lines longer than prefilter_max_line_length mark generated
+    files. Only the leading buffer is ever read.
+    """
+    config = config or {}
+    max_bytes = config.get("prefilter_max_bytes", DEFAULTS["prefilter_max_bytes"])
+    sniff_bytes = config.get("prefilter_sniff_bytes", DEFAULTS["prefilter_sniff_bytes"])
+    max_line = config.get("prefilter_max_line_length", DEFAULTS["prefilter_max_line_length"])
+
+    name = os.path.basename(path)
+    if any(fnmatch.fnmatch(name, pattern) for pattern in GENERATED_PATTERNS):
+        return GENERATED_LABEL
+    try:
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            head = f.read(sniff_bytes)
+    except OSError:
+        return None
+    if b"\0" in head:
+        return BINARY_LABEL
+    if max_bytes and size > max_bytes:
+        return OVERSIZED_LABEL
+    lines = head.split(b"\n")
+    # The last line of a truncated buffer may be cut short, but a single
+    # very long line is still the signature of minified or generated output
+    if max_line and any(len(line) > max_line for line in lines):
+        return GENERATED_LABEL
+    return None
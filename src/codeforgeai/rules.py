@@ -0,0 +1,107 @@
+import re
+import logging
+
+from codeforgeai.gitignore import compile_pattern
+
+USER_CODE = "user code file"
+PROJECT_CODE = "project code file"
+SOURCE_CONTROL = "source control file"
+
+# Patterns use .gitignore syntax; the first matching rule wins
+DEFAULT_RULES = [
+    {"pattern": ".gitignore", "class": SOURCE_CONTROL},
+    {"pattern": ".gitattributes", "class": SOURCE_CONTROL},
+    {"pattern": ".gitmodules", "class": SOURCE_CONTROL},
+    {"pattern": ".mailmap", "class": SOURCE_CONTROL},
+    {"pattern": ".git-blame-ignore-revs", "class": SOURCE_CONTROL},
+    {"pattern": "CODEOWNERS", "class": SOURCE_CONTROL},
+    {"pattern": ".hgignore", "class": SOURCE_CONTROL},
+    {"pattern": ".github/", "class": PROJECT_CODE},
+    {"pattern": ".gitlab-ci.yml", "class": PROJECT_CODE},
+    {"pattern": "/setup.py", "class": PROJECT_CODE},
+    {"pattern": "/setup.cfg", "class": PROJECT_CODE},
+    {"pattern": "/pyproject.toml", "class": PROJECT_CODE},
+    {"pattern": "/tox.ini", "class": PROJECT_CODE},
+    {"pattern": "/noxfile.py", "class": PROJECT_CODE},
+    {"pattern": "/MANIFEST.in", "class": PROJECT_CODE},
+    {"pattern": "requirements*.txt", "class": PROJECT_CODE},
+    {"pattern": "/Pipfile", "class": PROJECT_CODE},
+    {"pattern": ".coveragerc", "class": PROJECT_CODE},
+    {"pattern": ".readthedocs.y*ml", "class": PROJECT_CODE},
+    {"pattern": ".pre-commit-config.yaml", "class": PROJECT_CODE},
+    {"pattern": ".editorconfig", "class": PROJECT_CODE},
+    {"pattern": ".env.example", "class": PROJECT_CODE},
+    {"pattern": "/LICENSE*", "class": PROJECT_CODE},
+    {"pattern": "/COPYING*", "class": PROJECT_CODE},
+    {"pattern": "/AUTHORS*", "class": PROJECT_CODE},
+    {"pattern": "/CHANGELOG*", "class": PROJECT_CODE},
+    {"pattern": "/CONTRIBUTING*", "class": PROJECT_CODE},
+    {"pattern": "/CODE_OF_CONDUCT*", "class": PROJECT_CODE},
+    {"pattern": "/SECURITY*", "class": PROJECT_CODE},
+    {"pattern": "/README*", "class": PROJECT_CODE},
+    {"pattern": "docs/conf.py", "class": PROJECT_CODE},
+    {"pattern": "docs/Makefile", "class": PROJECT_CODE},
+    {"pattern": "docs/make.bat", "class": PROJECT_CODE},
+    {"pattern": "docs/requirements.txt", "class": PROJECT_CODE},
+    {"pattern": "docs/_static/", "class": PROJECT_CODE},
+    {"pattern": "/package.json", "class": PROJECT_CODE},
+    {"pattern": "/tsconfig*.json", "class": PROJECT_CODE},
+    {"pattern": "/Cargo.toml", "class": PROJECT_CODE},
+    {"pattern": "/go.mod", "class": PROJECT_CODE},
+    {"pattern": "/Dockerfile", "class": PROJECT_CODE},
+    {"pattern": "/docker-compose*.y*ml", "class": PROJECT_CODE},
+    {"pattern": "tests/conftest.py", "class": PROJECT_CODE},
+]
+
+
+class RuleClassifier:
+    """
+    Classify files from their path alone using a declarative rule table.
+
+    Rules are ``{"pattern": <gitignore-style pattern>, "class": <label>}``.
+    User rules from the ``classification_rules`` config key are checked before
+    the built-in table. Directory patterns (ending in ``/``) match every file
+    below that directory.
+    """
+
+    def __init__(self, rules):
+        self.rules = []
+        for rule in rules:
+            try:
+                compiled = compile_pattern(rule["pattern"])
+                label = rule["class"]
+            except (KeyError, TypeError, re.error) as e:
+                logging.error(f"Invalid classification rule {rule!r}: {e}")
+                continue
+            if compiled is None:
+                continue
+            regex, _negate, dir_only = compiled
+            self.rules.append((regex, dir_only, label))
+        self.any = re.compile(
+            "|".join(f"(?:{regex.pattern})" for regex, _, _ in self.rules), re.DOTALL
+        ) if self.rules else None
+
+    @classmethod
+    def from_config(cls, config):
+        user_rules = (config or {}).get("classification_rules") or []
+        return cls(list(user_rules) + DEFAULT_RULES)
+
+    def classify(self, path):
+        """Return the class of the first matching rule, or None."""
+        if self.any is None:
+            return None
+        path = path.replace("\\", "/")
+        if path.startswith("./"):
+            path = path[2:]
+        parts = path.split("/")
+        candidates = [("/".join(parts[:i]), True) for i in range(1, len(parts))]
+        candidates.append((path, False))
+        if not any(self.any.fullmatch(candidate) for candidate, _ in candidates):
+            return None
+        for regex, dir_only, label in self.rules:
+            for candidate, is_dir in candidates:
+                if dir_only and not is_dir:
+                    continue
+                if regex.fullmatch(candidate):
+                    return label
+        return None
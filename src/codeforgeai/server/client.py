@@ -0,0 +1,110 @@
+"""
+    Thin client for the CodeforgeAI daemon (see server.py). Kept free of
+    heavy imports so forwarding a command costs little more than starting
+    Python.
+"""
+
+import json
+import os
+import socket
+import sys
+
+# Commands the daemon runs. They talk to the model or read the working tree
+# only, and never read stdin or credentials; everything else (daemon,
+# config and the secret-ai, web3, zerepy, solana, vyper and github
+# integrations) always runs in the calling process.
+FORWARDED_COMMANDS = {
+    "analyze", "prompt", "explain", "extract", "format", "command", "edit",
+    "suggestion", "commit-message", "strip", "index",
+}
+# Environment variables the forwarded commands depend on; when the caller's
+# differ from the daemon's the command runs in the calling process instead
+FORWARDED_ENV = (
+    "HOME", "XDG_CONFIG_HOME", "OLLAMA_HOST",
+    "HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "NO_PROXY",
+    "http_proxy", "https_proxy", "all_proxy", "no_proxy",
+    "GIT_DIR", "GIT_WORK_TREE", "GIT_INDEX_FILE",
+)
+
+
+def environment():
+    """The values of FORWARDED_ENV in this process."""
+    return {name: os.environ.get(name) for name in FORWARDED_ENV}
+
+
+def socket_path(config=None):
+    return (config or {}).get("daemon_socket") or os.path.expanduser("~/.codeforgeai.sock")
+
+
+def _connect(path, timeout=None):
+    """Return a socket connected to the daemon, or None when it is not running."""
+    if not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def should_forward(argv):
+    if "--no-daemon" in argv:
+        return False
+    command = next((arg for arg in argv if not arg.startswith("-")), None)
+    if command not in FORWARDED_COMMANDS:
+        return False
+    # A feedback loop would hold the daemon's working directory indefinitely
+    if command == "analyze" and "--loop" in argv:
+        return False
+    return True
+
+
+def forward(argv, path):
+    """
+    Run argv in the daemon, replaying its output here. Returns the exit
+    code, or None when no daemon is listening, or it declines the request
+    (e.g. because its environment differs), and the caller should run the
+    command itself.
+    """
+    sock = _connect(path)
+    if sock is None:
+        return None
+    with sock:
+        request = {"argv": list(argv), "cwd": os.getcwd(), "env": environment()}
+        try:
+            sock.sendall(json.dumps(request).encode() + b"\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The daemon is shutting down and never saw the request
+            return None
+        try:
+            for line in sock.makefile("rb"):
+                message = json.loads(line)
+                if "out" in message:
+                    sys.stdout.write(message["out"])
+                    sys.stdout.flush()
+                elif "err" in message:
+                    sys.stderr.write(message["err"])
+                    sys.stderr.flush()
+                elif "exit" in message:
+                    return message["exit"]
+                elif "fallback" in message:
+                    return None
+        except KeyboardInterrupt:
+            # Closing the connection cancels the command in the daemon
+            return 130
+    print("Error: the CodeforgeAI daemon closed the connection", file=sys.stderr)
+    return 1
+
+
+def control(command, path, timeout=5):
+    """Send a control command ("status" or "stop"); returns the reply or None if not running."""
+    sock = _connect(path, timeout)
+    if sock is None:
+        return None
+    with sock:
+        sock.sendall(json.dumps({"control": command}).encode() + b"\n")
+        line = sock.makefile("rb").readline()
+    return json.loads(line) if line else None
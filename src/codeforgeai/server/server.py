@@ -0,0 +1,273 @@
+"""
+    Long-lived CodeforgeAI daemon.
+
+    The daemon listens on a Unix socket and runs forwarded ``codeforgeai``
+    invocations through :func:`codeforgeai.skeleton.main` in the same
+    process, so config, model clients, caches and imports stay warm between
+    calls. Start it with ``codeforgeai daemon start`` or
+    ``python -m codeforgeai.server.server``.
+
+    Protocol: the client sends one JSON line, either
+    ``{"argv": [...], "cwd": "...", "env": {...}}`` or
+    ``{"control": "status" | "stop"}``. The daemon answers with JSON lines:
+    ``{"out": text}`` and ``{"err": text}`` while the command runs, then
+    ``{"exit": code}``; or ``{"fallback": reason}`` when the client should
+    run the command itself.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import select
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+
+from codeforgeai.server.client import environment, socket_path
+
+_logger = logging.getLogger(__name__)
+
+
+# Where output of the request running in this context goes. Request threads
+# start with an empty context, and pool workers copy their request's.
+_sink = contextvars.ContextVar("codeforgeai_daemon_sink", default=None)
+
+
+class _RequestStream:
+    """
+    Stand-in for sys.stdout/sys.stderr that sends writes made for a request
+    to that request's client and everything else to the real stream.
+    """
+
+    def __init__(self, stream, channel):
+        self._stream = stream
+        self._channel = channel
+
+    def write(self, text):
+        sink = _sink.get()
+        if sink is None:
+            return self._stream.write(text)
+        sink(self._channel, text)
+        return len(text)
+
+    def flush(self):
+        if _sink.get() is None:
+            self._stream.flush()
+
+    def isatty(self):
+        return False if _sink.get() else self._stream.isatty()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class _WorkingDirectory:
+    """
+    The working directory is process-wide, so requests from the same
+    directory run concurrently. A request from another directory is not
+    queued behind them (a long analyze would hold up an interactive
+    explain); its client runs it in-process instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cwd = None
+        self._users = 0
+
+    def enter(self, cwd):
+        """Switch to cwd and return True, or return False while requests from another directory run."""
+        with self._lock:
+            if self._users and self._cwd != cwd:
+                return False
+            if self._cwd != cwd:
+                os.chdir(cwd)
+                self._cwd = cwd
+            self._users += 1
+            return True
+
+    def leave(self):
+        with self._lock:
+            self._users -= 1
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+        except ValueError:
+            return self._send({"err": "Error: malformed request\n"}, {"exit": 2})
+        control = request.get("control")
+        if control:
+            return self._control(control)
+        if "argv" in request:
+            if (request.get("env") or {}) != environment():
+                # Credentials, hosts and proxies could differ from the caller's
+                return self._send({"fallback": "environment differs from the daemon's"})
+            return self._run(request["argv"], request.get("cwd") or os.getcwd())
+        self._send({"err": "Error: empty request\n"}, {"exit": 2})
+
+    def _send(self, *messages):
+        for message in messages:
+            self.wfile.write(json.dumps(message).encode() + b"\n")
+        self.wfile.flush()
+
+    def _control(self, control):
+        daemon = self.server
+        if control == "status":
+            self._send({
+                "pid": os.getpid(),
+                "socket": daemon.server_address,
+                "uptime": time.time() - daemon.started,
+                "requests": daemon.requests,
+                "active": daemon.active,
+            })
+        elif control == "stop":
+            self._send({"stopping": True})
+            threading.Thread(target=daemon.shutdown, daemon=True).start()
+        else:
+            self._send({"err": f"Error: unknown control '{control}'\n"}, {"exit": 2})
+
+    def _watch(self, cancel, done):
+        """Set cancel when the client hangs up before the request is done, e.g. after Ctrl+C."""
+        while not done.is_set():
+            try:
+                ready, _, _ = select.select([self.connection], [], [], 0.5)
+                if not ready:
+                    continue
+                hung_up = not self.connection.recv(1, socket.MSG_PEEK)
+            except (OSError, ValueError):
+                hung_up = True
+            if hung_up and not done.is_set():
+                _logger.debug("Client disconnected; cancelling its request")
+                cancel.set()
+            return
+
+    def _run(self, argv, cwd):
+        from codeforgeai import skeleton
+        from codeforgeai.models import scheduler
+        from codeforgeai.models.errors import ModelError
+
+        daemon = self.server
+        lock = threading.Lock()
+        cancel, done = threading.Event(), threading.Event()
+
+        def sink(channel, text):
+            if cancel.is_set():
+                return
+            with lock:
+                try:
+                    self._send({channel: text})
+                except OSError:
+                    cancel.set()
+
+        try:
+            entered = daemon.cwd.enter(cwd)
+        except OSError as e:
+            return self._send({"err": f"Error: {e}\n"}, {"exit": 1})
+        if not entered:
+            return self._send({"fallback": "the daemon is busy in another directory"})
+
+        code = 0
+        daemon.begin()
+        token = _sink.set(sink)
+        threading.Thread(target=self._watch, args=(cancel, done), daemon=True).start()
+        try:
+            with scheduler.cancel_on(cancel):
+                skeleton.main(argv)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except ModelError as e:
+            sink("err", f"Error: {e}\n")
+            code = 1
+        except (BrokenPipeError, ConnectionResetError):
+            _logger.debug(f"Client disconnected during {argv}")
+            return
+        except Exception:
+            sink("err", traceback.format_exc())
+            code = 1
+        finally:
+            done.set()
+            _sink.reset(token)
+            daemon.cwd.leave()
+            daemon.end()
+        if cancel.is_set():
+            return
+        try:
+            self._send({"exit": code})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        self.started = time.time()
+        self.requests = 0
+        self.active = 0
+        self.cwd = _WorkingDirectory()
+        self._counter_lock = threading.Lock()
+        # Only the owner may talk to the daemon
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, _Handler)
+        finally:
+            os.umask(umask)
+
+    def begin(self):
+        with self._counter_lock:
+            self.requests += 1
+            self.active += 1
+
+    def end(self):
+        with self._counter_lock:
+            self.active -= 1
+
+
+def _remove_stale_socket(path):
+    """Remove a socket left by a daemon that died; raise if one is still listening."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.remove(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"A daemon is already listening on {path}")
+
+
+def serve(path=None):
+    """Serve forwarded requests on the Unix socket at path until stopped."""
+    if path is None:
+        from codeforgeai.config import get_config
+        path = socket_path(get_config())
+    _remove_stale_socket(path)
+
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout = _RequestStream(stdout, "out")
+    sys.stderr = _RequestStream(stderr, "err")
+
+    # Import the heavy modules once, before the first request
+    from codeforgeai import skeleton
+    skeleton.get_models()
+
+    server = DaemonServer(path)
+    _logger.info(f"CodeforgeAI daemon listening on {path} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.remove(path)
+        sys.stdout, sys.stderr = stdout, stderr
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -2,6 +2,10 @@ def pretty_print_json(data):
     import json
     print(json.dumps(data, indent=4))
 
+def print_token(piece):
+    """Print a piece of a streamed model response as soon as it arrives."""
+    print(piece, end="", flush=True)
+
 # ...other utility functions...
 
 # Secret AI SDK integration utilities
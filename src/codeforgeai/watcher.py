@@ -0,0 +1,224 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import logging
+import ctypes
+import ctypes.util
+
+from codeforgeai.gitignore import GitignoreMatcher
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_ATTRIB | IN_CREATE | IN_DELETE | IN_MOVED_FROM
+    | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _is_hidden(rel_path):
+    return any(part.startswith(".") for part in rel_path.split(os.sep))
+
+
+class PollingWatcher:
+    """
+    Portable watcher that compares stat snapshots every interval seconds.
+    Only sizes and mtimes are compared; nothing is hashed or re-read.
+    """
+
+    def __init__(self, root=".", interval=5):
+        self.root = os.path.abspath(root)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        from codeforgeai.directory import walk_directory
+
+        snapshot = {}
+        matcher = GitignoreMatcher(self.root)
+        for rel_path, node_type in walk_directory(self.root, matcher):
+            if node_type != "file":
+                continue
+            try:
+                st = os.stat(os.path.join(self.root, rel_path))
+            except OSError:
+                continue
+            snapshot[rel_path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def batches(self):
+        """Yield ``(changed, removed)`` sets of relative paths as they are detected."""
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._scan()
+            changed = {p for p, state in snapshot.items() if self._snapshot.get(p) != state}
+            removed = set(self._snapshot) - set(snapshot)
+            self._snapshot = snapshot
+            if changed or removed:
+                yield changed, removed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """
+    Linux watcher built on inotify. It blocks in select() while the tree is
+    idle and coalesces bursts of events until debounce seconds pass quietly.
+    A ``None`` batch asks the caller for a full rescan, which happens when the
+    kernel queue overflows or a .gitignore file changes.
+    """
+
+    def __init__(self, root=".", debounce=0.5):
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or not libc_name:
+            raise OSError(errno.ENOSYS, "inotify is not available on this platform")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.root = os.path.abspath(root)
+        self.debounce = debounce
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._watches = {}
+        self.matcher = GitignoreMatcher(self.root)
+        self._watch_tree("")
+
+    def _add_watch(self, rel_dir):
+        path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, "inotify watch limit reached (fs.inotify.max_user_watches)")
+            logging.debug(f"Watcher: Could not watch {path}: {os.strerror(err)}")
+            return
+        self._watches[wd] = rel_dir
+
+    def _unwatch_tree(self, rel_dir):
+        """Drop watches for a directory that was moved or deleted."""
+        prefix = rel_dir + os.sep
+        for wd, watched in list(self._watches.items()):
+            if watched == rel_dir or watched.startswith(prefix):
+                self._libc.inotify_rm_watch(self.fd, wd)
+                del self._watches[wd]
+
+    def _rewatch(self):
+        """Re-read the .gitignore files and rebuild every watch from scratch."""
+        for wd in list(self._watches):
+            self._libc.inotify_rm_watch(self.fd, wd)
+        self._watches.clear()
+        self.matcher = GitignoreMatcher(self.root)
+        self._watch_tree("")
+
+    def _watch_tree(self, rel_dir):
+        """Watch rel_dir and every non-ignored directory below it; return its files."""
+        from codeforgeai.directory import walk_directory
+
+        self._add_watch(rel_dir)
+        files = set()
+        for rel_path, node_type in walk_directory(self.root, self.matcher, start=rel_dir):
+            if node_type == "directory":
+                self._add_watch(rel_path)
+            elif node_type == "file":
+                files.add(rel_path)
+        return files
+
+    def _read_events(self):
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+            offset += length
+            yield wd, mask, name
+
+    def _collect(self, changed, removed):
+        """Fold pending events into changed/removed; return False when a rescan is needed."""
+        rescan = False
+        for wd, mask, name in self._read_events():
+            if mask & IN_Q_OVERFLOW:
+                rescan = True
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            rel_dir = self._watches.get(wd)
+            if rel_dir is None or not name:
+                continue
+            if name == ".gitignore":
+                rescan = True
+                continue
+            rel_path = os.path.join(rel_dir, name) if rel_dir else name
+            if _is_hidden(rel_path):
+                continue
+            is_dir = bool(mask & IN_ISDIR)
+            if self.matcher.is_ignored(rel_path, is_dir):
+                continue
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                if is_dir:
+                    self._unwatch_tree(rel_path)
+                removed.add(rel_path)
+                changed.discard(rel_path)
+            elif is_dir and mask & (IN_CREATE | IN_MOVED_TO):
+                changed.update(self._watch_tree(rel_path))
+                removed.discard(rel_path)
+            elif not is_dir:
+                changed.add(rel_path)
+                removed.discard(rel_path)
+        return not rescan
+
+    def batches(self):
+        """Yield ``(changed, removed)`` sets of relative paths, or None for a rescan."""
+        while True:
+            select.select([self.fd], [], [])
+            changed, removed = set(), set()
+            ok = self._collect(changed, removed)
+            # Debounce: keep folding events until the tree has been quiet for a while
+            while select.select([self.fd], [], [], self.debounce)[0]:
+                ok = self._collect(changed, removed) and ok
+            if not ok:
+                # Directories created during an overflow, or un-ignored, need watches too
+                self._rewatch()
+                yield None
+            elif changed or removed:
+                yield changed, removed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def create_watcher(root=".", config=None):
+    """Return an inotify watcher where supported, falling back to polling."""
+    config = config or {}
+    backend = config.get("watch_backend", "auto")
+    if backend in ("auto", "inotify"):
+        try:
+            return InotifyWatcher(root, config.get("watch_debounce", 0.5))
+        except OSError as e:
+            if backend == "inotify":
+                raise
+            logging.debug(f"Watcher: inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(root, config.get("analyze_interval", 5))
@@ -0,0 +1,95 @@
+"""
+    Fixtures for the benchmark suite: one fake Ollama server for the
+    session, an isolated HOME whose config points at it, and synthetic
+    repositories built once per size.
+
+    Benchmarks only run when CODEFORGE_BENCHMARKS=1 is set.
+"""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from codeforgeai.config import create_default_config
+
+from .fake_ollama import FakeOllama
+from .synthetic import commit_all, make_repo
+
+RESULTS = []
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("CODEFORGE_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="set CODEFORGE_BENCHMARKS=1 to run benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not RESULTS:
+        return
+    terminalreporter.section("codeforgeai benchmarks")
+    terminalreporter.write_line(
+        f"{'scenario':<22} {'wall s':>8} {'calls':>6} {'read MiB':>9} {'peak RSS MiB':>13}"
+    )
+    for name, result in RESULTS:
+        read = "-" if result["bytes_read"] is None else f"{result['bytes_read'] / 2 ** 20:.1f}"
+        terminalreporter.write_line(
+            f"{name:<22} {result['wall_time']:>8.2f} {result['model_calls']:>6} "
+            f"{read:>9} {result['peak_rss'] / 2 ** 20:>13.1f}"
+        )
+
+
+@pytest.fixture(scope="session")
+def fake_ollama():
+    server = FakeOllama().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def bench_home(tmp_path_factory, fake_ollama):
+    home = tmp_path_factory.mktemp("home")
+    config_path = str(home / ".codeforgeai.json")
+    create_default_config(config_path)
+    with open(config_path) as f:
+        config = json.load(f)
+    config.update(
+        ollama_host=fake_ollama.url,
+        response_cache=False,
+        model_retry_base_delay=0.01,
+        model_retry_max_delay=0.05,
+    )
+    with open(config_path, "w") as f:
+        json.dump(config, f, indent=4)
+    return str(home)
+
+
+@pytest.fixture(scope="session")
+def synthetic_repo(tmp_path_factory):
+    repos = {}
+
+    def get(n_files):
+        if n_files not in repos:
+            repos[n_files] = make_repo(str(tmp_path_factory.mktemp(f"repo{n_files}")), n_files)
+        return repos[n_files]
+
+    return get
+
+
+@pytest.fixture
+def commit_repo(tmp_path):
+    """A committed repository with a few staged modifications."""
+    root = make_repo(str(tmp_path / "repo"), 20)
+    commit_all(root)
+    package = os.path.join(root, "src", "pkg0")
+    for name in sorted(os.listdir(package))[:3]:
+        if name.endswith(".py"):
+            with open(os.path.join(package, name), "a") as f:
+                f.write("\n\ndef added(arg):\n    return arg + 1\n")
+    shutil.rmtree(os.path.join(root, "build"))
+    return root
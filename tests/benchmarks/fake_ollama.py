@@ -0,0 +1,155 @@
+"""
+    A stand-in for the Ollama HTTP API, good enough for benchmarks.
+
+    It answers ``/api/chat`` (plain, streamed, ``format="json"`` and
+    search/replace edits) and ``/api/tags`` with canned replies, sleeping
+    ``latency`` seconds per request plus the time ``tokens_per_second``
+    implies for the reply, and returning HTTP 503 for a ``failure_rate``
+    share of chat requests. The
+    timing fields of every response are filled in like a real server would.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MODEL_DIGEST = "sha256:" + "0" * 64
+_PATHS = re.compile(r"^File path: (\S+)", re.MULTILINE)
+
+
+class FakeOllama:
+    def __init__(self, latency=0.005, tokens_per_second=2000.0, failure_rate=0.0,
+                 load_duration=0.0, reply_tokens=24, seed=0):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.failure_rate = failure_rate
+        self.load_duration = load_duration
+        self.reply_tokens = reply_tokens
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.failures = 0
+            self.bytes_received = 0
+
+    def configure(self, **settings):
+        for key, value in settings.items():
+            if not hasattr(self, key):
+                raise AttributeError(key)
+            setattr(self, key, value)
+
+    def _should_fail(self):
+        with self._lock:
+            self.calls += 1
+            fail = self._random.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+            return fail
+
+    def reply(self, prompt, format=None):
+        """Return the text a model would answer for prompt."""
+        if format == "json" and "JSON array" in prompt.split("\n", 1)[0]:
+            return "[0]"
+        if format == "json":
+            return json.dumps({path: "user code file" for path in _PATHS.findall(prompt)})
+        if "classif" in prompt.split("\n", 1)[0]:
+            return "user code file"
+        if "<<<<<<< SEARCH" in prompt:
+            # Edit the first line of the file with a search/replace block
+            match = _PATHS.search(prompt)
+            lines = [line for line in prompt[match.end():].splitlines()[1:] if line.strip()] if match else []
+            if lines:
+                return f"```\n<<<<<<< SEARCH\n{lines[0]}\n=======\n{lines[0]}\n# edited\n>>>>>>> REPLACE\n```"
+        words = " ".join(["token"] * max(1, self.reply_tokens - 4))
+        return f"Reply sentence. ```python\n# {words}\n```"
+
+    def _timings(self, prompt, text):
+        prompt_tokens = max(1, len(prompt) // 4)
+        eval_count = max(1, len(text) // 4)
+        eval_seconds = eval_count / self.tokens_per_second if self.tokens_per_second else 0.0
+        return {
+            "total_duration": int((self.latency + eval_seconds + self.load_duration) * 1e9),
+            "load_duration": int(self.load_duration * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(self.latency * 1e9),
+            "eval_count": eval_count,
+            "eval_duration": int(eval_seconds * 1e9),
+        }, eval_seconds
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, content_type="application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path != "/api/tags":
+                    return self._send(404, b'{"error": "not found"}')
+                models = [{"name": "fake", "model": "fake", "digest": MODEL_DIGEST, "size": 1,
+                           "modified_at": datetime.now(timezone.utc).isoformat()}]
+                self._send(200, json.dumps({"models": models}).encode())
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length)
+                with fake._lock:
+                    fake.bytes_received += length
+                if self.path != "/api/chat":
+                    return self._send(404, b'{"error": "not found"}')
+                request = json.loads(raw)
+                if fake._should_fail():
+                    time.sleep(fake.latency)
+                    return self._send(503, b'{"error": "server busy, please try again"}')
+
+                prompt = request["messages"][-1]["content"]
+                text = fake.reply(prompt, request.get("format"))
+                timings, eval_seconds = fake._timings(prompt, text)
+                time.sleep(fake.latency + fake.load_duration + eval_seconds)
+                base = {"model": request["model"], "created_at": datetime.now(timezone.utc).isoformat()}
+                if request.get("stream", True):
+                    # Split the reply into a few chunks, the last carrying the timings
+                    pieces = [text[i:i + 16] for i in range(0, len(text), 16)] or [""]
+                    lines = [dict(base, message={"role": "assistant", "content": piece}, done=False)
+                             for piece in pieces[:-1]]
+                    lines.append(dict(base, **timings, message={"role": "assistant", "content": pieces[-1]},
+                                      done=True, done_reason="stop"))
+                    body = b"".join(json.dumps(line).encode() + b"\n" for line in lines)
+                    return self._send(200, body, "application/x-ndjson")
+                message = {"role": "assistant", "content": text}
+                self._send(200, json.dumps(dict(base, **timings, message=message, done=True,
+                                                done_reason="stop")).encode())
+
+        return Handler
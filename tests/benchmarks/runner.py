@@ -0,0 +1,108 @@
+"""
+    Runs one benchmark scenario in a fresh interpreter and prints its
+    measurements as a JSON line. Running each scenario in its own process
+    keeps peak RSS, bytes read and module-level caches independent.
+
+    Usage: python runner.py <scenario> <repo> [target]
+"""
+
+import glob
+import json
+import os
+import resource
+import sys
+import time
+
+
+def _bytes_read():
+    """Bytes read through read() syscalls so far, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _clear_index():
+    for path in glob.glob(".codeforge.*"):
+        os.remove(path)
+
+
+def _import_models():
+    # The CLI imports the model clients on first use; load them during setup
+    from codeforgeai.models import code_model, general_model  # noqa: F401
+
+
+def _analyze(target):
+    from codeforgeai.directory import analyze_directory
+    _import_models()
+    _clear_index()
+    return analyze_directory
+
+
+def _reanalyze(target):
+    # Keeps the index of the previous run, so unchanged files are skipped
+    from codeforgeai.directory import analyze_directory
+    _import_models()
+    return analyze_directory
+
+
+def _strip(target):
+    from codeforgeai.directory import strip_directory
+    return lambda: strip_directory(return_data=True)
+
+
+def _explain(target):
+    from codeforgeai.engine import Engine
+    engine = Engine()
+    return lambda: engine.explain_code(target)
+
+
+def _edit(target):
+    from codeforgeai import commands
+    from codeforgeai.engine import Engine  # noqa: F401
+    from codeforgeai.skeleton import main
+    _import_models()
+    commands.load("edit")
+    return lambda: main(["edit", target, "--user_prompt", "add", "type", "hints"])
+
+
+def _commit_message(target):
+    from codeforgeai.engine import Engine
+    engine = Engine()
+    return engine.process_commit_message
+
+
+SCENARIOS = {
+    "analyze": _analyze,
+    "reanalyze": _reanalyze,
+    "strip": _strip,
+    "explain": _explain,
+    "edit": _edit,
+    "commit-message": _commit_message,
+}
+
+
+def run(scenario, repo, target=None):
+    os.chdir(repo)
+    # Imports and setup are not measured
+    action = SCENARIOS[scenario](target)
+    read_before = _bytes_read()
+    started = time.perf_counter()
+    action()
+    wall_time = time.perf_counter() - started
+    read_after = _bytes_read()
+    return {
+        "wall_time": wall_time,
+        "bytes_read": None if read_before is None else read_after - read_before,
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024),
+    }
+
+
+if __name__ == "__main__":
+    result = run(*sys.argv[1:])
+    sys.stdout.write("\n" + json.dumps(result) + "\n")
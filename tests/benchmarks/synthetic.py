@@ -0,0 +1,102 @@
+"""
+    Deterministic synthetic repositories for the benchmarks.
+
+    The mix roughly follows a real Python project: mostly small modules,
+    some medium and a few large ones (large enough to be chunked), docs,
+    data files, a few binaries, and a gitignored build directory that must
+    never be read.
+"""
+
+import os
+import random
+import subprocess
+
+# (share of files, kind)
+MIX = [
+    (0.70, "small"),
+    (0.15, "medium"),
+    (0.05, "large"),
+    (0.05, "doc"),
+    (0.03, "data"),
+    (0.02, "binary"),
+]
+FILES_PER_DIR = 50
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Bench", "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_NAME": "Bench", "GIT_COMMITTER_EMAIL": "bench@example.com",
+}
+
+
+def python_source(rng, target_bytes):
+    parts = ['"""Synthetic module."""\n\nimport os\n\n']
+    size = len(parts[0])
+    n = 0
+    while size < target_bytes:
+        name = f"func_{n}_{rng.randrange(10 ** 6)}"
+        body = "\n".join(f"    value_{i} = {rng.randrange(1000)} * 2" for i in range(rng.randrange(3, 12)))
+        block = f"def {name}(arg):\n    \"\"\"Compute {name}.\"\"\"\n{body}\n    return arg\n\n\n"
+        parts.append(block)
+        size += len(block)
+        n += 1
+    return "".join(parts)
+
+
+def _kinds(n_files):
+    kinds = []
+    for share, kind in MIX:
+        kinds += [kind] * int(round(share * n_files))
+    kinds = (kinds + ["small"] * n_files)[:n_files]
+    random.Random(n_files).shuffle(kinds)
+    return kinds
+
+
+def make_repo(root, n_files, seed=0):
+    """Create a repository of n_files tracked files under root and return root."""
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, ".gitignore"), "w") as f:
+        f.write("build/\n*.log\n.codeforge.*\n")
+    with open(os.path.join(root, "README.md"), "w") as f:
+        f.write("# Synthetic project\n\nA generated project used to benchmark codeforgeai.\n")
+    with open(os.path.join(root, "setup.py"), "w") as f:
+        f.write("from setuptools import setup\n\nsetup(name='synthetic')\n")
+
+    for i, kind in enumerate(_kinds(n_files)):
+        directory = os.path.join(root, "src", f"pkg{i // FILES_PER_DIR}")
+        os.makedirs(directory, exist_ok=True)
+        if kind == "small":
+            path, data = f"mod{i}.py", python_source(rng, rng.randrange(200, 1500))
+        elif kind == "medium":
+            path, data = f"mod{i}.py", python_source(rng, rng.randrange(3000, 8000))
+        elif kind == "large":
+            path, data = f"mod{i}.py", python_source(rng, rng.randrange(15000, 30000))
+        elif kind == "doc":
+            path, data = f"notes{i}.md", "# Notes\n\n" + "Some documentation text.\n" * rng.randrange(5, 50)
+        elif kind == "data":
+            path, data = f"data{i}.json", '{"values": [%s]}\n' % ", ".join(str(rng.randrange(100)) for _ in range(50))
+        else:
+            path, data = f"image{i}.png", None
+        full_path = os.path.join(directory, path)
+        if data is None:
+            with open(full_path, "wb") as f:
+                f.write(b"\x89PNG\r\n\x1a\n\0" + bytes(rng.randrange(256) for _ in range(512)))
+        else:
+            with open(full_path, "w") as f:
+                f.write(data)
+
+    # Ignored output that the walker must skip without reading
+    build = os.path.join(root, "build")
+    os.makedirs(build, exist_ok=True)
+    for i in range(max(10, n_files // 10)):
+        with open(os.path.join(build, f"out{i}.py"), "w") as f:
+            f.write("# generated\n")
+
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    return root
+
+
+def commit_all(root, message="Initial commit"):
+    env = dict(os.environ, **GIT_ENV)
+    subprocess.run(["git", "add", "-A"], cwd=root, check=True, env=env)
+    subprocess.run(["git", "commit", "-q", "-m", message], cwd=root, check=True, env=env)
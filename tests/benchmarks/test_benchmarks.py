@@ -0,0 +1,124 @@
+"""
+    End-to-end benchmarks against the fake Ollama server.
+
+    Each scenario runs in its own interpreter (see runner.py) and reports
+    wall time, model calls, bytes read and peak RSS. Results are compared
+    with baseline.json and the test fails when a metric regresses past its
+    tolerance. Set CODEFORGE_BENCH_UPDATE=1 to rewrite the baseline, and
+    CODEFORGE_BENCH_TOLERANCE to scale the allowed wall-time ratio on slow
+    machines.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from .conftest import RESULTS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+SRC = os.path.join(os.path.dirname(os.path.dirname(HERE)), "src")
+
+# metric: (allowed ratio over baseline, absolute slack)
+TOLERANCES = {
+    "wall_time": (1.5, 1.0),
+    "model_calls": (1.05, 2),
+    "bytes_read": (1.5, 1 << 20),
+    "peak_rss": (1.3, 16 << 20),
+}
+
+# name: (runner scenario, repository size, target inside the repo, fake server settings, warm-up scenario)
+SCENARIOS = {
+    "analyze-100": ("analyze", 100, None, {}, None),
+    "analyze-1k": ("analyze", 1000, None, {}, None),
+    "analyze-10k": ("analyze", 10000, None, {}, None),
+    "analyze-1k-warm": ("reanalyze", 1000, None, {}, "analyze"),
+    "analyze-1k-flaky": ("analyze", 1000, None, {"failure_rate": 0.05}, None),
+    "explain-large": ("explain", 100, "largest", {}, None),
+    "edit-50": ("edit", 100, "src/pkg0", {}, None),
+    "edit-large": ("edit", 100, "largest", {}, None),
+    "strip-10k": ("strip", 10000, None, {}, None),
+    "commit-message": ("commit-message", None, None, {}, None),
+}
+
+
+def _load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH) as f:
+        return json.load(f)
+
+
+def _largest_file(repo):
+    sizes = []
+    for root, dirs, files in os.walk(os.path.join(repo, "src")):
+        for name in files:
+            if name.endswith(".py"):
+                path = os.path.join(root, name)
+                sizes.append((os.path.getsize(path), path))
+    return max(sizes)[1]
+
+
+def run_scenario(scenario, repo, target, home):
+    env = dict(os.environ, HOME=home)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC, env.get("PYTHONPATH")]))
+    args = [sys.executable, os.path.join(HERE, "runner.py"), scenario, repo]
+    if target:
+        args.append(target)
+    completed = subprocess.run(args, env=env, capture_output=True, text=True, timeout=1800)
+    assert completed.returncode == 0, completed.stderr[-4000:]
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def check_regressions(result, baseline):
+    tolerance_scale = float(os.environ.get("CODEFORGE_BENCH_TOLERANCE", "1"))
+    failures = []
+    for metric, (ratio, slack) in TOLERANCES.items():
+        expected, actual = baseline.get(metric), result.get(metric)
+        if expected is None or actual is None:
+            continue
+        if metric == "wall_time":
+            ratio *= tolerance_scale
+        limit = expected * ratio + slack
+        if actual > limit:
+            failures.append(f"{metric}: {actual} > {limit:.0f} (baseline {expected})")
+    return failures
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_benchmark(name, fake_ollama, bench_home, synthetic_repo, request):
+    scenario, size, target, server_settings, warm_up = SCENARIOS[name]
+    repo = request.getfixturevalue("commit_repo") if size is None else synthetic_repo(size)
+    if target == "largest":
+        target = _largest_file(repo)
+    elif target:
+        target = os.path.join(repo, target)
+
+    if warm_up:
+        run_scenario(warm_up, repo, target, bench_home)
+
+    defaults = {"failure_rate": 0.0}
+    fake_ollama.configure(**dict(defaults, **server_settings))
+    fake_ollama.reset()
+    try:
+        result = run_scenario(scenario, repo, target, bench_home)
+    finally:
+        fake_ollama.configure(**defaults)
+    result["model_calls"] = fake_ollama.calls
+    RESULTS.append((name, result))
+
+    baseline = _load_baseline()
+    if os.environ.get("CODEFORGE_BENCH_UPDATE") == "1":
+        baseline[name] = result
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+            f.write("\n")
+        return
+    if name not in baseline:
+        pytest.skip(f"no baseline for {name}; run with CODEFORGE_BENCH_UPDATE=1")
+    failures = check_regressions(result, baseline[name])
+    assert not failures, f"{name} regressed: " + "; ".join(failures)
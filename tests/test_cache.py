@@ -0,0 +1,116 @@
+import contextvars
+
+from codeforgeai import cache
+from codeforgeai.cache import ResponseCache
+
+
+def _cache(tmp_path, **kwargs):
+    return ResponseCache(str(tmp_path), **kwargs)
+
+
+def test_entries_expire_after_their_ttl(tmp_path, clock):
+    store = _cache(tmp_path, ttl={"default": 60})
+    store.put("k", "m", "answer")
+    clock.now += 59
+    assert store.get("k") == "answer"
+    clock.now += 2
+    assert store.get("k") is None
+    assert (store.hits, store.misses) == (1, 1)
+
+
+def test_ttl_depends_on_the_command(tmp_path, clock):
+    store = _cache(tmp_path, ttl={"default": 60, "analyze": 600})
+    store.put("short", "m", "a", command="explain")
+    store.put("long", "m", "b", command="analyze")
+    clock.now += 120
+    assert store.get("short") is None
+    assert store.get("long") == "b"
+
+
+def test_zero_ttl_is_never_stored(tmp_path, clock):
+    store = _cache(tmp_path)
+    store.put("k", "m", "message", command="commit-message")
+    assert store.get("k") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    store = _cache(tmp_path, max_bytes=10)
+    store.put("a", "m", "aaaa")
+    clock.now += 1
+    store.put("b", "m", "bbbb")
+    clock.now += 1
+    assert store.get("a") == "aaaa"
+    clock.now += 1
+    store.put("c", "m", "cccc")
+    assert store.get("b") is None
+    assert store.get("a") == "aaaa"
+    assert store.get("c") == "cccc"
+
+
+def test_expired_entries_are_evicted_before_live_ones(tmp_path, clock):
+    store = _cache(tmp_path, max_bytes=10, ttl={"default": 60, "analyze": 600})
+    store.put("old", "m", "aaaa", command="analyze")
+    clock.now += 1
+    store.put("stale", "m", "bbbb")
+    clock.now += 61
+    store.put("new", "m", "cccc", command="analyze")
+    assert store.get("old") == "aaaa"
+    assert store.get("new") == "cccc"
+
+
+def test_entries_survive_reopening(tmp_path, clock):
+    _cache(tmp_path).put("k", "m", "answer")
+    assert _cache(tmp_path).get("k") == "answer"
+
+
+def test_cached_chat_calls_the_model_once(tmp_path, monkeypatch, clock):
+    monkeypatch.setattr(cache, "_caches", {})
+    monkeypatch.setattr(cache, "model_digest", lambda model_name, config=None: "digest")
+    config = {"response_cache": True, "response_cache_dir": str(tmp_path)}
+    calls = []
+
+    def send():
+        calls.append(1)
+        return "answer"
+
+    def run(enabled):
+        cache.configure("explain", enabled)
+        return cache.cached_chat("m", "prompt", config, send)
+
+    assert contextvars.copy_context().run(run, True) == "answer"
+    assert contextvars.copy_context().run(run, True) == "answer"
+    assert len(calls) == 1
+    # --no-cache bypasses the stored answer
+    contextvars.copy_context().run(run, False)
+    assert len(calls) == 2
+
+
+class FakeServer:
+    """Answers ollama's list() with one model whose digest the test can change."""
+
+    def __init__(self, digest):
+        self.digest = digest
+        self.calls = 0
+
+    def list(self):
+        from types import SimpleNamespace
+        self.calls += 1
+        return SimpleNamespace(models=[SimpleNamespace(model="m:latest", digest=self.digest)])
+
+
+def test_re_pulled_model_gets_new_keys(monkeypatch, clock):
+    from codeforgeai.models import client
+    servers = {"http://a": FakeServer("old"), "http://b": FakeServer("other")}
+    monkeypatch.setattr(cache, "_digests", {})
+    monkeypatch.setattr(client, "get_client", lambda config=None: servers[config["ollama_host"]])
+    config = {"ollama_host": "http://a"}
+
+    before = ResponseCache.key("m", "prompt", config)
+    assert cache.model_digest("m", {"ollama_host": "http://b"}) == "other"
+    servers["http://a"].digest = "new"
+    # Within DIGEST_TTL the digest is not read again
+    assert ResponseCache.key("m", "prompt", config) == before
+    assert servers["http://a"].calls == 1
+    clock.now += cache.DIGEST_TTL
+    assert cache.model_digest("m", config) == "new"
+    assert ResponseCache.key("m", "prompt", config) != before
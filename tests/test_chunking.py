@@ -0,0 +1,38 @@
+import tracemalloc
+
+from codeforgeai.chunking import Chunk, map_reduce
+
+CHUNK_CHARS = 100_000
+N_CHUNKS = 200
+
+
+def _chunks():
+    # Built lazily, as iter_chunks does when streaming a large file
+    for i in range(N_CHUNKS):
+        yield Chunk(i + 1, i + 1, "x" * CHUNK_CHARS)
+
+
+def test_map_reduce_holds_a_bounded_number_of_chunks():
+    concurrency = 2
+    tracemalloc.start()
+    try:
+        result = map_reduce(lambda prompt: "ok", _chunks(), "map", "reduce",
+                            concurrency=concurrency, combine=lambda parts: str(len(parts)))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert result == str(N_CHUNKS)
+    # Chunks in flight plus the prompts built from them; the whole input is 20 MB
+    assert peak < 8 * concurrency * CHUNK_CHARS * 2
+
+
+def test_map_reduce_reduces_partials_with_their_line_ranges():
+    chunks = [Chunk(1, 10, "a"), Chunk(11, 20, "b")]
+    prompts = []
+
+    def send(prompt):
+        prompts.append(prompt)
+        return "summary" if prompt.startswith("reduce") else prompt.rsplit("\n", 1)[-1].upper()
+
+    assert map_reduce(send, chunks, "map", "reduce") == "summary"
+    assert "Lines 1-10:\nA" in prompts[-1] and "Lines 11-20:\nB" in prompts[-1]
@@ -0,0 +1,29 @@
+from codeforgeai.directory import classify_into_index, plan_batches
+
+
+class FakeIndex:
+    def __init__(self):
+        self.removed, self.stored = [], []
+
+    def remove_files(self, paths):
+        self.removed.extend(paths)
+
+    def upsert_file(self, path, classification, state):
+        self.stored.append(path)
+
+    def commit(self):
+        pass
+
+
+def test_plan_batches_skips_vanished_files(tmp_path):
+    present = tmp_path / "a.py"
+    present.write_text("x = 1\n")
+    assert plan_batches([str(present), str(tmp_path / "gone.py")], 100, 4) == [[str(present)]]
+
+
+def test_classify_into_index_drops_vanished_files(tmp_path):
+    index = FakeIndex()
+    gone = str(tmp_path / "gone.py")
+    classify_into_index(index, [gone], {"code_model": "test"})
+    assert index.removed == [gone]
+    assert index.stored == []
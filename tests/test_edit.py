@@ -0,0 +1,179 @@
+import pytest
+
+from codeforgeai.commands.edit import _edit_file, _edit_text
+from codeforgeai.patch import PatchError
+
+SOURCE = "".join(
+    f"def func_{i}(arg):\n    \"\"\"Compute func_{i}.\"\"\"\n    value = arg * {i}\n    return value\n\n\n"
+    for i in range(20)
+) + "def load(path):\n    return open(path).read()\n"
+
+
+class FakeModel:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def send_request(self, prompt, config=None, format=None):
+        self.prompts.append(prompt)
+        return self.responses.pop(0)
+
+
+class FakeEngine:
+    def __init__(self, code_model, general_model=None):
+        self.code_model = code_model
+        self.general_model = general_model
+
+
+def test_unfenced_rewrite_is_used():
+    text = "def f():\n    return 1\n"
+    eng = FakeEngine(FakeModel("no edit blocks here", "def f():\n    return 2"))
+    edited, _, fell_back = _edit_text(eng, "f.py", text, "return 2", {})
+    assert fell_back
+    assert edited == "def f():\n    return 2\n"
+
+
+@pytest.mark.parametrize("rewrite", ["", "```python\n```", "x = 1"])
+def test_truncated_rewrite_is_rejected(rewrite):
+    eng = FakeEngine(FakeModel("no edit blocks here", rewrite))
+    with pytest.raises(PatchError):
+        _edit_text(eng, "mod.py", SOURCE, "fix load", {})
+
+
+def test_truncated_slice_rewrite_saves_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "mod.py").write_text(SOURCE)
+    eng = FakeEngine(FakeModel("no edit blocks here", "Sorry, I cannot help with that."))
+    with pytest.raises(PatchError):
+        _edit_file(eng, "mod.py", "fix load", {"edit_slice_chars": 300})
+    assert not (tmp_path / "mod.py.codeforgedit").exists()
+    assert (tmp_path / "mod.py").read_text() == SOURCE
+
+
+CALLER = "def main(path):\n    data = load(path)\n    return data\n\n\n"
+
+
+def _sliced(source, chars=300):
+    from codeforgeai.commands.edit import _slices
+    return _slices("mod.py", source, chars)
+
+
+def test_selection_includes_slices_using_the_named_symbol():
+    from codeforgeai.commands.edit import _select_slices
+    slices = _sliced(CALLER + SOURCE)
+    picked, _ = _select_slices(FakeEngine(FakeModel()), "mod.py", slices, "rename load to read", {})
+    texts = [slices[i].text for i in picked]
+    assert any("def load" in text for text in texts)
+    assert any("data = load(path)" in text for text in texts)
+    assert len(picked) < len(slices)
+
+
+def test_generic_words_do_not_select_slices():
+    from codeforgeai.commands.edit import _select_slices
+    slices = _sliced("def add(a, b):\n    return a + b\n\n\n" + SOURCE)
+    general = FakeModel("[3]")
+    picked, _ = _select_slices(FakeEngine(FakeModel(), general), "mod.py", slices, "add type hints", {})
+    assert general.prompts, "the general model should choose the slices"
+    assert picked == [3]
+
+
+class DownModel:
+    def __init__(self, error):
+        self.error = error
+
+    def send_request(self, prompt, config=None, format=None):
+        raise self.error
+
+
+def _model_errors():
+    from codeforgeai.models.errors import CircuitOpenError, ModelNotFoundError, ModelUnavailableError
+    return [
+        CircuitOpenError("circuit open"),
+        ModelNotFoundError("model 'missing' not found", "missing"),
+        ModelUnavailableError("server error (503)"),
+    ]
+
+
+@pytest.mark.parametrize("error", _model_errors(), ids=lambda e: type(e).__name__)
+def test_model_errors_reach_the_entry_point(tmp_path, monkeypatch, error):
+    (tmp_path / "other.py").write_text("def g():\n    return 1\n")
+    model = DownModel(error)
+    with pytest.raises(type(error)):
+        _run_edit(tmp_path, monkeypatch, model, paths=["mod.py", "other.py"])
+
+
+def test_patch_errors_skip_the_file(tmp_path, monkeypatch, capsys):
+    _run_edit(tmp_path, monkeypatch, FakeModel("no edit blocks here", "x"))
+    assert "Edited code saved" not in capsys.readouterr().out
+    assert not (tmp_path / "mod.py.codeforgedit").exists()
+
+
+class MeteredModel(FakeModel):
+    def send_request(self, prompt, config=None, format=None):
+        from types import SimpleNamespace
+        from codeforgeai.metrics import current_registry
+        current_registry().record(SimpleNamespace(eval_count=7), "test")
+        return super().send_request(prompt, config, format)
+
+
+def _run_edit(tmp_path, monkeypatch, model, paths=("mod.py",)):
+    import argparse
+    import codeforgeai.engine
+    from codeforgeai.commands import edit
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "mod.py").write_text("def f():\n    return 1\n")
+    monkeypatch.setattr(edit, "get_config", lambda: {})
+    monkeypatch.setattr(codeforgeai.engine, "Engine", lambda: FakeEngine(model))
+    edit.run(argparse.Namespace(paths=list(paths), user_prompt=["return 2"], allow_ignore=False))
+
+
+BLOCK = "<<<<<<< SEARCH\n    return 1\n=======\n    return 2\n>>>>>>> REPLACE\n"
+
+
+def test_summary_reports_measured_tokens(tmp_path, monkeypatch, capsys):
+    from codeforgeai import metrics
+    with metrics.collect("edit"):
+        _run_edit(tmp_path, monkeypatch, MeteredModel(BLOCK))
+    assert "Generated 7 tokens for 1 files" in capsys.readouterr().out
+
+
+def test_summary_labels_estimates_without_token_counts(tmp_path, monkeypatch, capsys):
+    _run_edit(tmp_path, monkeypatch, FakeModel(BLOCK))
+    assert "Generated an estimated" in capsys.readouterr().out
+
+
+class CountingModel:
+    """Appends a comment to whatever it is asked to edit, counting requests in flight."""
+
+    def __init__(self):
+        import threading
+        self.lock = threading.Lock()
+        self.active = self.peak = 0
+
+    def send_request(self, prompt, config=None, format=None):
+        import time
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+        return "<<<<<<< SEARCH\n=======\n# edited\n>>>>>>> REPLACE\n"
+
+
+def test_slices_share_the_edit_concurrency(tmp_path, monkeypatch):
+    import argparse
+    import codeforgeai.engine
+    from codeforgeai.commands import edit
+
+    monkeypatch.chdir(tmp_path)
+    for name in "abcd":
+        (tmp_path / f"{name}.py").write_text(SOURCE)
+    model = CountingModel()
+    monkeypatch.setattr(edit, "get_config", lambda: {"edit_concurrency": 4, "edit_slice_chars": 300})
+    monkeypatch.setattr(codeforgeai.engine, "Engine", lambda: FakeEngine(model))
+    prompt = [f"func_{i}" for i in range(0, 20, 2)]
+    edit.run(argparse.Namespace(paths=["."], user_prompt=prompt, allow_ignore=False))
+    assert (tmp_path / "a.py.codeforgedit").exists()
+    assert model.peak <= 4
@@ -0,0 +1,88 @@
+import pytest
+
+from codeforgeai.gitignore import GitignoreMatcher
+
+
+def _matcher(tmp_path, *lines, nested=None):
+    (tmp_path / ".gitignore").write_text("\n".join(lines) + "\n")
+    for rel_dir, patterns in (nested or {}).items():
+        (tmp_path / rel_dir).mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel_dir / ".gitignore").write_text("\n".join(patterns) + "\n")
+    return GitignoreMatcher(tmp_path)
+
+
+def test_negation_re_includes_a_file(tmp_path):
+    matcher = _matcher(tmp_path, "*.log", "!keep.log")
+    assert matcher.is_ignored("debug.log", False)
+    assert matcher.is_ignored("sub/debug.log", False)
+    assert not matcher.is_ignored("keep.log", False)
+    assert not matcher.is_ignored("sub/keep.log", False)
+
+
+def test_negation_cannot_re_include_inside_an_ignored_directory(tmp_path):
+    matcher = _matcher(tmp_path, "build/", "!build/keep.txt")
+    assert matcher.is_ignored("build", True)
+    assert matcher.is_ignored("build/keep.txt", False)
+
+
+def test_last_matching_rule_wins(tmp_path):
+    matcher = _matcher(tmp_path, "!important.txt", "*.txt")
+    assert matcher.is_ignored("important.txt", False)
+
+
+def test_nested_gitignore_overrides_its_parent(tmp_path):
+    matcher = _matcher(tmp_path, "*.tmp", nested={"pkg": ["!local.tmp"]})
+    assert matcher.is_ignored("pkg/other.tmp", False)
+    assert not matcher.is_ignored("pkg/local.tmp", False)
+
+
+@pytest.mark.parametrize("path, ignored", [
+    ("todo.txt", True),
+    ("docs/todo.txt", False),
+])
+def test_leading_slash_anchors_to_the_gitignore_directory(tmp_path, path, ignored):
+    assert _matcher(tmp_path, "/todo.txt").is_ignored(path, False) is ignored
+
+
+@pytest.mark.parametrize("path, ignored", [
+    ("doc/notes.txt", True),
+    ("src/doc/notes.txt", False),
+    ("notes.txt", False),
+])
+def test_inner_slash_anchors_the_pattern(tmp_path, path, ignored):
+    assert _matcher(tmp_path, "doc/*.txt").is_ignored(path, False) is ignored
+
+
+def test_trailing_slash_matches_directories_only(tmp_path):
+    matcher = _matcher(tmp_path, "cache/")
+    assert matcher.is_ignored("cache", True)
+    assert matcher.is_ignored("src/cache", True)
+    assert not matcher.is_ignored("cache", False)
+
+
+@pytest.mark.parametrize("pattern, path, ignored", [
+    ("**/logs", "logs", True),
+    ("**/logs", "a/b/logs", True),
+    ("**/logs/debug.log", "deep/logs/debug.log", True),
+    ("logs/**", "logs/a/b.txt", True),
+    ("logs/**", "logs", False),
+    ("a/**/b", "a/b", True),
+    ("a/**/b", "a/x/y/b", True),
+    ("a/**/b", "c/a/x/b", False),
+    ("*.py", "pkg/mod.py", True),
+    ("a/*/c", "a/x/y/c", False),
+])
+def test_double_star(tmp_path, pattern, path, ignored):
+    assert _matcher(tmp_path, pattern).is_ignored(path, False) is ignored
+
+
+def test_comments_blank_lines_and_escapes(tmp_path):
+    matcher = _matcher(tmp_path, "# comment", "", "\\#literal", "\\!bang")
+    assert not matcher.is_ignored("comment", False)
+    assert matcher.is_ignored("#literal", False)
+    assert matcher.is_ignored("!bang", False)
+
+
+def test_paths_outside_root_are_not_ignored(tmp_path):
+    matcher = _matcher(tmp_path, "*")
+    assert not matcher.is_ignored(str(tmp_path.parent / "elsewhere.txt"), False)
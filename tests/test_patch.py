@@ -0,0 +1,69 @@
+import pytest
+
+from codeforgeai.patch import PatchError, apply_edit, validate
+
+SOURCE = "def f():\n    return 1\n\n\ndef g():\n    return 1\n"
+
+
+def _block(search, replace):
+    return f"<<<<<<< SEARCH\n{search}=======\n{replace}>>>>>>> REPLACE\n"
+
+
+def test_search_replace_block():
+    edited = apply_edit(SOURCE, _block("def f():\n    return 1\n", "def f():\n    return 2\n"))
+    assert edited == SOURCE.replace("return 1", "return 2", 1)
+
+
+def test_prose_and_fences_around_blocks_are_ignored():
+    response = "Here you go:\n```python\n" + _block("def g():\n", "def h():\n") + "```\nDone."
+    assert apply_edit(SOURCE, response) == SOURCE.replace("def g", "def h")
+
+
+def test_ambiguous_search_is_rejected():
+    with pytest.raises(PatchError, match="matches 2 places"):
+        apply_edit(SOURCE, _block("    return 1\n", "    return 2\n"))
+
+
+def test_missing_search_is_rejected():
+    with pytest.raises(PatchError, match="not found"):
+        apply_edit(SOURCE, _block("    return 3\n", "    return 2\n"))
+
+
+def test_trailing_whitespace_is_tolerated():
+    edited = apply_edit(SOURCE, _block("def f():   \n", "def f0():\n"))
+    assert edited.startswith("def f0():\n    return 1\n")
+
+
+def test_file_without_final_newline_stays_without_one():
+    source = "a = 1\nb = 2"
+    assert apply_edit(source, _block("b = 2\n", "b = 3\n")) == "a = 1\nb = 3"
+
+
+def test_file_with_final_newline_keeps_it():
+    source = "a = 1\nb = 2\n"
+    assert apply_edit(source, _block("b = 2\n", "b = 3\n")) == "a = 1\nb = 3\n"
+
+
+def test_empty_search_appends_to_the_end():
+    edited = apply_edit(SOURCE, _block("", "\n\ndef h():\n    return 3\n"))
+    assert edited == SOURCE + "\n\ndef h():\n    return 3\n"
+
+
+def test_empty_search_appends_after_a_missing_final_newline():
+    assert apply_edit("a = 1", _block("", "b = 2\n")) == "a = 1\nb = 2\n"
+
+
+def test_unified_diff_applies_at_the_closest_match():
+    diff = "--- a/m.py\n+++ b/m.py\n@@ -5,2 +5,2 @@\n def g():\n-    return 1\n+    return 2\n"
+    assert apply_edit(SOURCE, diff) == "def f():\n    return 1\n\n\ndef g():\n    return 2\n"
+
+
+def test_response_without_edits_is_rejected():
+    with pytest.raises(PatchError, match="no search/replace blocks"):
+        apply_edit(SOURCE, "I changed it for you.")
+
+
+def test_validate_rejects_broken_python():
+    with pytest.raises(PatchError, match="syntax"):
+        validate("m.py", SOURCE, "def f(:\n")
+    validate("m.txt", SOURCE, "def f(:\n")
@@ -0,0 +1,204 @@
+import asyncio
+
+import pytest
+
+from codeforgeai.models import retry
+from codeforgeai.models.errors import (
+    CircuitOpenError, ModelRequestError, ModelUnavailableError, RequestCancelled,
+)
+from codeforgeai.models.retry import (
+    CircuitBreaker, call_with_retry, call_with_retry_async, stream_with_retry,
+)
+
+CONFIG = {"model_retries": 2, "model_retry_base_delay": 0, "circuit_failure_threshold": 3, "circuit_reset_timeout": 10}
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    monkeypatch.setattr(retry, "_breakers", {})
+
+
+class Flaky:
+    """Raise the given errors in turn, then return "ok"."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def _down():
+    return ModelUnavailableError("down")
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.before_call()
+
+
+def test_half_open_lets_one_trial_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock.now += 9
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.now += 1
+    breaker.before_call()
+    # Only one trial at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    breaker.before_call()
+    breaker.before_call()
+
+
+def test_failed_trial_reopens_for_another_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=10)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 10
+    breaker.before_call()
+    breaker.record_failure()
+    clock.now += 9
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.now += 1
+    breaker.before_call()
+
+
+def test_transient_failures_are_retried():
+    fn = Flaky(_down(), _down())
+    assert call_with_retry(fn, CONFIG) == "ok"
+    assert fn.calls == 3
+
+
+def test_retries_are_bounded():
+    fn = Flaky(_down(), _down(), _down())
+    with pytest.raises(ModelUnavailableError):
+        call_with_retry(fn, CONFIG)
+    assert fn.calls == 3
+
+
+def test_permanent_errors_are_not_retried_and_do_not_trip_the_breaker():
+    config = dict(CONFIG, circuit_failure_threshold=1)
+    fn = Flaky(ModelRequestError("bad request"))
+    with pytest.raises(ModelRequestError):
+        call_with_retry(fn, config)
+    assert fn.calls == 1
+    assert call_with_retry(Flaky(), config) == "ok"
+
+
+def test_cancellation_is_not_retried_and_not_counted():
+    config = dict(CONFIG, circuit_failure_threshold=1)
+    fn = Flaky(RequestCancelled("gone"))
+    with pytest.raises(RequestCancelled):
+        call_with_retry(fn, config)
+    assert fn.calls == 1
+    assert retry.get_breaker(config).failures == 0
+
+
+def test_open_circuit_fails_fast(clock):
+    config = dict(CONFIG, model_retries=0)
+    for _ in range(3):
+        with pytest.raises(ModelUnavailableError):
+            call_with_retry(Flaky(_down()), config)
+    fn = Flaky()
+    with pytest.raises(CircuitOpenError):
+        call_with_retry(fn, config)
+    assert fn.calls == 0
+    clock.now += 10
+    assert call_with_retry(fn, config) == "ok"
+
+
+def test_breakers_are_shared_per_host():
+    assert retry.get_breaker({"ollama_host": "a"}) is retry.get_breaker({"ollama_host": "a"})
+    assert retry.get_breaker({"ollama_host": "a"}) is not retry.get_breaker({"ollama_host": "b"})
+
+
+def test_async_retry():
+    fn = Flaky(_down())
+
+    async def call():
+        return fn()
+
+    assert asyncio.run(call_with_retry_async(call, CONFIG)) == "ok"
+    assert fn.calls == 2
+
+
+def test_stream_retries_only_before_the_first_piece():
+    attempts = []
+
+    def fails_first():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise _down()
+        yield "a"
+        yield "b"
+
+    assert list(stream_with_retry(fails_first, CONFIG)) == ["a", "b"]
+
+    def fails_midway():
+        yield "a"
+        raise _down()
+
+    pieces = []
+    with pytest.raises(ModelUnavailableError):
+        for piece in stream_with_retry(fails_midway, CONFIG):
+            pieces.append(piece)
+    assert pieces == ["a"]
+
+
+def test_backoff_delays_are_capped():
+    config = {"model_retries": 6, "model_retry_base_delay": 1, "model_retry_max_delay": 4}
+    delays = list(retry.backoff_delays(config))
+    assert len(delays) == 6
+    assert all(0 <= delay <= 4 for delay in delays)
+
+
+def test_other_exceptions_are_raised_unchanged():
+    fn = Flaky(KeyError("bug"), KeyError("bug"))
+    with pytest.raises(KeyError):
+        call_with_retry(fn, dict(CONFIG, circuit_failure_threshold=1))
+    assert fn.calls == 1
+    assert retry.get_breaker(CONFIG).failures == 0
+
+
+def test_ollama_errors_are_translated():
+    from ollama import RequestError, ResponseError
+    from codeforgeai.models.errors import ModelNotFoundError, translate_error
+
+    assert isinstance(translate_error(ResponseError("missing", 404), "m"), ModelNotFoundError)
+    assert isinstance(translate_error(ResponseError("busy", 503), "m"), ModelUnavailableError)
+    assert isinstance(translate_error(RequestError("must provide a model"), "m"), ModelRequestError)
+    bug = TypeError("bug")
+    assert translate_error(bug, "m") is bug
+
+
+def test_trial_that_never_reaches_the_backend_is_abandoned(clock):
+    config = dict(CONFIG, model_retries=0, circuit_failure_threshold=1)
+    with pytest.raises(ModelUnavailableError):
+        call_with_retry(Flaky(_down()), config)
+    clock.now += 10
+    with pytest.raises(RequestCancelled):
+        call_with_retry(Flaky(RequestCancelled("gone")), config)
+    assert call_with_retry(Flaky(), config) == "ok"
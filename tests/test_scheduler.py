@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+
+from codeforgeai.models.errors import RequestCancelled
+from codeforgeai.models.scheduler import Scheduler, current_priority, priority, priority_for
+
+
+class Caller:
+    """A thread that takes a slot of class name and holds it until released."""
+
+    def __init__(self, scheduler, name, started):
+        self.scheduler, self.name, self.started = scheduler, name, started
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        self.scheduler.acquire(self.name)
+        self.started.append(self)
+        self.done.wait(5)
+        self.scheduler.release(self.name)
+
+    def release(self):
+        self.done.set()
+        self.thread.join(5)
+
+
+def _wait_for(predicate):
+    deadline = time.monotonic() + 5
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def _queue(scheduler, started, *names):
+    """Start a caller per name, each one queued before the next is started."""
+    callers = []
+    for name in names:
+        waiting = scheduler.snapshot()[name]["waiting"]
+        caller = Caller(scheduler, name, started)
+        caller.thread.start()
+        _wait_for(lambda: scheduler.snapshot()[name]["waiting"] > waiting or caller in started)
+        callers.append(caller)
+    return callers
+
+
+def _release_in_turn(started, count):
+    """With a single slot, release each caller once it runs, until count have run."""
+    for i in range(count):
+        _wait_for(lambda: len(started) > i)
+        started[i].release()
+
+
+def test_higher_priority_starts_first():
+    scheduler, started = Scheduler(slots=1), []
+    _queue(scheduler, started, "normal")
+    _queue(scheduler, started, "background", "normal", "interactive")
+    _release_in_turn(started, 4)
+    assert [c.name for c in started] == ["normal", "interactive", "normal", "background"]
+
+
+def test_first_come_first_served_within_a_class():
+    scheduler, started = Scheduler(slots=1), []
+    holder, = _queue(scheduler, started, "normal")
+    waiting = _queue(scheduler, started, "normal", "normal", "normal")
+    _release_in_turn(started, 4)
+    assert started == [holder] + waiting
+
+
+def test_class_limit_leaves_slots_for_other_classes():
+    scheduler, started = Scheduler(slots=4, limits={"background": 1}), []
+    first, second = _queue(scheduler, started, "background", "background")
+    assert started == [first]
+    normal, = _queue(scheduler, started, "normal")
+    assert normal in started and second not in started
+    first.release()
+    _wait_for(lambda: second in started)
+    second.release()
+    normal.release()
+
+
+def test_background_waits_while_interactive_runs():
+    scheduler, started = Scheduler(slots=4), []
+    interactive, background = _queue(scheduler, started, "interactive", "background")
+    assert started == [interactive]
+    interactive.release()
+    _wait_for(lambda: background in started)
+    background.release()
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    scheduler, started = Scheduler(slots=1), []
+    holder, = _queue(scheduler, started, "normal")
+    cancel = threading.Event()
+    errors = []
+
+    def wait():
+        try:
+            scheduler.acquire("normal", cancel)
+        except RequestCancelled as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=wait)
+    thread.start()
+    _wait_for(lambda: scheduler.snapshot()["normal"]["waiting"] == 1)
+    cancel.set()
+    thread.join(5)
+    assert errors and scheduler.snapshot()["normal"] == {"running": 1, "waiting": 0}
+    holder.release()
+
+
+def test_priority_context():
+    assert current_priority() == "normal"
+    with priority("interactive"):
+        assert current_priority() == "interactive"
+        with priority("bogus"):
+            assert current_priority() == "normal"
+    assert current_priority() == "normal"
+
+
+@pytest.mark.parametrize("command, expected", [("suggestion", "interactive"), ("analyze", "normal")])
+def test_priority_for(command, expected):
+    config = {"scheduler_priorities": {"suggestion": "interactive"}}
+    assert priority_for(command, config) == expected
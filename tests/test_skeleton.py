@@ -1,2 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+
 import pytest
 
+# Startup budget for importing the CLI and parsing --help, in milliseconds
+IMPORT_BUDGET_MS = float(os.environ.get("CODEFORGE_IMPORT_BUDGET_MS", "100"))
+HEAVY_MODULES = ["ollama", "httpx", "asyncio", "codeforgeai.engine", "codeforgeai.models.code_model"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from codeforgeai.skeleton import parse_args
+try:
+    parse_args(sys.argv[1:])
+except SystemExit:
+    pass
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({"ms": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _probe(*argv):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, *argv], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_help_within_import_budget():
+    best = min(_probe("--help")["ms"] for _ in range(3))
+    assert best < IMPORT_BUDGET_MS, f"importing the CLI and parsing --help took {best:.0f}ms"
+
+
+@pytest.mark.parametrize("argv", [["--help"], ["strip"], ["index", "query"]])
+def test_no_model_imports_for_light_commands(argv):
+    modules = set(_probe(*argv)["modules"])
+    assert not modules.intersection(HEAVY_MODULES)
+
+
+@pytest.mark.parametrize("argv", [["github"], ["github", "copilot"]])
+def test_github_requires_a_subcommand(argv):
+    from codeforgeai.skeleton import parse_args
+    with pytest.raises(SystemExit) as exc:
+        parse_args(argv)
+    assert exc.value.code == 2
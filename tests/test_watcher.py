@@ -0,0 +1,52 @@
+import queue
+import threading
+
+import pytest
+
+from codeforgeai.watcher import InotifyWatcher
+
+
+def _batches(watcher):
+    """Run watcher.batches() on a thread, so a missed event fails the test instead of hanging it."""
+    results = queue.Queue()
+
+    def run():
+        for batch in watcher.batches():
+            results.put(batch)
+
+    threading.Thread(target=run, daemon=True).start()
+    return lambda: results.get(timeout=5)
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    (tmp_path / ".gitignore").write_text("build/\n")
+    (tmp_path / "build").mkdir()
+    try:
+        watcher = InotifyWatcher(tmp_path, debounce=0.05)
+    except OSError as e:
+        pytest.skip(f"inotify unavailable: {e}")
+    yield watcher
+    watcher.close()
+
+
+def test_un_ignored_directory_is_watched(tmp_path, watcher):
+    next_batch = _batches(watcher)
+    (tmp_path / ".gitignore").write_text("")
+    assert next_batch() is None
+    (tmp_path / "build" / "out.py").write_text("x = 1\n")
+    changed, removed = next_batch()
+    assert changed == {"build/out.py"}
+
+
+def test_newly_ignored_directory_is_unwatched(tmp_path, watcher):
+    (tmp_path / "src").mkdir()
+    watcher._rewatch()
+    next_batch = _batches(watcher)
+    (tmp_path / ".gitignore").write_text("build/\nsrc/\n")
+    assert next_batch() is None
+    assert "src" not in watcher._watches.values()
+    (tmp_path / "src" / "mod.py").write_text("x = 1\n")
+    (tmp_path / "main.py").write_text("x = 1\n")
+    changed, removed = next_batch()
+    assert changed == {"main.py"}